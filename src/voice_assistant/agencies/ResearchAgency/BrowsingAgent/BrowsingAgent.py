@@ -1,14 +1,16 @@
-import base64
+import logging
 import re
+import time
 
 from agency_swarm.agents import Agent
 from typing_extensions import override
 
+logger = logging.getLogger(__name__)
 
-class BrowsingAgent(Agent):
-    SCREENSHOT_FILE_NAME = "screenshot.jpg"
 
+class BrowsingAgent(Agent):
     def __init__(self, selenium_config=None, **kwargs):
+        from .tools.util.screenshots import VisionUploadCache
         from .tools.util.selenium import set_selenium_config
 
         super().__init__(
@@ -29,16 +31,18 @@ class BrowsingAgent(Agent):
             set_selenium_config(selenium_config)
 
         self.prev_message = ""
+        self._screenshot = None
+        self._vision_step_started = None
+        self._screenshot_uploads = VisionUploadCache()
 
     @override
     def response_validator(self, message: str):
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.select import Select
-
         from .tools.util import (
             highlight_elements_with_labels,
             remove_highlight_and_labels,
         )
+        from .tools.util.blocking import load_blocked_images
+        from .tools.util.current_page import open_current_page
         from .tools.util.selenium import get_web_driver, set_web_driver
 
         # Filter out everything in square brackets
@@ -50,14 +54,16 @@ class BrowsingAgent(Agent):
         self.prev_message = filtered_message
 
         if "[send screenshot]" in message.lower():
-            wd = get_web_driver()
+            wd = open_current_page(get_web_driver(), self._shared_state)
+            load_blocked_images(wd)
             remove_highlight_and_labels(wd)
             self.take_screenshot()
             response_text = "Here is the screenshot of the current web page:"
 
         elif "[highlight clickable elements]" in message.lower():
-            wd = get_web_driver()
-            highlight_elements_with_labels(
+            wd = open_current_page(get_web_driver(), self._shared_state)
+            load_blocked_images(wd)
+            highlighted_elements = highlight_elements_with_labels(
                 wd,
                 'a, button, div[onclick], div[role="button"], div[tabindex], ' 'span[onclick], span[role="button"], span[tabindex]',
             )
@@ -68,13 +74,9 @@ class BrowsingAgent(Agent):
 
             self.take_screenshot()
 
-            all_elements = wd.find_elements(By.CSS_SELECTOR, ".highlighted-element")
-
-            all_element_texts = [element.text for element in all_elements]
-
             element_texts_json = {}
-            for i, element_text in enumerate(all_element_texts):
-                element_texts_json[str(i + 1)] = self.remove_unicode(element_text)
+            for element in highlighted_elements:
+                element_texts_json[str(element["index"])] = self.remove_unicode(element["text"])
 
             element_texts_json = {k: v for k, v in element_texts_json.items() if v}
 
@@ -88,19 +90,16 @@ class BrowsingAgent(Agent):
             )
 
         elif "[highlight text fields]" in message.lower():
-            wd = get_web_driver()
-            highlight_elements_with_labels(wd, "input, textarea")
+            wd = open_current_page(get_web_driver(), self._shared_state)
+            load_blocked_images(wd)
+            highlighted_elements = highlight_elements_with_labels(wd, "input, textarea")
             self._shared_state.set("elements_highlighted", "input, textarea")
 
             self.take_screenshot()
 
-            all_elements = wd.find_elements(By.CSS_SELECTOR, ".highlighted-element")
-
-            all_element_texts = [element.text for element in all_elements]
-
             element_texts_json = {}
-            for i, element_text in enumerate(all_element_texts):
-                element_texts_json[str(i + 1)] = self.remove_unicode(element_text)
+            for element in highlighted_elements:
+                element_texts_json[str(element["index"])] = self.remove_unicode(element["text"])
 
             element_texts_formatted = ", ".join([f"{k}: {v}" for k, v in element_texts_json.items()])
 
@@ -111,26 +110,17 @@ class BrowsingAgent(Agent):
             )
 
         elif "[highlight dropdowns]" in message.lower():
-            wd = get_web_driver()
-            highlight_elements_with_labels(wd, "select")
+            wd = open_current_page(get_web_driver(), self._shared_state)
+            load_blocked_images(wd)
+            highlighted_elements = highlight_elements_with_labels(wd, "select")
             self._shared_state.set("elements_highlighted", "select")
 
             self.take_screenshot()
 
-            all_elements = wd.find_elements(By.CSS_SELECTOR, ".highlighted-element")
-
             all_selector_values = {}
-
-            i = 0
-            for element in all_elements:
-                select = Select(element)
-                options = select.options
-                selector_values = {}
-                for j, option in enumerate(options):
-                    selector_values[str(j)] = option.text
-                    if j > 10:
-                        break
-                all_selector_values[str(i + 1)] = selector_values
+            for element in highlighted_elements:
+                selector_values = {str(j): option for j, option in enumerate(element["options"] or [])}
+                all_selector_values[str(element["index"])] = selector_values
 
             all_selector_values = {k: v for k, v in all_selector_values.items() if v}
             all_selector_values_formatted = ", ".join([f"{k}: {v}" for k, v in all_selector_values.items()])
@@ -149,21 +139,24 @@ class BrowsingAgent(Agent):
         raise ValueError(content)
 
     def take_screenshot(self):
-        from .tools.util import get_b64_screenshot
+        from .tools.util.screenshots import capture_viewport_jpeg
         from .tools.util.selenium import get_web_driver
 
+        self._vision_step_started = time.perf_counter()
         wd = get_web_driver()
-        screenshot = get_b64_screenshot(wd)
-        screenshot_data = base64.b64decode(screenshot)
-        with open(self.SCREENSHOT_FILE_NAME, "wb") as screenshot_file:
-            screenshot_file.write(screenshot_data)
+        self._screenshot = capture_viewport_jpeg(wd)
 
     def create_response_content(self, response_text):
-        with open(self.SCREENSHOT_FILE_NAME, "rb") as file:
-            file_id = self.client.files.create(
-                file=file,
-                purpose="vision",
-            ).id
+        upload_started = time.perf_counter()
+        file_id, uploaded_bytes = self._screenshot_uploads.upload(self.client, self._screenshot)
+        finished = time.perf_counter()
+        logger.info(
+            "Vision step: %d byte screenshot, %s in %.0f ms, %.0f ms total",
+            len(self._screenshot),
+            f"uploaded {uploaded_bytes} bytes" if uploaded_bytes else "reused previous upload",
+            (finished - upload_started) * 1000,
+            (finished - self._vision_step_started) * 1000,
+        )
 
         content = [
             {"type": "text", "text": response_text},
@@ -1,11 +1,15 @@
-import time
-
 from agency_swarm.tools import BaseTool
 from pydantic import Field
-from selenium.webdriver.common.by import By
 
 from .util import get_web_driver, set_web_driver
+from .util.current_page import open_current_page, set_browser_page
+from .util.dom_snapshot import (
+    capture_highlighted_elements,
+    click_element,
+    get_element_text,
+)
 from .util.highlights import remove_highlight_and_labels
+from .util.waits import get_wait_timeout, mark_document, wait_for_page_ready
 
 
 class ClickElement(BaseTool):
@@ -22,28 +26,24 @@ class ClickElement(BaseTool):
 
     def run(self):
         wd = get_web_driver()
+        open_current_page(wd, self._shared_state)
 
         if "button" not in self._shared_state.get("elements_highlighted", ""):
             raise ValueError(
                 "Please highlight clickable elements on the page first by outputting '[highlight clickable elements]' message. You must output just the message without calling the tool first, so the user can respond with the screenshot."
             )
 
-        all_elements = wd.find_elements(By.CSS_SELECTOR, ".highlighted-element")
+        all_elements = capture_highlighted_elements(wd)
 
         # iterate through all elements with a number in the text
         try:
-            element_text = all_elements[self.element_number - 1].text
-            element_text = element_text.strip() if element_text else ""
             # Subtract 1 because sequence numbers start at 1, but list indices start at 0
-            try:
-                all_elements[self.element_number - 1].click()
-            except Exception as e:
-                if "element click intercepted" in str(e).lower():
-                    wd.execute_script("arguments[0].click();", all_elements[self.element_number - 1])
-                else:
-                    raise e
+            element = all_elements[self.element_number - 1]
+            element_text = get_element_text(wd, element)
+            previous_document = mark_document(wd)
+            click_element(wd, element)
 
-            time.sleep(3)
+            wait_for_page_ready(wd, timeout=get_wait_timeout("ClickElement"), previous_document=previous_document)
 
             result = f"Clicked on element {self.element_number}. Text on clicked element: '{element_text}'. Current URL is {wd.current_url} To further analyze the page, output '[send screenshot]' command."
         except IndexError:
@@ -58,5 +58,6 @@ class ClickElement(BaseTool):
         set_web_driver(wd)
 
         self._shared_state.set("elements_highlighted", "")
+        set_browser_page(wd, self._shared_state)
 
         return result
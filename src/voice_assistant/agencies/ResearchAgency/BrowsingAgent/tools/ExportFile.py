@@ -1,9 +1,13 @@
-import base64
-import os
-
 from agency_swarm.tools import BaseTool
 
+from voice_assistant.utils.cache_utils import TTLCache
+
 from .util import get_web_driver
+from .util.current_page import open_current_page
+from .util.pdf_export import print_to_pdf_stream
+
+# sha256 of an exported PDF -> file id of its upload, so identical exports are not uploaded again
+_exported_files = TTLCache(ttl_seconds=86400, max_entries=100, name="exported_pdf")
 
 
 class ExportFile(BaseTool):
@@ -11,6 +15,7 @@ class ExportFile(BaseTool):
 
     def run(self):
         wd = get_web_driver()
+        open_current_page(wd, self._shared_state)
         from agency_swarm import get_openai_client
 
         client = get_openai_client()
@@ -23,20 +28,17 @@ class ExportFile(BaseTool):
             "preferCSSPageSize": True,
         }
 
-        # Execute the command to print to PDF
-        result = wd.execute_cdp_cmd("Page.printToPDF", params)
-        pdf = result["data"]
-
-        pdf_bytes = base64.b64decode(pdf)
-
-        # Save the PDF to a file
-        with open("exported_file.pdf", "wb") as f:
-            f.write(pdf_bytes)
-
-        file_id = client.files.create(
-            file=open("exported_file.pdf", "rb"),
-            purpose="assistants",
-        ).id
+        # Stream the PDF from Chrome into a spooled temporary file while hashing it
+        pdf_file, pdf_hash, _ = print_to_pdf_stream(wd, params)
+
+        with pdf_file:
+            file_id = _exported_files.get(pdf_hash)
+            if file_id is None:
+                file_id = client.files.create(
+                    file=("exported_file.pdf", pdf_file, "application/pdf"),
+                    purpose="assistants",
+                ).id
+                _exported_files.set(pdf_hash, file_id)
 
         self._shared_state.set("file_id", file_id)
 
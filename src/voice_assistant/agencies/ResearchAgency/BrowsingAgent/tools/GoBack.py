@@ -1,8 +1,8 @@
-import time
-
 from agency_swarm.tools import BaseTool
 
+from .util.current_page import open_current_page, set_browser_page
 from .util.selenium import get_web_driver, set_web_driver
+from .util.waits import get_wait_timeout, mark_document, wait_for_page_ready
 
 
 class GoBack(BaseTool):
@@ -12,11 +12,17 @@ class GoBack(BaseTool):
 
     def run(self):
         wd = get_web_driver()
+        open_current_page(wd, self._shared_state)
 
+        previous_document = mark_document(wd)
         wd.back()
 
-        time.sleep(3)
+        wait_for_page_ready(
+            wd, timeout=get_wait_timeout("GoBack"), previous_document=previous_document
+        )
 
         set_web_driver(wd)
+        self._shared_state.set("elements_highlighted", "")
+        set_browser_page(wd, self._shared_state)
 
         return "Success. Went back 1 page. Current URL is: " + wd.current_url
@@ -3,7 +3,14 @@ import time
 from agency_swarm.tools import BaseTool
 from pydantic import Field
 
-from .util.selenium import get_web_driver, set_web_driver
+from .util.blocking import apply_resource_blocking, page_load_stats
+from .util.current_page import set_browser_page
+from .util.fetch import fetch_readable_page, needs_browser, record_fetch
+from .util.selenium import get_web_driver, set_web_driver, web_driver_pool
+from .util.waits import get_wait_timeout, wait_for_page_ready
+
+# Page text returned to the agent when a URL is read over HTTP
+MAX_RETURNED_CHARS = 8000
 
 
 class ReadURL(BaseTool):
@@ -12,6 +19,8 @@ class ReadURL(BaseTool):
 
     If you are unsure of the direct URL, do not guess. Instead, use the ClickElement tool to click on links that might contain the desired information on the current web page.
 
+    Plain article pages are read over HTTP and their text is returned directly. Set needs_interaction to true when you need to see, click or type on the page, and it will be opened in the browser instead.
+
     Note: This tool only supports opening one URL at a time. The previous URL will be closed when you open a new one.
     """
 
@@ -25,20 +34,51 @@ class ReadURL(BaseTool):
         description="URL of the webpage.",
         examples=["https://google.com/search?q=search"],
     )
+    needs_interaction: bool = Field(
+        False,
+        description="Set to true to open the page in the browser, e.g. to click links, fill forms or take screenshots.",
+    )
 
     class ToolConfig:
         one_call_at_a_time: bool = True
 
     def run(self):
+        started = time.perf_counter()
+
+        # Boot Chrome in the background on the first browsing action, so a follow-up
+        # interaction (or the browser fallback) finds it ready
+        web_driver_pool.warm_up()
+
+        if self.needs_interaction:
+            reason = "interaction requested"
+        elif needs_browser(self.url):
+            reason = "browser-only site"
+        else:
+            page = fetch_readable_page(self.url)
+            if page is not None:
+                record_fetch(self.url, "http", started)
+                self._shared_state.set("elements_highlighted", "")
+                self._shared_state.set("current_page", {"url": page.url, "source": "http"})
+                return (
+                    "Content of " + page.url + " (" + page.title + "):\n\n"
+                    + page.text[:MAX_RETURNED_CHARS]
+                    + ("\n\n[content truncated]" if len(page.text) > MAX_RETURNED_CHARS else "")
+                    + "\n\nThe page was read without the browser. Call ReadURL again with needs_interaction set to true if you need to click, type or see the page."
+                )
+            reason = "HTTP fetch unusable"
+
         wd = get_web_driver()
 
+        apply_resource_blocking(wd, self.url)
         wd.get(self.url)
 
-        time.sleep(2)
+        wait_for_page_ready(wd, timeout=get_wait_timeout("ReadURL"))
 
         set_web_driver(wd)
+        record_fetch(self.url, "browser", started, reason, stats=page_load_stats(wd))
 
         self._shared_state.set("elements_highlighted", "")
+        set_browser_page(wd, self._shared_state)
 
         return (
             "Current URL is: "
@@ -47,7 +87,6 @@ class ReadURL(BaseTool):
             + "Please output '[send screenshot]' next to analyze the current web page or '[highlight clickable elements]' for further navigation."
         )
 
-
 if __name__ == "__main__":
     tool = ReadURL(url="https://google.com", chain_of_thought="Think step-by-step about where you need to navigate next to find the necessary information.")
     print(tool.run())
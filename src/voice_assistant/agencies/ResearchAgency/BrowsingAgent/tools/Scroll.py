@@ -3,6 +3,7 @@ from typing import Literal
 from agency_swarm.tools import BaseTool
 from pydantic import Field
 
+from .util.current_page import open_current_page
 from .util.selenium import get_web_driver, set_web_driver
 
 
@@ -15,6 +16,7 @@ class Scroll(BaseTool):
 
     def run(self):
         wd = get_web_driver()
+        open_current_page(wd, self._shared_state)
 
         height = wd.get_window_size()["height"]
 
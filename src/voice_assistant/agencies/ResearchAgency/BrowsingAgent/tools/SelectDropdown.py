@@ -2,10 +2,10 @@ from typing import Dict
 
 from agency_swarm.tools import BaseTool
 from pydantic import Field, model_validator
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.select import Select
 
 from .util import get_web_driver, set_web_driver
+from .util.current_page import open_current_page, set_browser_page
+from .util.dom_snapshot import capture_highlighted_elements, select_option
 from .util.highlights import remove_highlight_and_labels
 
 
@@ -34,23 +34,21 @@ class SelectDropdown(BaseTool):
 
     def run(self):
         wd = get_web_driver()
+        open_current_page(wd, self._shared_state)
 
         if "select" not in self._shared_state.get("elements_highlighted", ""):
             raise ValueError(
                 "Please highlight dropdown elements on the page first by outputting '[highlight dropdowns]' message. You must output just the message without calling the tool first, so the user can respond with the screenshot."
             )
 
-        all_elements = wd.find_elements(By.CSS_SELECTOR, ".highlighted-element")
+        all_elements = capture_highlighted_elements(wd)
 
         try:
             for key, value in self.key_value_pairs.items():
                 key = int(key)
                 element = all_elements[key - 1]
 
-                select = Select(element)
-
-                # Select the first option (index 0)
-                select.select_by_index(int(value))
+                select_option(wd, element, int(value))
             result = f"Success. Option is selected in the dropdown. To further analyze the page, output '[send screenshot]' command."
         except Exception as e:
             result = str(e)
@@ -58,5 +56,6 @@ class SelectDropdown(BaseTool):
         remove_highlight_and_labels(wd)
 
         set_web_driver(wd)
+        set_browser_page(wd, self._shared_state)
 
         return result
@@ -1,13 +1,13 @@
-import time
 from typing import Dict
 
 from agency_swarm.tools import BaseTool
 from pydantic import Field, model_validator
-from selenium.webdriver import Keys
-from selenium.webdriver.common.by import By
 
 from .util import get_web_driver, set_web_driver
+from .util.current_page import open_current_page, set_browser_page
+from .util.dom_snapshot import capture_highlighted_elements, type_into_element
 from .util.highlights import remove_highlight_and_labels
+from .util.waits import get_wait_timeout, mark_document, wait_for_page_ready
 
 
 class SendKeys(BaseTool):
@@ -38,12 +38,13 @@ class SendKeys(BaseTool):
 
     def run(self):
         wd = get_web_driver()
+        open_current_page(wd, self._shared_state)
         if "input" not in self._shared_state.get("elements_highlighted", ""):
             raise ValueError(
                 "Please highlight input elements on the page first by outputting '[highlight text fields]' message. You must output just the message without calling the tool first, so the user can respond with the screenshot."
             )
 
-        all_elements = wd.find_elements(By.CSS_SELECTOR, ".highlighted-element")
+        all_elements = capture_highlighted_elements(wd)
 
         i = 0
         try:
@@ -51,18 +52,16 @@ class SendKeys(BaseTool):
                 key = int(key)
                 element = all_elements[key - 1]
 
-                try:
-                    element.click()
-                    element.send_keys(Keys.CONTROL + "a")  # Select all text in input
-                    element.send_keys(Keys.DELETE)
-                    element.clear()
-                except Exception as e:
-                    pass
-                element.send_keys(value)
                 # send enter key to the last element
-                if i == len(self.elements_and_texts) - 1:
-                    element.send_keys(Keys.RETURN)
-                    time.sleep(3)
+                is_last = i == len(self.elements_and_texts) - 1
+                previous_document = mark_document(wd) if is_last else None
+                type_into_element(wd, element, value, submit=is_last)
+                if is_last:
+                    wait_for_page_ready(
+                        wd,
+                        timeout=get_wait_timeout("SendKeys"),
+                        previous_document=previous_document,
+                    )
                 i += 1
             result = f"Sent input to element and pressed Enter. Current URL is {wd.current_url} To further analyze the page, output '[send screenshot]' command."
         except Exception as e:
@@ -71,5 +70,6 @@ class SendKeys(BaseTool):
         remove_highlight_and_labels(wd)
 
         set_web_driver(wd)
+        set_browser_page(wd, self._shared_state)
 
         return result
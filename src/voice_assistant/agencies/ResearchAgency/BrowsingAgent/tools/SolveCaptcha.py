@@ -1,3 +1,4 @@
+import logging
 import time
 
 from agency_swarm.tools import BaseTool
@@ -9,8 +10,16 @@ from selenium.webdriver.support.expected_conditions import (
 )
 from selenium.webdriver.support.wait import WebDriverWait
 
-from .util import get_b64_screenshot, remove_highlight_and_labels
+from .util import remove_highlight_and_labels
+from .util.blocking import apply_resource_blocking
+from .util.captcha_grid import CHALLENGE_SCRIPT, compose_tile_grid
+from .util.current_page import open_current_page
 from .util.selenium import get_web_driver
+from .util.waits import get_wait_timeout, wait_for_dom_quiescence
+
+logger = logging.getLogger(__name__)
+
+TILE_CLICK_DELAY = 0.5  # seconds between tile clicks
 
 
 class SolveCaptcha(BaseTool):
@@ -20,6 +29,11 @@ class SolveCaptcha(BaseTool):
 
     def run(self):
         wd = get_web_driver()
+        open_current_page(wd, self._shared_state)
+        timeout = get_wait_timeout("SolveCaptcha")
+
+        # The challenge tiles are images
+        apply_resource_blocking(wd, wd.current_url, images=True)
 
         try:
             WebDriverWait(wd, 10).until(frame_to_be_available_and_switch_to_it((By.XPATH, "//iframe[@title='reCAPTCHA']")))
@@ -29,9 +43,8 @@ class SolveCaptcha(BaseTool):
             return f"{e}: Could not find captcha checkbox"
 
         try:
-            # Scroll the element into view
-            wd.execute_script("arguments[0].scrollIntoView(true);", element)
-            time.sleep(1)  # Give some time for the scrolling to complete
+            # Scroll the element into view; an instant scroll completes synchronously
+            wd.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'instant'});", element)
 
             # Click the element using JavaScript
             wd.execute_script("arguments[0].click();", element)
@@ -59,42 +72,30 @@ class SolveCaptcha(BaseTool):
             )
         )
 
-        time.sleep(2)
+        WebDriverWait(wd, timeout).until(presence_of_element_located((By.CLASS_NAME, "rc-imageselect-tile")))
+        wait_for_dom_quiescence(wd, timeout=timeout, include_attributes=True)
 
         attempts = 0
         while attempts < 5:
-            tiles = wd.find_elements(By.CLASS_NAME, "rc-imageselect-tile")
+            # One round trip for the tiles and task text, one for the grid screenshot
+            challenge = wd.execute_script(CHALLENGE_SCRIPT)
+            grid_image = compose_tile_grid(challenge["grid"].screenshot_as_png, challenge["grid_width"], challenge["tiles"])
 
             # filter out tiles that have been selected
-            tiles = [tile for tile in tiles if "selected" not in (tile.get_attribute("class") or "").lower()]
-
-            image_content = []
-            i = 0
-            for tile in tiles:
-                i += 1
-                screenshot = get_b64_screenshot(wd, tile)
-
-                image_content.append(
-                    {
-                        "type": "text",
-                        "text": f"Image {i}:",
-                    }
-                )
-                image_content.append(
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/jpeg;base64,{screenshot}",
-                            "detail": "high",
-                        },
-                    },
-                )
-            # highlight all titles with rc-imageselect-tile class but not with rc-imageselect-dynamic-selected
-            # wd = highlight_elements_with_labels(wd, 'td.rc-imageselect-tile:not(.rc-imageselect-dynamic-selected)')
+            tiles = [tile["element"] for tile in challenge["tiles"] if not tile["selected"]]
+            i = len(tiles)
 
-            # screenshot = get_b64_screenshot(wd, wd.find_element(By.ID, "rc-imageselect"))
+            image_content = [
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:image/jpeg;base64,{grid_image}",
+                        "detail": "high",
+                    },
+                },
+            ]
 
-            task_text = wd.find_element(By.CLASS_NAME, "rc-imageselect-instructions").text.strip().replace("\n", " ")
+            task_text = challenge["instructions"].strip().replace("\n", " ")
 
             continuous_task = "once there are none left" in task_text.lower()
 
@@ -106,14 +107,15 @@ class SolveCaptcha(BaseTool):
             task_text = task_text.replace("squares", "images")
 
             additional_info = ""
-            if len(tiles) > 9:
+            if len(challenge["tiles"]) > 9:
                 additional_info = "Keep in mind that all images are a part of a bigger image " "from left to right, and top to bottom. The grid is 4x4. "
 
             messages = [
                 {
                     "role": "system",
                     "content": f"""You are an advanced AI designed to support users with visual impairments.
-                    User will provide you with {i} images numbered from 1 to {i}. Your task is to output
+                    User will provide you with a grid of {i} images numbered from 1 to {i} in their top left corners;
+                    greyed out images without a number are already selected. Your task is to output
                     the numbers of the images that contain the requested object, or at least some part of the requested
                     object. {additional_info}If there are no individual images that satisfy this condition, output 0.
                     """.replace(
@@ -152,14 +154,13 @@ class SolveCaptcha(BaseTool):
                 # Click the button
                 wd.execute_script("arguments[0].click();", verify_button)
 
-                time.sleep(1)
+                wait_for_dom_quiescence(wd, timeout=timeout, include_attributes=True)
 
                 try:
                     if self.verify_checkbox(wd):
                         return "Success. Captcha solved."
                 except Exception as e:
-                    print(f"{e}: Not checked")
-                    pass
+                    logger.debug("Captcha checkbox not checked: %s", e)
 
             else:
                 numbers = [int(s.strip()) for s in (message_text or "").split(",") if s.strip().isdigit()]
@@ -167,9 +168,11 @@ class SolveCaptcha(BaseTool):
                 # Click the tiles based on the provided numbers
                 for number in numbers:
                     wd.execute_script("arguments[0].click();", tiles[number - 1])
-                    time.sleep(0.5)
+                    # reCAPTCHA flags tiles clicked faster than a person could
+                    time.sleep(TILE_CLICK_DELAY)
 
-                time.sleep(3)
+                # Wait for selected tiles to be replaced or faded in
+                wait_for_dom_quiescence(wd, timeout=timeout, quiet_time=0.5, include_attributes=True)
 
                 if not continuous_task:
                     # Find the button by its ID
@@ -201,8 +204,7 @@ class SolveCaptcha(BaseTool):
 
             wd.execute_script(f"document.elementFromPoint({element.location['x']}, {element.location['y']-10}).click();")
         except Exception as e:
-            print(e)
-            pass
+            logger.debug("Could not close captcha: %s", e)
 
         return "Could not solve captcha."
 
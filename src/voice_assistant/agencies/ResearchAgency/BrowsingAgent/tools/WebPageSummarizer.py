@@ -1,7 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from agency_swarm.tools import BaseTool
 from selenium.webdriver.common.by import By
 
 from .util import get_web_driver, set_web_driver
+from .util.fetch import fetch_readable_page
+from .util.page_cache import chunk_summary_cache, content_hash, summary_cache
+
+SUMMARY_MODEL = "gpt-3.5-turbo"
+
+# Pages longer than this are summarized chunk by chunk and the partial summaries combined
+CHUNK_WORDS = 6000
+MAX_PARALLEL_CHUNKS = 4
+
+SYSTEM_PROMPT = "Your task is to summarize the content of the provided webpage. The summary should be concise and informative, capturing the main points and takeaways of the page."
+CHUNK_SYSTEM_PROMPT = "You are summarizing one part of a longer webpage. Capture every main point, fact and takeaway of this part concisely; it will be combined with summaries of the other parts."
+REDUCE_SYSTEM_PROMPT = "You are given summaries of consecutive parts of one webpage. Combine them into a single concise and informative summary of the whole page, capturing the main points and takeaways without repeating yourself."
 
 
 class WebPageSummarizer(BaseTool):
@@ -10,32 +24,73 @@ class WebPageSummarizer(BaseTool):
     """
 
     def run(self):
-        from agency_swarm import get_openai_client
+        content = self._get_page_content()
+
+        page_hash = content_hash(content)
+        summary = summary_cache.get(page_hash)
+        if summary is None:
+            summary = self._summarize(content, SYSTEM_PROMPT)
+            summary_cache.set(page_hash, summary)
+
+        return summary
+
+    def _get_page_content(self):
+        # A page ReadURL read over HTTP is only opened in the browser by the next browser tool
+        current_page = self._shared_state.get("current_page") or {}
+        if current_page.get("source") == "http":
+            page = fetch_readable_page(current_page["url"])
+            if page is not None:
+                return page.text
 
         wd = get_web_driver()
-        client = get_openai_client()
+        return wd.find_element(By.TAG_NAME, "body").text
+
+    def _summarize(self, content, system_prompt):
+        words = content.split()
+        if len(words) <= CHUNK_WORDS:
+            return self._complete(
+                system_prompt,
+                "Summarize the content of the following webpage:\n\n" + " ".join(words),
+            )
+
+        # Map: summarize each chunk in parallel, reusing summaries of chunks seen before
+        chunks = [
+            " ".join(words[i : i + CHUNK_WORDS])
+            for i in range(0, len(words), CHUNK_WORDS)
+        ]
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_CHUNKS) as executor:
+            partial_summaries = list(executor.map(self._summarize_chunk, chunks))
+
+        # Reduce: combine the partial summaries, recursing if they are still too long
+        combined = "\n\n".join(
+            f"Part {i + 1}:\n{summary}" for i, summary in enumerate(partial_summaries)
+        )
+        if len(combined.split()) > CHUNK_WORDS:
+            return self._summarize(combined, REDUCE_SYSTEM_PROMPT)
+        return self._complete(REDUCE_SYSTEM_PROMPT, combined)
 
-        content = wd.find_element(By.TAG_NAME, "body").text
+    def _summarize_chunk(self, chunk):
+        chunk_hash = content_hash(chunk)
+        summary = chunk_summary_cache.get(chunk_hash)
+        if summary is None:
+            summary = self._complete(
+                CHUNK_SYSTEM_PROMPT, "Summarize this part of the webpage:\n\n" + chunk
+            )
+            chunk_summary_cache.set(chunk_hash, summary)
+        return summary
 
-        # only use the first 10000 characters
-        content = " ".join(content.split()[:10000])
+    def _complete(self, system_prompt, user_content):
+        from agency_swarm import get_openai_client
 
+        client = get_openai_client()
         completion = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+            model=SUMMARY_MODEL,
             messages=[
-                {
-                    "role": "system",
-                    "content": "Your task is to summarize the content of the provided webpage. The summary should be concise and informative, capturing the main points and takeaways of the page.",
-                },
-                {
-                    "role": "user",
-                    "content": "Summarize the content of the following webpage:\n\n"
-                    + content,
-                },
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_content},
             ],
             temperature=0.0,
         )
-
         return completion.choices[0].message.content
 
 
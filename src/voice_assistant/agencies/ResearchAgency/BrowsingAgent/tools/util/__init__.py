@@ -1,3 +1,9 @@
 from .get_b64_screenshot import get_b64_screenshot
 from .highlights import highlight_elements_with_labels, remove_highlight_and_labels
-from .selenium import get_web_driver, set_web_driver
+from .selenium import (
+    get_web_driver,
+    release_web_driver,
+    set_web_driver,
+    web_driver_pool,
+)
+from .waits import wait_for_dom_quiescence, wait_for_page_ready
@@ -0,0 +1,271 @@
+import logging
+import time
+import weakref
+from urllib.parse import urlparse
+
+from . import selenium as selenium_util
+
+logger = logging.getLogger(__name__)
+
+
+def _extension_patterns(*extensions):
+    """Patterns matching URLs that end in one of the extensions, with or without a query string."""
+    return [pattern for ext in extensions for pattern in (f"*.{ext}", f"*.{ext}?*")]
+
+
+# URL patterns for Network.setBlockedURLs, by category ('*' is the only wildcard)
+BLOCK_PATTERNS = {
+    "fonts": _extension_patterns("woff", "woff2", "ttf", "otf", "eot")
+    + ["*fonts.googleapis.com*", "*fonts.gstatic.com*", "*use.typekit.net*"],
+    "media": _extension_patterns(
+        "mp4", "webm", "ogg", "ogv", "mp3", "m4a", "wav", "m3u8", "mpd"
+    ),
+    "trackers": [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*connect.facebook.net*",
+        "*hotjar.com*",
+        "*segment.io*",
+        "*segment.com/analytics*",
+        "*mixpanel.com*",
+        "*scorecardresearch.com*",
+        "*newrelic.com*",
+        "*nr-data.net*",
+        "*clarity.ms*",
+        "*fullstory.com*",
+    ],
+    "ads": [
+        "*doubleclick.net*",
+        "*googlesyndication.com*",
+        "*googleadservices.com*",
+        "*adservice.google.*",
+        "*amazon-adsystem.com*",
+        "*adnxs.com*",
+        "*taboola.com*",
+        "*outbrain.com*",
+        "*criteo.com*",
+        "*criteo.net*",
+        "*pubmatic.com*",
+        "*rubiconproject.com*",
+    ],
+    # Only blocked until a screenshot of the page is needed
+    "images": _extension_patterns(
+        "png", "jpg", "jpeg", "gif", "webp", "avif", "bmp", "ico"
+    ),
+}
+
+# Blocked URL list currently applied to each driver, to skip redundant CDP calls
+_applied_patterns = weakref.WeakKeyDictionary()
+
+# Re-requests blocked <img> sources (src, srcset and <picture> sources) and the CSS
+# background images of elements in the viewport. Background images are preloaded
+# into window.__reloadedBackgrounds so the loaded check can wait for them too.
+_RELOAD_IMAGES_SCRIPT = """
+function inViewport(element) {
+    var rect = element.getBoundingClientRect();
+    return rect.bottom > 0 && rect.top < window.innerHeight && rect.right > 0 && rect.left < window.innerWidth;
+}
+var pending = 0;
+document.querySelectorAll('img').forEach(function(img) {
+    if (img.complete && img.naturalWidth > 0) return;
+    pending++;
+    var picture = img.parentElement && img.parentElement.tagName === 'PICTURE' ? img.parentElement : null;
+    if (picture) {
+        picture.querySelectorAll('source').forEach(function(source) {
+            var sourceSet = source.srcset;
+            source.srcset = '';
+            source.srcset = sourceSet;
+        });
+    }
+    var srcset = img.srcset;
+    var src = img.getAttribute('src');
+    img.removeAttribute('srcset');
+    img.removeAttribute('src');
+    if (srcset) img.srcset = srcset;
+    if (src) img.src = src;
+});
+window.__reloadedBackgrounds = [];
+window.__reloadedBackgroundElements = window.__reloadedBackgroundElements || new WeakSet();
+document.querySelectorAll('body *').forEach(function(element) {
+    if (window.__reloadedBackgroundElements.has(element)) return;
+    var background = getComputedStyle(element).backgroundImage;
+    if (!background || background.indexOf('url(') === -1 || !inViewport(element)) return;
+    window.__reloadedBackgroundElements.add(element);
+    var urls = background.match(/url\\(["']?[^"')]+["']?\\)/g) || [];
+    urls.forEach(function(url) {
+        var image = new Image();
+        image.src = url.replace(/^url\\(["']?/, '').replace(/["']?\\)$/, '');
+        window.__reloadedBackgrounds.push(image);
+    });
+    element.style.backgroundImage = 'none';
+    void element.offsetHeight;
+    element.style.backgroundImage = background;
+    pending += urls.length;
+});
+return pending;
+"""
+
+# Lazy images outside the viewport are not fetched until scrolled to, so they are not waited for
+_IMAGES_LOADED_SCRIPT = """
+var images = Array.prototype.slice.call(document.images).concat(window.__reloadedBackgrounds || []);
+return images.every(function(img) {
+    if (img.complete) return true;
+    if (img.loading !== 'lazy') return false;
+    var rect = img.getBoundingClientRect();
+    return rect.bottom <= 0 || rect.top >= window.innerHeight || rect.right <= 0 || rect.left >= window.innerWidth;
+});
+"""
+
+
+def _blocking_config():
+    return selenium_util.selenium_config.get("resource_blocking", {})
+
+
+def is_allowlisted(url):
+    """True if nothing should be blocked on the URL's domain or its subdomains."""
+    host = urlparse(url).hostname or ""
+    return any(
+        host == domain or host.endswith("." + domain)
+        for domain in _blocking_config().get("allowlist", ())
+    )
+
+
+def get_blocked_patterns(url=None, images=False):
+    """Returns the URL patterns blocked for a page, per selenium_config['resource_blocking']."""
+    config = _blocking_config()
+    if not config.get("enabled", False) or (url and is_allowlisted(url)):
+        return []
+    patterns = []
+    for category in config.get("categories", ()):
+        if category == "images" and images:
+            continue
+        patterns.extend(BLOCK_PATTERNS.get(category, ()))
+    return patterns
+
+
+def apply_resource_blocking(wd, url=None, images=False):
+    """
+    Sets the blocked request patterns for the next navigation.
+
+    :param wd: Instance of Selenium WebDriver (Chromium).
+    :param url: URL about to be opened, checked against the allowlist.
+    :param images: Load images, e.g. because the page will be screenshotted.
+    """
+    patterns = get_blocked_patterns(url, images)
+    if _applied_patterns.get(wd) == patterns:
+        return
+    try:
+        wd.execute_cdp_cmd("Network.enable", {})
+        wd.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        _applied_patterns[wd] = patterns
+    except Exception as e:
+        logger.debug("Could not set blocked URLs: %s", e)
+
+
+def load_blocked_images(wd, timeout=3):
+    """
+    Stops blocking images and re-requests the images the current page failed to load,
+    including srcset / <picture> sources and CSS background images in the viewport,
+    waiting up to timeout seconds for the eager ones and the lazy ones in the viewport.
+    Call before taking a screenshot.
+    """
+    if (
+        "images" not in _blocking_config().get("categories", ())
+        or _applied_patterns.get(wd) is None
+    ):
+        return
+    current_url = wd.current_url
+    apply_resource_blocking(wd, current_url, images=True)
+    if not wd.execute_script(_RELOAD_IMAGES_SCRIPT):
+        return
+    deadline = time.monotonic() + timeout
+    while not wd.execute_script(_IMAGES_LOADED_SCRIPT) and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+
+def page_load_stats(wd):
+    """
+    Returns load time and bytes transferred for the current page from the
+    Navigation and Resource Timing APIs.
+
+    :return: Dict with load_ms, transfer_bytes and requests.
+    """
+    return wd.execute_script(
+        """
+        var nav = performance.getEntriesByType('navigation')[0];
+        var resources = performance.getEntriesByType('resource');
+        var bytes = nav ? nav.transferSize : 0;
+        resources.forEach(function(r) { bytes += r.transferSize; });
+        return {
+            load_ms: nav ? Math.round((nav.loadEventEnd || performance.now()) - nav.startTime) : null,
+            transfer_bytes: bytes,
+            requests: resources.length + 1
+        };
+        """
+    )
+
+
+if __name__ == "__main__":
+    # Benchmark: load local fixture pages with and without resource blocking
+    import os
+    import tempfile
+    import threading
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+    from .selenium import get_web_driver, set_selenium_config, web_driver_pool
+
+    fixture_dir = tempfile.mkdtemp(prefix="blocking-benchmark-")
+    for name, size in [
+        ("font.woff2", 150_000),
+        ("clip.mp4", 2_000_000),
+        ("hero.jpg", 400_000),
+        ("googletagmanager.com-gtag.js", 90_000),
+        ("doubleclick.net-ad.js", 60_000),
+    ]:
+        with open(os.path.join(fixture_dir, name), "wb") as f:
+            f.write(os.urandom(size))
+    for page in range(5):
+        with open(os.path.join(fixture_dir, f"page{page}.html"), "w") as f:
+            f.write(
+                "<html><head><style>@font-face{font-family:F;src:url(font.woff2)}body{font-family:F}</style>"
+                f"<script src='googletagmanager.com-gtag.js?{page}'></script><script src='doubleclick.net-ad.js?{page}'></script></head>"
+                f"<body><h1>Fixture {page}</h1><img src='hero.jpg?{page}'><video src='clip.mp4?{page}' autoplay muted></video>"
+                + "<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p>" * 50
+                + "</body></html>"
+            )
+
+    class FixtureHandler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=fixture_dir, **kwargs)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    set_selenium_config({"headless": True})
+    wd = get_web_driver()
+    wd.execute_cdp_cmd("Network.enable", {})
+    wd.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+
+    for label, enabled in (("no blocking", False), ("blocking", True)):
+        set_selenium_config(
+            {"resource_blocking": {**_blocking_config(), "enabled": enabled}}
+        )
+        load_ms, transfer_bytes = [], []
+        for _ in range(3):
+            for page in range(5):
+                url = f"{base_url}/page{page}.html"
+                apply_resource_blocking(wd, url)
+                wd.get(url)
+                stats = page_load_stats(wd)
+                load_ms.append(stats["load_ms"])
+                transfer_bytes.append(stats["transfer_bytes"])
+        print(
+            f"{label:>12}: {sum(load_ms) / len(load_ms):7.1f} ms/page, {sum(transfer_bytes) / len(transfer_bytes) / 1024:8.1f} KiB/page"
+        )
+
+    web_driver_pool.shutdown()
+    server.shutdown()
@@ -0,0 +1,103 @@
+import base64
+import io
+
+from PIL import Image, ImageDraw, ImageFont
+
+# Collects the challenge grid, every tile with its position and the task text in one call
+CHALLENGE_SCRIPT = """
+var grid = document.getElementById('rc-imageselect-target');
+var gridRect = grid.getBoundingClientRect();
+var tiles = Array.prototype.map.call(document.getElementsByClassName('rc-imageselect-tile'), function(tile) {
+    var rect = tile.getBoundingClientRect();
+    return {
+        element: tile,
+        x: rect.left - gridRect.left, y: rect.top - gridRect.top,
+        width: rect.width, height: rect.height,
+        selected: (tile.className || '').toLowerCase().indexOf('selected') !== -1
+    };
+});
+var instructions = document.getElementsByClassName('rc-imageselect-instructions')[0];
+return {
+    grid: grid,
+    grid_width: gridRect.width,
+    tiles: tiles,
+    instructions: instructions ? instructions.innerText : ''
+};
+"""
+
+TILE_GAP = 4  # pixels between tiles; 4x4 tiles of 120px plus gaps stay within one 512px vision tile
+LABEL_COLOR = (255, 255, 0)
+
+
+def compose_tile_grid(grid_png, grid_width, tiles, max_tile_size=120, quality=80):
+    """
+    Slices the tiles out of one screenshot of the challenge grid and lays them out in a
+    compact grid, numbering the unselected tiles 1..n in document order and greying out
+    the selected ones.
+
+    Args:
+        grid_png (bytes): Screenshot of the grid element
+        grid_width (float): Grid width in CSS pixels, to map tile positions to screenshot pixels
+        tiles (list): Dicts with x, y, width, height (CSS pixels relative to the grid) and selected
+        max_tile_size (int): Longest side of a tile in the composed image
+        quality (int): JPEG quality
+
+    Returns:
+        str: Base64-encoded JPEG of the composed grid
+    """
+    screenshot = Image.open(io.BytesIO(grid_png)).convert("RGB")
+    scale = screenshot.width / grid_width if grid_width else 1
+
+    rows = sorted({round(tile["y"]) for tile in tiles})
+    columns = max(1, len(tiles) // max(1, len(rows)))
+    tile_size = min(
+        max_tile_size, round(max(max(t["width"], t["height"]) for t in tiles) * scale)
+    )
+
+    composed = Image.new(
+        "RGB",
+        (
+            columns * (tile_size + TILE_GAP) + TILE_GAP,
+            len(rows) * (tile_size + TILE_GAP) + TILE_GAP,
+        ),
+        "white",
+    )
+    draw = ImageDraw.Draw(composed)
+    font = ImageFont.load_default(size=max(12, tile_size // 4))
+
+    number = 0
+    for position, tile in enumerate(tiles):
+        box = tuple(
+            round(v * scale)
+            for v in (
+                tile["x"],
+                tile["y"],
+                tile["x"] + tile["width"],
+                tile["y"] + tile["height"],
+            )
+        )
+        image = screenshot.crop(box).resize(
+            (tile_size, tile_size), Image.Resampling.BILINEAR
+        )
+        left = TILE_GAP + (position % columns) * (tile_size + TILE_GAP)
+        top = TILE_GAP + (position // columns) * (tile_size + TILE_GAP)
+
+        if tile["selected"]:
+            composed.paste(
+                Image.blend(image, Image.new("RGB", image.size, "grey"), 0.8),
+                (left, top),
+            )
+            continue
+
+        number += 1
+        composed.paste(image, (left, top))
+        label_box = draw.textbbox((left + 2, top + 2), str(number), font=font)
+        draw.rectangle(
+            (label_box[0] - 2, label_box[1] - 2, label_box[2] + 2, label_box[3] + 2),
+            fill="black",
+        )
+        draw.text((left + 2, top + 2), str(number), fill=LABEL_COLOR, font=font)
+
+    output = io.BytesIO()
+    composed.save(output, format="JPEG", quality=quality)
+    return base64.b64encode(output.getvalue()).decode("ascii")
@@ -0,0 +1,31 @@
+from .blocking import apply_resource_blocking
+from .waits import get_wait_timeout, wait_for_page_ready
+
+# shared_state["current_page"] is {"url": ..., "source": "http" | "browser"}. Pages
+# ReadURL reads over HTTP are not opened in the browser, which stays on the page before.
+
+
+def set_browser_page(wd, shared_state):
+    """
+    Records that the browser window is the current page, after any tool or
+    command that navigates or acts in the browser.
+    """
+    shared_state.set("current_page", {"url": wd.current_url, "source": "browser"})
+
+
+def open_current_page(wd, shared_state):
+    """
+    Loads the page last read over HTTP into the browser, so clicks, keys and
+    screenshots act on the page the agent has seen. Does nothing if the browser
+    already shows the current page.
+
+    :return: The web driver.
+    """
+    current_page = shared_state.get("current_page") or {}
+    if current_page.get("source") == "http":
+        apply_resource_blocking(wd, current_page["url"])
+        wd.get(current_page["url"])
+        wait_for_page_ready(wd, timeout=get_wait_timeout("ReadURL"))
+        shared_state.set("elements_highlighted", "")
+        set_browser_page(wd, shared_state)
+    return wd
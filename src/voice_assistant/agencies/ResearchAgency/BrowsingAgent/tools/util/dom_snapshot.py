@@ -0,0 +1,180 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+HIGHLIGHT_CLASS = "highlighted-element"
+
+# Scrolls the element into view and returns the viewport point a click would hit, or
+# clicks it through JavaScript and returns null when another element covers that point
+_CLICK_POINT_FUNCTION = """
+function() {
+    this.scrollIntoView({block: 'center', inline: 'center', behavior: 'instant'});
+    var rect = this.getBoundingClientRect();
+    var x = rect.left + rect.width / 2, y = rect.top + rect.height / 2;
+    var hit = document.elementFromPoint(x, y);
+    if (hit && (hit === this || this.contains(hit))) {
+        return {x: x, y: y};
+    }
+    this.click();
+    return null;
+}
+"""
+
+_CLEAR_AND_FOCUS_FUNCTION = """
+function() {
+    this.scrollIntoView({block: 'center', behavior: 'instant'});
+    this.focus();
+    if ('value' in this) {
+        this.value = '';
+        this.dispatchEvent(new Event('input', {bubbles: true}));
+    } else if (this.isContentEditable) {
+        this.textContent = '';
+    }
+}
+"""
+
+_SELECT_OPTION_FUNCTION = """
+function(index) {
+    if (index < 0 || index >= this.options.length) {
+        throw new Error('Option index ' + index + ' is out of range, the dropdown has ' + this.options.length + ' options.');
+    }
+    this.selectedIndex = index;
+    this.dispatchEvent(new Event('input', {bubbles: true}));
+    this.dispatchEvent(new Event('change', {bubbles: true}));
+    return this.options[index].text;
+}
+"""
+
+
+@dataclass
+class SnapshotElement:
+    """An element of the DOM snapshot, addressable through CDP by its backend node id."""
+
+    index: int
+    backend_node_id: int
+    tag: str
+    attributes: Dict[str, str] = field(default_factory=dict)
+    bounds: Optional[Tuple[float, float, float, float]] = (
+        None  # x, y, width, height in document pixels
+    )
+
+
+def capture_highlighted_elements(wd):
+    """
+    Returns the elements highlighted by highlight_elements_with_labels, in label order,
+    from a single CDP DOMSnapshot.captureSnapshot call.
+
+    :param wd: Instance of Selenium WebDriver (Chromium).
+    :return: List of SnapshotElement; element number n is at position n - 1.
+    """
+    snapshot = wd.execute_cdp_cmd(
+        "DOMSnapshot.captureSnapshot", {"computedStyles": [], "includeDOMRects": True}
+    )
+    strings = snapshot["strings"]
+    document = snapshot["documents"][
+        0
+    ]  # the highlights only target the top-level document
+    nodes = document["nodes"]
+    layout = document["layout"]
+    bounds_by_node = dict(zip(layout["nodeIndex"], layout["bounds"]))
+
+    elements = []
+    for node_index, attribute_ids in enumerate(nodes["attributes"]):
+        attributes = {
+            strings[attribute_ids[i]]: strings[attribute_ids[i + 1]]
+            for i in range(0, len(attribute_ids), 2)
+        }
+        if HIGHLIGHT_CLASS not in attributes.get("class", "").split():
+            continue
+        bounds = bounds_by_node.get(node_index)
+        elements.append(
+            SnapshotElement(
+                index=len(elements) + 1,
+                backend_node_id=nodes["backendNodeId"][node_index],
+                tag=strings[nodes["nodeName"][node_index]].lower(),
+                attributes=attributes,
+                bounds=tuple(bounds) if bounds else None,
+            )
+        )
+    return elements
+
+
+def call_function_on(wd, element, function_declaration, *args):
+    """Runs a JavaScript function with `this` bound to the element and returns its result."""
+    object_id = wd.execute_cdp_cmd(
+        "DOM.resolveNode", {"backendNodeId": element.backend_node_id}
+    )["object"]["objectId"]
+    try:
+        result = wd.execute_cdp_cmd(
+            "Runtime.callFunctionOn",
+            {
+                "objectId": object_id,
+                "functionDeclaration": function_declaration,
+                "arguments": [{"value": arg} for arg in args],
+                "returnByValue": True,
+                "awaitPromise": True,
+            },
+        )
+    finally:
+        wd.execute_cdp_cmd("Runtime.releaseObject", {"objectId": object_id})
+    if "exceptionDetails" in result:
+        details = result["exceptionDetails"]
+        raise RuntimeError(
+            details.get("exception", {}).get("description") or details.get("text")
+        )
+    return result["result"].get("value")
+
+
+def get_element_text(wd, element):
+    """Visible text of the element, or its value for form fields."""
+    return (
+        call_function_on(
+            wd,
+            element,
+            "function() { return (this.innerText || this.value || '').trim(); }",
+        )
+        or ""
+    )
+
+
+def click_element(wd, element):
+    """Clicks the element with real mouse events, or through JavaScript if it is covered."""
+    point = call_function_on(wd, element, _CLICK_POINT_FUNCTION)
+    if point is None:
+        return
+    wd.execute_cdp_cmd(
+        "Input.dispatchMouseEvent",
+        {"type": "mouseMoved", "x": point["x"], "y": point["y"]},
+    )
+    for event_type in ("mousePressed", "mouseReleased"):
+        wd.execute_cdp_cmd(
+            "Input.dispatchMouseEvent",
+            {
+                "type": event_type,
+                "x": point["x"],
+                "y": point["y"],
+                "button": "left",
+                "clickCount": 1,
+            },
+        )
+
+
+def type_into_element(wd, element, text, submit=False):
+    """Replaces the element's value with text, optionally pressing Enter afterwards."""
+    call_function_on(wd, element, _CLEAR_AND_FOCUS_FUNCTION)
+    wd.execute_cdp_cmd("Input.insertText", {"text": text})
+    if submit:
+        key = {
+            "key": "Enter",
+            "code": "Enter",
+            "windowsVirtualKeyCode": 13,
+            "nativeVirtualKeyCode": 13,
+        }
+        wd.execute_cdp_cmd(
+            "Input.dispatchKeyEvent", {"type": "keyDown", "text": "\r", **key}
+        )
+        wd.execute_cdp_cmd("Input.dispatchKeyEvent", {"type": "keyUp", **key})
+
+
+def select_option(wd, element, index):
+    """Selects the option at index in a <select> element and returns the option text."""
+    return call_function_on(wd, element, _SELECT_OPTION_FUNCTION, index)
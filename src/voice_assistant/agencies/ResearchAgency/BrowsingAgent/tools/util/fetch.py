@@ -0,0 +1,293 @@
+import logging
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .page_cache import content_hash, page_content_cache
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36"
+)
+FETCH_TIMEOUT = (5, 10)  # connect, read seconds
+MAX_DOWNLOAD_BYTES = 5 * 1024 * 1024
+
+# Below this much readable text a page is assumed to be rendered by JavaScript
+MIN_CONTENT_CHARS = 500
+
+# Hosts whose pages are only useful when navigated in the browser (search results, web apps)
+BROWSER_ONLY_HOSTS = (
+    "google.",
+    "bing.com",
+    "duckduckgo.com",
+    "youtube.com",
+    "x.com",
+    "twitter.com",
+)
+
+_REMOVED_TAGS = [
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "svg",
+    "canvas",
+    "iframe",
+    "form",
+    "nav",
+    "header",
+    "footer",
+    "aside",
+]
+_BLOCK_TAGS = ["p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "pre", "blockquote", "td"]
+_UNLIKELY_CANDIDATES = re.compile(
+    r"comment|sidebar|footer|header|menu|nav|banner|cookie|popup|modal|share|social|related|promo|advert",
+    re.I,
+)
+_JS_REQUIRED = re.compile(
+    r"enable javascript|javascript is (disabled|required)|requires javascript", re.I
+)
+_APP_ROOT_IDS = ("root", "app", "__next", "__nuxt", "svelte")
+
+_session = None
+_session_lock = threading.Lock()
+
+# Which path served each recent URL, newest last
+fetch_history = deque(maxlen=100)
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    title: str
+    text: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: str = ""
+
+
+def get_http_session():
+    """Returns the shared requests session, so connections are reused across fetches."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            retry = Retry(
+                total=1,
+                backoff_factor=0.2,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=("GET", "HEAD"),
+            )
+            adapter = HTTPAdapter(
+                pool_connections=10, pool_maxsize=10, max_retries=retry
+            )
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _session.headers.update(
+                {
+                    "User-Agent": USER_AGENT,
+                    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+                    "Accept-Language": "en-US,en;q=0.9",
+                }
+            )
+    return _session
+
+
+def needs_browser(url):
+    """True if the URL should go straight to the browser without trying an HTTP fetch."""
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https"):
+        return True
+    host = parsed.hostname or ""
+    return any(
+        host == h or host.endswith("." + h) or (h.endswith(".") and h in host)
+        for h in BROWSER_ONLY_HOSTS
+    )
+
+
+def _score_candidates(body):
+    """
+    Readability-style scoring: every paragraph adds its text length to its parent and
+    half of it to its grandparent, scaled down by how much of the container is links.
+    """
+    scores = {}
+    for paragraph in body.find_all(["p", "pre", "td"]):
+        text_length = len(paragraph.get_text(" ", strip=True))
+        if text_length < 25:
+            continue
+        points = 1 + min(text_length // 100, 3) + text_length / 100
+        for ancestor, weight in (
+            (paragraph.parent, 1.0),
+            (paragraph.parent.parent if paragraph.parent else None, 0.5),
+        ):
+            if ancestor is None or ancestor.name in ("[document]", "html"):
+                continue
+            scores[ancestor] = scores.get(ancestor, 0) + points * weight
+
+    best, best_score = None, 0
+    for candidate, score in scores.items():
+        text_length = len(candidate.get_text(" ", strip=True)) or 1
+        link_length = sum(
+            len(a.get_text(" ", strip=True)) for a in candidate.find_all("a")
+        )
+        score *= 1 - link_length / text_length
+        if score > best_score:
+            best, best_score = candidate, score
+    return best
+
+
+def _block_text(element):
+    """Text of the element's block-level children, one per line."""
+    lines = []
+    for block in element.find_all(_BLOCK_TAGS):
+        if block.find(_BLOCK_TAGS):
+            continue  # the nested blocks are emitted themselves
+        text = " ".join(block.get_text(" ", strip=True).split())
+        if text:
+            lines.append(text)
+    return (
+        "\n".join(lines)
+        if lines
+        else " ".join(element.get_text(" ", strip=True).split())
+    )
+
+
+def extract_readable_text(html):
+    """
+    Extracts the title and main text of an HTML document (str or bytes).
+
+    :return: Tuple of (title, text, looks_js_rendered).
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.title.get_text(strip=True) if soup.title else ""
+    body = soup.body or soup
+
+    noscript_text = " ".join(
+        tag.get_text(" ", strip=True) for tag in body.find_all("noscript")
+    )
+    script_count = len(soup.find_all("script"))
+    empty_app_root = any(
+        (root := body.find(id=root_id)) is not None and not root.get_text(strip=True)
+        for root_id in _APP_ROOT_IDS
+    )
+
+    for tag in body.find_all(_REMOVED_TAGS):
+        tag.decompose()
+    for tag in body.find_all(attrs={"class": _UNLIKELY_CANDIDATES}):
+        if tag.name not in ("body", "article", "main"):
+            tag.decompose()
+
+    main = (
+        body.find("article") or body.find("main") or body.find(attrs={"role": "main"})
+    )
+    if main is None or len(main.get_text(strip=True)) < MIN_CONTENT_CHARS:
+        main = _score_candidates(body) or body
+    text = _block_text(main)
+
+    looks_js_rendered = len(text) < MIN_CONTENT_CHARS and (
+        empty_app_root
+        or bool(_JS_REQUIRED.search(noscript_text))
+        or script_count > 5
+        or len(text) < 100
+    )
+    return title, text, looks_js_rendered
+
+
+def fetch_readable_page(url):
+    """
+    Fetches a page over plain HTTP and extracts its readable text.
+
+    Pages fetched before are revalidated with If-None-Match / If-Modified-Since, so an
+    unchanged page costs one 304 response and no extraction.
+
+    :return: FetchedPage, or None if the page needs the browser (not HTML, blocked,
+        or rendered by JavaScript).
+    """
+    cached = page_content_cache.get(url)
+    headers = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+    try:
+        response = get_http_session().get(
+            url, headers=headers, timeout=FETCH_TIMEOUT, stream=True
+        )
+    except requests.RequestException as e:
+        logger.debug("HTTP fetch of %s failed: %s", url, e)
+        return None
+
+    with response:
+        if response.status_code == 304 and cached is not None:
+            logger.debug("HTTP fetch of %s not modified, using cached content", url)
+            return cached
+        content_type = response.headers.get("Content-Type", "")
+        if response.status_code != 200 or "html" not in content_type:
+            logger.debug(
+                "HTTP fetch of %s unusable: %s %s",
+                url,
+                response.status_code,
+                content_type,
+            )
+            return None
+        content = response.raw.read(MAX_DOWNLOAD_BYTES + 1, decode_content=True)
+        if len(content) > MAX_DOWNLOAD_BYTES:
+            return None
+        # Without a charset header BeautifulSoup detects the encoding from the bytes / meta tag
+        html = (
+            content.decode(response.encoding, errors="replace")
+            if "charset" in content_type
+            else content
+        )
+
+    title, text, looks_js_rendered = extract_readable_text(html)
+    if looks_js_rendered:
+        logger.debug("HTTP fetch of %s looks JavaScript-rendered", url)
+        return None
+    page = FetchedPage(
+        url=response.url,
+        title=title,
+        text=text,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        content_hash=content_hash(text),
+    )
+    page_content_cache.set(url, page)
+    if response.url != url:
+        page_content_cache.set(response.url, page)
+    return page
+
+
+def record_fetch(url, path, started, reason="", stats=None):
+    """
+    Records which path (http or browser) served a URL and how long it took, plus the
+    page's load time and bytes transferred when served by the browser.
+    """
+    elapsed = time.perf_counter() - started
+    entry = {"url": url, "path": path, "seconds": round(elapsed, 3), "reason": reason}
+    if stats:
+        entry.update(stats)
+    fetch_history.append(entry)
+    logger.info(
+        "%s served by %s in %.2fs%s%s",
+        url,
+        path,
+        elapsed,
+        f" ({reason})" if reason else "",
+        f", {stats['transfer_bytes']} bytes in {stats['requests']} requests"
+        if stats
+        else "",
+    )
@@ -1,33 +1,55 @@
+import json
+
+
 def highlight_elements_with_labels(driver, selector):
     """
     This function highlights clickable elements like buttons, links, and certain divs and spans
     that match the given CSS selector on the webpage with a red border and ensures that labels are visible and positioned
     correctly within the viewport.
 
+    Everything the caller needs about the highlighted elements is collected by the same script,
+    so no further WebDriver round trips per element are required.
+
     :param driver: Instance of Selenium WebDriver.
     :param selector: CSS selector for the elements to be highlighted.
+    :return: List of dicts, one per highlighted element, in label order:
+        {"index": label number, "text": visible text, "tag": lowercase tag name,
+         "rect": {"x", "y", "width", "height"} in viewport pixels,
+         "options": option texts for <select> elements (first 12), otherwise None}
     """
     script = f"""
-        // Helper function to check if an element is visible
-        function isElementVisible(element) {{
+        var viewportHeight = window.innerHeight || document.documentElement.clientHeight;
+        var viewportWidth = window.innerWidth || document.documentElement.clientWidth;
+
+        // Hidden state per ancestor, so shared ancestors are styled only once per call
+        var hiddenCache = new Map();
+        function isHiddenByStyle(node) {{
+            if (!node || node === document.documentElement) return false;
+            if (hiddenCache.has(node)) return hiddenCache.get(node);
+            var style = window.getComputedStyle(node);
+            var hidden = style.display === 'none' || style.visibility === 'hidden' ||
+                isHiddenByStyle(node.parentElement);
+            hiddenCache.set(node, hidden);
+            return hidden;
+        }}
+
+        // Helper function to check if an element is visible, returning its rect if it is
+        function getVisibleRect(element) {{
             var rect = element.getBoundingClientRect();
             if (rect.width <= 0 || rect.height <= 0 ||
-                rect.top >= (window.innerHeight || document.documentElement.clientHeight) ||
+                rect.top >= viewportHeight ||
                 rect.bottom <= 0 ||
-                rect.left >= (window.innerWidth || document.documentElement.clientWidth) ||
+                rect.left >= viewportWidth ||
                 rect.right <= 0) {{
-                return false;
+                return null;
             }}
-            // Check if any parent element is hidden, which would hide this element as well
-            var parent = element;
-            while (parent) {{
-                var style = window.getComputedStyle(parent);
-                if (style.display === 'none' || style.visibility === 'hidden') {{
-                    return false;
-                }}
-                parent = parent.parentElement;
+            // Native check covers display/visibility of all ancestors without a style walk
+            if (element.checkVisibility) {{
+                if (!element.checkVisibility({{visibilityProperty: true}})) return null;
+            }} else if (isHiddenByStyle(element)) {{
+                return null;
             }}
-            return true;
+            return rect;
         }}
 
         // Remove previous labels and styles if they exist
@@ -70,9 +92,7 @@ def highlight_elements_with_labels(driver, selector):
         `;
 
         // Function to create and append a label to the body
-        function createAndAdjustLabel(element, index) {{
-            if (!isElementVisible(element)) return;
-
+        function createAndAdjustLabel(element, rect, index) {{
             element.classList.add('highlighted-element');
             var label = document.createElement('div');
             label.className = 'highlight-label';
@@ -80,31 +100,54 @@ def highlight_elements_with_labels(driver, selector):
             label.style.display = 'block'; // Make the label visible
 
             // Calculate label position
-            var rect = element.getBoundingClientRect();
             var top = rect.top + window.scrollY - 25; // Position label above the element
             var left = rect.left + window.scrollX;
 
             label.style.top = top + 'px';
             label.style.left = left + 'px';
 
-            document.body.appendChild(label); // Append the label to the body
+            return label;
         }}
 
-        // Select all clickable elements and apply the styles
+        // Select all clickable elements, apply the styles and describe them for the caller
         var allElements = document.querySelectorAll('{selector}');
+        var labels = document.createDocumentFragment();
+        var results = [];
         var index = 1;
         allElements.forEach(function(element) {{
             // Check if the element is not already highlighted and is visible
-            if (!element.dataset.highlighted && isElementVisible(element)) {{
-                element.dataset.highlighted = 'true';
-                createAndAdjustLabel(element, index++);
+            if (element.dataset.highlighted) return;
+            var rect = getVisibleRect(element);
+            if (!rect) return;
+
+            element.dataset.highlighted = 'true';
+            labels.appendChild(createAndAdjustLabel(element, rect, index));
+
+            var options = null;
+            if (element.tagName === 'SELECT') {{
+                options = Array.prototype.slice.call(element.options, 0, 12).map(function(option) {{
+                    return option.text;
+                }});
             }}
+            results.push({{
+                index: index,
+                text: (element.innerText || '').trim(),
+                tag: element.tagName.toLowerCase(),
+                rect: {{
+                    x: Math.round(rect.left), y: Math.round(rect.top),
+                    width: Math.round(rect.width), height: Math.round(rect.height)
+                }},
+                options: options
+            }});
+            index++;
         }});
-        """
+        // Append all labels at once so layout is only invalidated once
+        document.body.appendChild(labels);
 
-    driver.execute_script(script)
+        return JSON.stringify(results);
+        """
 
-    return driver
+    return json.loads(driver.execute_script(script) or "[]")
 
 
 def remove_highlight_and_labels(driver):
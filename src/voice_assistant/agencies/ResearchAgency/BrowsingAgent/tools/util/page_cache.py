@@ -0,0 +1,20 @@
+import hashlib
+
+from voice_assistant.utils.cache_utils import TTLCache
+
+
+def content_hash(text):
+    """Stable hash of page text, ignoring whitespace differences."""
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+# url -> FetchedPage, revalidated with its ETag / Last-Modified on the next fetch
+page_content_cache = TTLCache(ttl_seconds=3600, max_entries=200, name="page_content")
+
+# content hash of a page -> summary of the whole page
+summary_cache = TTLCache(ttl_seconds=86400, max_entries=500, name="page_summary")
+
+# content hash of one chunk of a long page -> partial summary, made with a different prompt
+chunk_summary_cache = TTLCache(
+    ttl_seconds=86400, max_entries=500, name="page_chunk_summary"
+)
@@ -0,0 +1,78 @@
+import base64
+import hashlib
+import re
+import tempfile
+
+IO_READ_CHUNK_SIZE = 1024 * 1024  # bytes requested per CDP IO.read call
+SPOOL_MAX_SIZE = (
+    8 * 1024 * 1024
+)  # larger exports spill to a temporary file instead of memory
+
+# Chrome stamps every PDF with the time it was printed
+_TIMESTAMP_PATTERN = re.compile(rb"/(CreationDate|ModDate)\s*\(D:[^)]*\)")
+_TIMESTAMP_MAX_LENGTH = 64
+
+
+class _ContentDigest:
+    """sha256 of a PDF stream that ignores the creation/modification timestamps."""
+
+    def __init__(self):
+        self._digest = hashlib.sha256()
+        self._pending = b""
+
+    def update(self, data):
+        # Hold back a tail so a timestamp split across chunks is still matched
+        data = _TIMESTAMP_PATTERN.sub(b"", self._pending + data)
+        self._pending = data[-_TIMESTAMP_MAX_LENGTH:]
+        self._digest.update(data[:-_TIMESTAMP_MAX_LENGTH])
+
+    def hexdigest(self):
+        self._digest.update(_TIMESTAMP_PATTERN.sub(b"", self._pending))
+        return self._digest.hexdigest()
+
+
+def print_to_pdf_stream(wd, params):
+    """
+    Prints the current page to PDF through CDP with transferMode ReturnAsStream and
+    reads the result chunk by chunk, so the whole document is never held as one
+    base64 string.
+
+    Args:
+        wd: Instance of Selenium WebDriver (Chromium)
+        params (dict): Page.printToPDF parameters
+
+    Returns:
+        tuple: (SpooledTemporaryFile positioned at the start, content hash, size in bytes).
+            The hash ignores the print timestamps, so exports of an unchanged page match.
+    """
+    result = wd.execute_cdp_cmd(
+        "Page.printToPDF", {**params, "transferMode": "ReturnAsStream"}
+    )
+    handle = result["stream"]
+
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    digest = _ContentDigest()
+    size = 0
+    try:
+        while True:
+            chunk = wd.execute_cdp_cmd(
+                "IO.read", {"handle": handle, "size": IO_READ_CHUNK_SIZE}
+            )
+            data = (
+                base64.b64decode(chunk["data"])
+                if chunk.get("base64Encoded")
+                else chunk["data"].encode("latin-1")
+            )
+            output.write(data)
+            digest.update(data)
+            size += len(data)
+            if chunk.get("eof"):
+                break
+    except Exception:
+        output.close()
+        raise
+    finally:
+        wd.execute_cdp_cmd("IO.close", {"handle": handle})
+
+    output.seek(0)
+    return output, digest.hexdigest(), size
@@ -0,0 +1,103 @@
+import atexit
+import base64
+import hashlib
+import io
+import logging
+import threading
+
+from PIL import Image
+
+from . import selenium as selenium_util
+
+logger = logging.getLogger(__name__)
+
+
+def capture_viewport_jpeg(wd):
+    """
+    Captures the visible viewport as a downscaled JPEG entirely in memory.
+
+    Chrome encodes the JPEG itself through the DevTools Page.captureScreenshot command;
+    the image is only decoded and re-encoded here when it is larger than
+    selenium_config['screenshot_max_size'].
+
+    :param wd: Instance of Selenium WebDriver.
+    :return: JPEG bytes.
+    """
+    max_size = tuple(
+        selenium_util.selenium_config.get("screenshot_max_size", (1536, 768))
+    )
+    quality = selenium_util.selenium_config.get("screenshot_quality", 75)
+
+    try:
+        result = wd.execute_cdp_cmd(
+            "Page.captureScreenshot",
+            {"format": "jpeg", "quality": quality, "captureBeyondViewport": False},
+        )
+        data = base64.b64decode(result["data"])
+    except Exception:
+        # Not a Chromium driver, fall back to the WebDriver PNG screenshot
+        data = wd.get_screenshot_as_png()
+
+    image = Image.open(io.BytesIO(data))
+    if (
+        image.format == "JPEG"
+        and image.width <= max_size[0]
+        and image.height <= max_size[1]
+    ):
+        return data
+
+    image.draft("RGB", max_size)  # lets libjpeg decode at a reduced scale
+    image.thumbnail(max_size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+    output = io.BytesIO()
+    image.convert("RGB").save(output, format="JPEG", quality=quality)
+    return output.getvalue()
+
+
+class VisionUploadCache:
+    """
+    Uploads screenshots for vision messages, reusing the file of an identical
+    screenshot.
+
+    Earlier messages of the Assistants thread keep referencing their screenshots,
+    so no upload is deleted while the session runs. close() deletes them all and
+    runs at exit.
+
+    Usage:
+        uploads = VisionUploadCache()
+        file_id, uploaded_bytes = uploads.upload(client, jpeg_bytes)
+    """
+
+    def __init__(self):
+        self._file_ids = {}  # sha256 -> (client, file_id)
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def upload(self, client, data, filename="screenshot.jpg"):
+        """
+        Returns the file id for the image, uploading it only if the same bytes
+        were not uploaded before in this session.
+
+        :return: Tuple of (file_id, number of bytes uploaded).
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if digest in self._file_ids:
+                return self._file_ids[digest][1], 0
+
+        file_id = client.files.create(
+            file=(filename, data, "image/jpeg"), purpose="vision"
+        ).id
+
+        with self._lock:
+            self._file_ids[digest] = (client, file_id)
+        return file_id, len(data)
+
+    def close(self):
+        """Deletes every screenshot uploaded in this session, once its thread is no longer used."""
+        with self._lock:
+            uploads, self._file_ids = list(self._file_ids.values()), {}
+        for client, file_id in uploads:
+            try:
+                client.files.delete(file_id)
+            except Exception as e:
+                logger.warning("Could not delete screenshot upload %s: %s", file_id, e)
@@ -1,81 +1,411 @@
+import atexit
+import functools
+import logging
 import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 
-wd = None
+logger = logging.getLogger(__name__)
 
 selenium_config = {
     "chrome_profile_path": None,
     "headless": False,
     "full_page_screenshot": True,
+    # Vision screenshots are viewport JPEGs downscaled to fit this size
+    "screenshot_max_size": (1536, 768),
+    "screenshot_quality": 75,
+    # Requests dropped via CDP Network.setBlockedURLs; images are loaded once a screenshot is taken
+    "resource_blocking": {
+        "enabled": True,
+        "categories": ["fonts", "media", "trackers", "ads", "images"],
+        "allowlist": [],  # domains (and their subdomains) where nothing is blocked
+    },
+    # WebDriver pool settings
+    "pool_max_size": 3,  # maximum number of concurrent Chrome instances
+    "pool_idle_timeout": 300,  # seconds before an idle Chrome instance is closed
+    "pool_acquire_timeout": 120,  # seconds to wait for a free instance when the pool is full
+    # Max seconds each tool waits for the page to load, go network-idle and settle
+    "wait_timeouts": {
+        "ReadURL": 15,
+        "ClickElement": 10,
+        "SendKeys": 10,
+        "GoBack": 10,
+        "SolveCaptcha": 5,
+    },
 }
 
+_HEALTH_CHECK_INTERVAL = 30  # seconds
 
-def get_web_driver():
-    print("Initializing WebDriver...")
+
+class _PooledDriver:
+    """A Chrome instance owned by the pool, with the resources it was started with."""
+
+    def __init__(self, driver, debugging_port, profile_dir, owns_profile_dir):
+        self.driver = driver
+        self.debugging_port = debugging_port
+        self.profile_dir = profile_dir
+        self.owns_profile_dir = owns_profile_dir
+        self.lease_key = None
+        self.lease_thread = None
+        self.last_used = time.monotonic()
+
+
+class WebDriverPool:
+    """
+    Pool of Chrome WebDriver instances so browsing tasks can run in parallel.
+
+    Each task holds a lease on one driver; by default the lease key is the calling
+    thread, which matches how agencies run each agent conversation in its own thread.
+    Every instance gets its own remote-debugging port and profile directory.
+    Dead or crashed drivers are replaced, idle ones are closed after
+    pool_idle_timeout seconds, and leases held by finished threads are reclaimed.
+
+    Usage:
+        wd = web_driver_pool.acquire()  # same driver on every call from this task
+        ...
+        web_driver_pool.release()
+
+        with web_driver_pool.lease("research-task-1") as wd:
+            wd.get("https://example.com")
+    """
+
+    def __init__(self):
+        self._drivers = []
+        self._starting = 0
+        self._warming = 0
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._user_profile_in_use = False
+
+    def _current_key(self):
+        return getattr(self._local, "lease_key", None) or threading.current_thread()
+
+    def acquire(self, key=None):
+        """
+        Returns the driver leased to the given key (default: the current task),
+        leasing an idle or new driver if it does not hold one yet.
+
+        Health checks and quitting dead drivers are WebDriver round trips that can
+        hang on a stuck Chrome, so they run outside the pool lock.
+        """
+        key = key or self._current_key()
+        deadline = time.monotonic() + selenium_config.get("pool_acquire_timeout", 120)
+
+        while True:
+            to_close = []
+            with self._condition:
+                action, pooled = self._choose(key, deadline, to_close)
+            for closing in to_close:
+                self._close(closing)
+
+            if action == "ready":
+                return pooled.driver
+            if action == "check":
+                if self._is_healthy(pooled):
+                    with self._condition:
+                        pooled.last_used = time.monotonic()
+                    return pooled.driver
+                with self._condition:
+                    self._remove(pooled)
+                    self._condition.notify_all()
+                self._close(pooled)
+                continue
+            break
+
+        # Start Chrome outside the lock so other tasks are not blocked while it boots
+        try:
+            pooled = self._start_driver()
+        finally:
+            with self._condition:
+                self._starting -= 1
+                self._condition.notify_all()
+
+        with self._condition:
+            self._drivers.append(pooled)
+            self._lease(pooled, key)
+        return pooled.driver
+
+    def _choose(self, key, deadline, to_close):
+        """
+        Picks what acquire() does next, waiting while the pool is full. Caller holds
+        the lock; drivers removed by the reaper are added to to_close.
+
+        :return: ("ready", driver) to use as is, ("check", driver) to health check
+            first, or ("start", None) after reserving a slot for a new driver.
+        """
+        while True:
+            to_close.extend(self._reap())
+
+            leased = next((d for d in self._drivers if d.lease_key == key), None)
+            if leased:
+                # Only re-check drivers that sat unused for a while; checks cost a round trip
+                if time.monotonic() - leased.last_used < _HEALTH_CHECK_INTERVAL:
+                    leased.last_used = time.monotonic()
+                    return "ready", leased
+                return "check", leased
+
+            # Most recently used first, so a follow-up task continues where the last one left off
+            idle = [d for d in self._drivers if d.lease_key is None]
+            if idle:
+                pooled = max(idle, key=lambda d: d.last_used)
+                # Leased before the check so no other task takes it meanwhile
+                self._lease(pooled, key)
+                return "check", pooled
+
+            # A driver being warmed up is about to become idle; wait for it instead of starting another
+            if not self._warming and len(
+                self._drivers
+            ) + self._starting < selenium_config.get("pool_max_size", 3):
+                self._starting += 1
+                return "start", None
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Timed out waiting for a free WebDriver instance.")
+            # Finished threads do not notify, so poll to reclaim their leases
+            self._condition.wait(timeout=min(remaining, 0.5))
+
+    def release(self, key=None):
+        """Returns the driver leased to the key to the pool, keeping it open for reuse."""
+        key = key or self._current_key()
+        with self._condition:
+            for pooled in self._drivers:
+                if pooled.lease_key == key:
+                    pooled.lease_key = None
+                    pooled.lease_thread = None
+                    pooled.last_used = time.monotonic()
+            self._condition.notify_all()
+
+    @contextmanager
+    def lease(self, key=None):
+        """
+        Leases a driver for the duration of the block. Calls to get_web_driver()
+        from this thread inside the block use the same driver.
+        """
+        key = key or object()
+        previous_key = getattr(self._local, "lease_key", None)
+        self._local.lease_key = key
+        try:
+            yield self.acquire(key)
+        finally:
+            self._local.lease_key = previous_key
+            self.release(key)
+
+    def warm_up(self):
+        """
+        Starts one Chrome instance in a background thread and leaves it idle in the
+        pool, so the first browsing action does not pay for imports and startup.
+        Does nothing if the pool already has a driver.
+        """
+        with self._condition:
+            if self._drivers or self._starting or self._warming:
+                return
+            self._starting += 1
+            self._warming += 1
+
+        def warm():
+            try:
+                pooled = self._start_driver()
+            except Exception as e:
+                logger.warning("WebDriver warm-up failed: %s", e)
+                pooled = None
+            with self._condition:
+                self._starting -= 1
+                self._warming -= 1
+                if pooled is not None:
+                    self._drivers.append(pooled)
+                self._condition.notify_all()
+
+        threading.Thread(target=warm, name="webdriver-warm-up", daemon=True).start()
+
+    def shutdown(self):
+        """Closes every driver and removes temporary profile directories."""
+        with self._condition:
+            drivers, self._drivers = self._drivers, []
+            self._condition.notify_all()
+        for pooled in drivers:
+            self._close(pooled)
+
+    @property
+    def size(self):
+        return len(self._drivers)
+
+    def _lease(self, pooled, key):
+        pooled.lease_key = key
+        pooled.lease_thread = (
+            key if isinstance(key, threading.Thread) else threading.current_thread()
+        )
+        pooled.last_used = time.monotonic()
+
+    def _reap(self):
+        """
+        Reclaims leases of finished threads and removes drivers idle for too long.
+        Caller holds the lock and closes the returned drivers after releasing it.
+        """
+        idle_timeout = selenium_config.get("pool_idle_timeout", 300)
+        now = time.monotonic()
+        expired = []
+        for pooled in list(self._drivers):
+            if pooled.lease_thread is not None and not pooled.lease_thread.is_alive():
+                pooled.lease_key = None
+                pooled.lease_thread = None
+                pooled.last_used = now
+            if pooled.lease_key is None and now - pooled.last_used > idle_timeout:
+                logger.info(
+                    "Closing WebDriver on port %s after %ss idle.",
+                    pooled.debugging_port,
+                    idle_timeout,
+                )
+                self._remove(pooled)
+                expired.append(pooled)
+        return expired
+
+    def _is_healthy(self, pooled):
+        try:
+            pooled.driver.execute_script("return 1;")
+            return True
+        except Exception as e:
+            logger.warning(
+                "WebDriver on port %s failed health check: %s", pooled.debugging_port, e
+            )
+            return False
+
+    def _remove(self, pooled):
+        """Takes a driver out of the pool. Caller holds the lock."""
+        if pooled in self._drivers:
+            self._drivers.remove(pooled)
+
+    def _close(self, pooled):
+        """Quits a driver removed from the pool. Call without holding the lock."""
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+        if pooled.owns_profile_dir:
+            shutil.rmtree(pooled.profile_dir, ignore_errors=True)
+        else:
+            with self._condition:
+                self._user_profile_in_use = False
+
+    def _start_driver(self):
+        chrome_profile_path = selenium_config.get("chrome_profile_path", None)
+        use_user_profile = False
+        with self._condition:
+            # A Chrome profile can only be opened by one instance at a time
+            if (
+                isinstance(chrome_profile_path, str)
+                and os.path.exists(chrome_profile_path)
+                and not self._user_profile_in_use
+            ):
+                self._user_profile_in_use = True
+                use_user_profile = True
+
+        debugging_port = _find_free_port()
+        if use_user_profile:
+            profile_dir = chrome_profile_path
+        else:
+            profile_dir = tempfile.mkdtemp(prefix="browsing-agent-profile-")
+
+        try:
+            driver = _create_web_driver(debugging_port, profile_dir, use_user_profile)
+        except Exception:
+            if use_user_profile:
+                with self._condition:
+                    self._user_profile_in_use = False
+            else:
+                shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+
+        return _PooledDriver(
+            driver, debugging_port, profile_dir, owns_profile_dir=not use_user_profile
+        )
+
+
+def _find_free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@functools.cache
+def _import_browser_modules():
+    """Imports selenium, webdriver_manager and selenium_stealth once per process."""
     try:
         from selenium import webdriver
         from selenium.webdriver.chrome.service import Service as ChromeService
-
-        print("Selenium imported successfully.")
     except ImportError:
-        print("Selenium not installed. Please install it with pip install selenium")
-        raise ImportError
+        logger.error(
+            "Selenium not installed. Please install it with pip install selenium"
+        )
+        raise
 
     try:
         from webdriver_manager.chrome import ChromeDriverManager
-
-        print("webdriver_manager imported successfully.")
     except ImportError:
-        print("webdriver_manager not installed. Please install it with pip install webdriver-manager")
-        raise ImportError
+        logger.error(
+            "webdriver_manager not installed. Please install it with pip install webdriver-manager"
+        )
+        raise
 
     try:
         from selenium_stealth import stealth
-
-        print("selenium_stealth imported successfully.")
     except ImportError:
-        print("selenium_stealth not installed. Please install it with pip install selenium-stealth")
-        raise ImportError
+        logger.error(
+            "selenium_stealth not installed. Please install it with pip install selenium-stealth"
+        )
+        raise
 
-    global wd, selenium_config
+    return webdriver, ChromeService, ChromeDriverManager, stealth
 
-    if wd:
-        print("Returning existing WebDriver instance.")
-        return wd
 
-    chrome_profile_path = selenium_config.get("chrome_profile_path", None)
-    profile_directory = None
-    user_data_dir = None
-    if isinstance(chrome_profile_path, str) and os.path.exists(chrome_profile_path):
-        profile_directory = os.path.split(chrome_profile_path)[-1].strip("\\").rstrip("/")
-        user_data_dir = os.path.split(chrome_profile_path)[0].strip("\\").rstrip("/")
-        print(f"Using Chrome profile: {profile_directory}")
-        print(f"Using Chrome user data dir: {user_data_dir}")
-        print(f"Using Chrome profile path: {chrome_profile_path}")
+@functools.cache
+def _get_chrome_driver_path():
+    """Resolves the chromedriver binary once; webdriver_manager checks versions over the network."""
+    chrome_driver_path = "/usr/bin/chromedriver"
+    if os.path.exists(chrome_driver_path):
+        logger.debug("ChromeDriver found at %s.", chrome_driver_path)
+        return chrome_driver_path
+    logger.debug(
+        "ChromeDriver not found at /usr/bin/chromedriver. Installing using webdriver_manager."
+    )
+    _, _, ChromeDriverManager, _ = _import_browser_modules()
+    return ChromeDriverManager().install()
 
-    chrome_options = webdriver.ChromeOptions()
-    print("ChromeOptions initialized.")
 
-    chrome_driver_path = "/usr/bin/chromedriver"
-    if not os.path.exists(chrome_driver_path):
-        print("ChromeDriver not found at /usr/bin/chromedriver. Installing using webdriver_manager.")
-        chrome_driver_path = ChromeDriverManager().install()
+def _create_web_driver(debugging_port, profile_dir, use_user_profile):
+    logger.debug("Initializing WebDriver...")
+    webdriver, ChromeService, _, stealth = _import_browser_modules()
+
+    if use_user_profile:
+        profile_directory = os.path.split(profile_dir)[-1].strip("\\").rstrip("/")
+        user_data_dir = os.path.split(profile_dir)[0].strip("\\").rstrip("/")
+        logger.debug(
+            "Using Chrome profile %s in user data dir %s",
+            profile_directory,
+            user_data_dir,
+        )
     else:
-        print(f"ChromeDriver found at {chrome_driver_path}.")
+        profile_directory = None
+        user_data_dir = profile_dir
+
+    chrome_options = webdriver.ChromeOptions()
+    chrome_driver_path = _get_chrome_driver_path()
 
     if selenium_config.get("headless", False):
         chrome_options.add_argument("--headless")
-        print("Headless mode enabled.")
     if selenium_config.get("full_page_screenshot", False):
         chrome_options.add_argument("--start-maximized")
-        print("Full page screenshot mode enabled.")
     else:
         chrome_options.add_argument("--window-size=1920,1080")
-        print("Window size set to 1920,1080.")
 
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--remote-debugging-port=9222")
+    chrome_options.add_argument(f"--remote-debugging-port={debugging_port}")
     chrome_options.add_argument("--disable-extensions")
     chrome_options.add_argument("--disable-popup-blocking")
     chrome_options.add_argument("--ignore-certificate-errors")
@@ -84,23 +414,28 @@ def get_web_driver():
     chrome_options.add_argument("--allow-running-insecure-content")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option("useAutomationExtension", False)
-    print("Chrome options configured.")
+    # CDP Network events are read from the performance log to detect network idle
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
 
-    if user_data_dir and profile_directory:
-        chrome_options.add_argument(f"user-data-dir={user_data_dir}")
+    chrome_options.add_argument(f"user-data-dir={user_data_dir}")
+    if profile_directory:
         chrome_options.add_argument(f"profile-directory={profile_directory}")
-        print(f"Using user data dir: {user_data_dir} and profile directory: {profile_directory}")
 
     try:
-        wd = webdriver.Chrome(service=ChromeService(chrome_driver_path), options=chrome_options)
-        print("WebDriver initialized successfully.")
-        if wd.capabilities["chrome"]["userDataDir"]:
-            print(f"Profile path in use: {wd.capabilities['chrome']['userDataDir']}")
+        wd = webdriver.Chrome(
+            service=ChromeService(chrome_driver_path), options=chrome_options
+        )
     except Exception as e:
-        print(f"Error initializing WebDriver: {e}")
+        logger.error("Error initializing WebDriver: %s", e)
         raise e
+    logger.info(
+        "WebDriver started on debugging port %s (headless=%s, user data dir %s).",
+        debugging_port,
+        selenium_config.get("headless", False),
+        wd.capabilities.get("chrome", {}).get("userDataDir"),
+    )
 
-    if not selenium_config.get("chrome_profile_path", None):
+    if not use_user_profile:
         stealth(
             wd,
             languages=["en-US", "en"],
@@ -110,14 +445,30 @@ def get_web_driver():
             renderer="Intel Iris OpenGL Engine",
             fix_hairline=True,
         )
-        print("Stealth mode configured.")
 
     wd.implicitly_wait(3)
-    print("Implicit wait set to 3 seconds.")
+
+    from .blocking import apply_resource_blocking
+
+    apply_resource_blocking(wd)
 
     return wd
 
 
+web_driver_pool = WebDriverPool()
+atexit.register(web_driver_pool.shutdown)
+
+
+def get_web_driver():
+    """Returns the WebDriver leased to the current browsing task."""
+    return web_driver_pool.acquire()
+
+
+def release_web_driver():
+    """Returns the current task's WebDriver to the pool so other tasks can use it."""
+    web_driver_pool.release()
+
+
 def set_web_driver(new_wd):
     # remove all popups
     js_script = """
@@ -148,10 +499,7 @@ def set_web_driver(new_wd):
 
     new_wd.execute_script("document.body.style.zoom='1.2'")
 
-    global wd
-    wd = new_wd
-
 
 def set_selenium_config(config):
     global selenium_config
-    selenium_config = config
+    selenium_config = {**selenium_config, **config}
@@ -0,0 +1,244 @@
+import json
+import time
+import uuid
+import weakref
+
+from . import selenium as selenium_util
+
+POLL_INTERVAL = 0.1  # seconds
+NAVIGATION_START_GRACE = 1.0  # seconds an action may take to show any effect
+
+# Requests still in flight per driver, rebuilt from the CDP performance log
+_inflight_requests = weakref.WeakKeyDictionary()
+# Whether a frame started loading since mark_document, from the same log
+_frame_started_loading = weakref.WeakKeyDictionary()
+
+_MARK_DOCUMENT_SCRIPT = """
+window.__navMarker = arguments[0];
+window.__navMutated = false;
+if (!window.__navObserver) {
+    window.__navObserver = new MutationObserver(function() { window.__navMutated = true; });
+    window.__navObserver.observe(document, {
+        childList: true, subtree: true, characterData: true, attributes: true
+    });
+}
+"""
+
+_DOM_QUIET_SCRIPT = """
+if (!window.__domQuietObserver) {
+    window.__lastDomMutation = window.__lastAttributeMutation = performance.now();
+    window.__domQuietObserver = new MutationObserver(function(mutations) {
+        var now = performance.now();
+        for (var i = 0; i < mutations.length; i++) {
+            if (mutations[i].type === 'attributes') {
+                window.__lastAttributeMutation = now;
+            } else {
+                window.__lastDomMutation = now;
+            }
+        }
+    });
+    window.__domQuietObserver.observe(document, {
+        childList: true, subtree: true, characterData: true, attributes: true
+    });
+}
+var now = performance.now();
+return [now - window.__lastDomMutation, now - window.__lastAttributeMutation];
+"""
+
+
+def get_wait_timeout(tool_name, default=10):
+    """Returns the readiness timeout configured for a tool in selenium_config['wait_timeouts']."""
+    return selenium_util.selenium_config.get("wait_timeouts", {}).get(
+        tool_name, default
+    )
+
+
+def mark_document(wd):
+    """
+    Tags the current document before an action that may navigate away from it.
+    Pass the result to wait_for_page_ready so it does not mistake the old
+    document's readyState for the new page being loaded.
+
+    :return: (url, marker) identifying the current document.
+    """
+    marker = uuid.uuid4().hex
+    try:
+        wd.execute_script(_MARK_DOCUMENT_SCRIPT, marker)
+    except Exception:
+        marker = None
+    # Drain older log entries so only loads started by the action are seen
+    _update_inflight_requests(wd)
+    _frame_started_loading[wd] = False
+    return wd.current_url, marker
+
+
+def wait_for_action_effect(wd, previous_document, timeout=NAVIGATION_START_GRACE):
+    """
+    Waits until the action after mark_document shows an effect: the document was
+    replaced, the URL changed, a frame started loading or the DOM mutated. In-page
+    actions return on their first DOM change; a navigation started after such a
+    change is still caught by the network idle wait. Gives up after a short grace
+    period for actions with no visible effect.
+
+    :return: True if the action showed an effect before the timeout.
+    """
+    url, marker = previous_document
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if wd.current_url != url:
+                return True
+            current_marker, mutated = wd.execute_script(
+                "return [window.__navMarker, window.__navMutated];"
+            )
+            if (marker and current_marker != marker) or mutated:
+                return True
+        except Exception:
+            return True  # the old document is being torn down
+        _update_inflight_requests(wd)
+        if _frame_started_loading.get(wd):
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(POLL_INTERVAL)
+
+
+def wait_for_document_ready(wd, timeout=10, previous_document=None):
+    """
+    Waits until document.readyState is 'complete'. With previous_document from
+    mark_document, first waits for the action to take effect, because
+    right after a click its readyState is still 'complete'.
+
+    :return: True if the document became ready before the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    if previous_document is not None:
+        wait_for_action_effect(
+            wd, previous_document, min(timeout, NAVIGATION_START_GRACE)
+        )
+    while True:
+        try:
+            if wd.execute_script("return document.readyState") == "complete":
+                return True
+        except Exception:
+            pass  # the document may be swapped out mid-navigation
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(POLL_INTERVAL)
+
+
+def _update_inflight_requests(wd):
+    """
+    Drains the CDP performance log and returns the set of requests still in flight,
+    or None if the driver was started without performance logging.
+    """
+    try:
+        entries = wd.get_log("performance")
+    except Exception:
+        return None
+
+    inflight = _inflight_requests.setdefault(wd, set())
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        method = message.get("method", "")
+        request_id = message.get("params", {}).get("requestId")
+        if method == "Network.requestWillBeSent":
+            inflight.add(request_id)
+        elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+            inflight.discard(request_id)
+        elif method == "Page.frameStartedLoading":
+            _frame_started_loading[wd] = True
+        elif method == "Page.frameNavigated" and not message["params"]["frame"].get(
+            "parentId"
+        ):
+            # A top-level navigation abandons everything the previous page had pending
+            inflight.clear()
+    return inflight
+
+
+def wait_for_network_idle(wd, timeout=10, idle_time=0.5, max_inflight=2):
+    """
+    Waits until at most max_inflight requests have been pending for idle_time seconds.
+    A couple of requests are tolerated because analytics beacons and long-polling
+    connections never finish.
+
+    Uses the CDP Network events from the performance log. Falls back to watching the
+    Resource Timing buffer when performance logging is unavailable.
+
+    :return: True if the network went idle before the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    idle_since = None
+    last_resource_count = None
+
+    while True:
+        now = time.monotonic()
+        inflight = _update_inflight_requests(wd)
+        if inflight is not None:
+            busy = len(inflight) > max_inflight
+        else:
+            try:
+                resource_count = wd.execute_script(
+                    "return performance.getEntriesByType('resource').length"
+                )
+            except Exception:
+                resource_count = None
+            busy = resource_count is None or resource_count != last_resource_count
+            last_resource_count = resource_count
+
+        if busy:
+            idle_since = None
+        elif idle_since is None:
+            idle_since = now
+        elif now - idle_since >= idle_time:
+            return True
+
+        if now >= deadline:
+            return False
+        time.sleep(POLL_INTERVAL)
+
+
+def wait_for_dom_quiescence(wd, timeout=10, quiet_time=0.3, include_attributes=False):
+    """
+    Waits until the DOM has not been mutated for quiet_time seconds, using a
+    MutationObserver injected into the page.
+
+    Attribute changes are ignored by default so CSS animations and carousels do not
+    keep the page busy; pass include_attributes=True when waiting for e.g. image
+    sources to be swapped.
+
+    :return: True if the DOM settled before the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            since_dom, since_attributes = wd.execute_script(_DOM_QUIET_SCRIPT)
+            quiet_ms = (
+                min(since_dom, since_attributes) if include_attributes else since_dom
+            )
+            if quiet_ms >= quiet_time * 1000:
+                return True
+        except Exception:
+            pass  # the document may be swapped out mid-navigation
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(POLL_INTERVAL)
+
+
+def wait_for_page_ready(
+    wd, timeout=10, idle_time=0.5, quiet_time=0.3, previous_document=None
+):
+    """
+    Waits for the document to load, the network to go idle and the DOM to settle,
+    sharing one timeout across all three. Returns as soon as the page is ready
+    instead of sleeping for a fixed time. After a click or keypress, pass
+    previous_document=mark_document(wd) taken before the action.
+
+    :return: True if the page became ready before the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    return (
+        wait_for_document_ready(wd, timeout, previous_document)
+        and wait_for_network_idle(wd, max(deadline - time.monotonic(), 0), idle_time)
+        and wait_for_dom_quiescence(wd, max(deadline - time.monotonic(), 0), quiet_time)
+    )
@@ -4,6 +4,7 @@ import logging
 import pyaudio
 
 from voice_assistant.config import CHANNELS, FORMAT, RATE
+from voice_assistant.utils.metrics_server import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +16,10 @@ class AudioPlayer:
             format=FORMAT, channels=CHANNELS, rate=RATE, output=True, start=False
         )
         self.is_playing = False
+        metrics.set_gauge(
+            "audio_player_write_available_frames",
+            lambda: self.stream.get_write_available() if self.is_playing else None,
+        )
 
     async def play_audio_chunk(self, audio_chunk: bytes, visual_interface):
         if not self.is_playing:
@@ -14,6 +14,21 @@ PREFIX_PADDING_MS = 300
 SILENCE_THRESHOLD = 0.5
 SILENCE_DURATION_MS = 600
 RUN_TIME_TABLE_LOG_JSON = "runtime_time_table.jsonl"
+LATENCY_TRACE_LOG_JSON = "latency_trace.jsonl"
+LOOP_BLOCKING_LOG_JSON = "loop_blocking.jsonl"
+# Serve Prometheus/OpenMetrics metrics on http://127.0.0.1:<port>/metrics; 0 disables the endpoint
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+# Event loop stalls longer than this are attributed to a call site when LOOP_MONITOR_DEBUG captures stacks
+LOOP_BLOCK_THRESHOLD_MS = int(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100"))
+LOOP_MONITOR_DEBUG = os.getenv("LOOP_MONITOR_DEBUG", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+# Runtime logs rotate to <name>.1 ... <name>.<backups> beyond this size
+RUNTIME_LOG_MAX_BYTES = int(os.getenv("RUNTIME_LOG_MAX_BYTES", str(50 * 1024 * 1024)))
+RUNTIME_LOG_BACKUPS = int(os.getenv("RUNTIME_LOG_BACKUPS", "5"))
+EMAIL_BODY_MAX_CHARS = int(os.getenv("EMAIL_BODY_MAX_CHARS", "2000"))
 CHUNK = 1024
 FORMAT = pyaudio.paInt16
 CHANNELS = 1
@@ -49,3 +64,22 @@ if MISSING_VARS:
 SCRATCH_PAD_DIR = os.getenv("SCRATCH_PAD_DIR", "./scratchpad")
 os.makedirs(SCRATCH_PAD_DIR, exist_ok=True)
 os.makedirs(SCRATCH_PAD_DIR, exist_ok=True)
+
+# Files up to this size are regenerated in full by UpdateFile; larger ones get search/replace edits
+FILE_EDIT_FULL_REWRITE_MAX_CHARS = int(
+    os.getenv("FILE_EDIT_FULL_REWRITE_MAX_CHARS", "2000")
+)
+
+# Files larger than this only send the sections relevant to the prompt, up to FILE_EDIT_CONTEXT_CHARS
+FILE_EDIT_CHUNKED_MIN_CHARS = int(os.getenv("FILE_EDIT_CHUNKED_MIN_CHARS", "16000"))
+FILE_EDIT_CONTEXT_CHARS = int(os.getenv("FILE_EDIT_CONTEXT_CHARS", "12000"))
+
+# Pre-edit versions of scratchpad files kept for RestoreFile; oldest are dropped beyond this size
+SNAPSHOT_MAX_BYTES = int(os.getenv("SNAPSHOT_MAX_BYTES", str(100 * 1024 * 1024)))
+
+# Stream generated content into new files instead of waiting for the full structured response
+CREATE_FILE_STREAMING = os.getenv("CREATE_FILE_STREAMING", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
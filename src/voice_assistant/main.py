@@ -10,6 +10,10 @@ from rich.console import Console
 from websockets.exceptions import ConnectionClosedError
 
 from voice_assistant.config import (
+    LOOP_BLOCK_THRESHOLD_MS,
+    LOOP_BLOCKING_LOG_JSON,
+    LOOP_MONITOR_DEBUG,
+    METRICS_PORT,
     PREFIX_PADDING_MS,
     SESSION_INSTRUCTIONS,
     SILENCE_DURATION_MS,
@@ -20,6 +24,8 @@ from voice_assistant.tools import load_tools, prepare_tool_schemas
 from voice_assistant.tools.registry import AgenciesRegistry
 from voice_assistant.utils import base64_encode_audio
 from voice_assistant.utils.log_utils import log_ws_event
+from voice_assistant.utils.loop_monitor import get_loop_monitor
+from voice_assistant.utils.metrics_server import metrics, start_metrics_server
 from voice_assistant.utils.realtime_utils import RealtimeVoices
 from voice_assistant.visual_interface import VisualInterface, run_visual_interface
 from voice_assistant.websocket_handler import process_ws_messages
@@ -51,6 +57,7 @@ async def realtime_api(tool_schemas, tools):
             }
 
             mic = AsyncMicrophone()
+            metrics.set_gauge("microphone_queue_depth", mic.queue.qsize)
             visual_interface = VisualInterface()
 
             registry = AgenciesRegistry()
@@ -92,6 +99,7 @@ async def realtime_api(tool_schemas, tools):
                         if not mic.is_receiving:
                             audio_data = mic.get_audio_data()
                             if audio_data:
+                                metrics.inc("audio_uplink_bytes", len(audio_data))
                                 base64_audio = base64_encode_audio(audio_data)
                                 if base64_audio:
                                     audio_event = {
@@ -127,6 +135,7 @@ async def realtime_api(tool_schemas, tools):
         except ConnectionClosedError as e:
             if "keepalive ping timeout" in str(e):
                 logging.warning("WebSocket connection lost due to keepalive ping timeout. Reconnecting...")
+                metrics.inc("reconnects")
                 await asyncio.sleep(1)  # Wait before reconnecting
                 continue  # Retry the connection
             logging.exception("WebSocket connection closed unexpectedly.")
@@ -147,7 +156,20 @@ async def main_async():
     # Load tools at startup
     tools = load_tools()
     tool_schemas = prepare_tool_schemas(tools)
-    await realtime_api(tool_schemas, tools)
+    loop_monitor = get_loop_monitor(LOOP_BLOCK_THRESHOLD_MS / 1000)
+    loop_monitor.start(capture_stacks=LOOP_MONITOR_DEBUG)
+    metrics_server = (
+        await start_metrics_server(METRICS_PORT, loop_monitor=loop_monitor)
+        if METRICS_PORT
+        else None
+    )
+    try:
+        await realtime_api(tool_schemas, tools)
+    finally:
+        if metrics_server:
+            metrics_server.close()
+        loop_monitor.stop()
+        loop_monitor.write_report(LOOP_BLOCKING_LOG_JSON)
 
 
 def main():
@@ -1,5 +1,6 @@
 # src/voice_assistant/models.py
 from enum import Enum
+from typing import List
 
 from pydantic import BaseModel
 
@@ -31,6 +32,17 @@ class FileUpdateResponse(BaseModel):
     updates: str
 
 
+class FileEdit(BaseModel):
+    """One search/replace edit; an empty search appends the replacement to the file"""
+
+    search: str
+    replace: str
+
+
+class FileEditResponse(BaseModel):
+    edits: List[FileEdit]
+
+
 class FileDeleteResponse(BaseModel):
     file: str
     force_delete: bool
@@ -0,0 +1,330 @@
+# src/voice_assistant/runtime_report.py
+"""
+Summarize runtime_time_table.jsonl: per-function count, mean, p50/p95/p99 and max,
+optionally per time window, as a table or JSON.
+
+The file is streamed line by line and durations go into log-scaled histograms,
+so memory stays constant however large the log is; percentiles are accurate to
+within HISTOGRAM_RELATIVE_ERROR.
+
+Usage:
+    voice-assistant-metrics runtime_time_table.jsonl*
+    voice-assistant-metrics --window 1h --function UpdateFile
+    voice-assistant-metrics --json > baseline.json
+    voice-assistant-metrics --baseline baseline.json --threshold 0.1
+"""
+
+import argparse
+import gzip
+import json
+import math
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+# Kept in sync with RUN_TIME_TABLE_LOG_JSON; config is not imported because it opens audio devices
+DEFAULT_LOG_PATH = "runtime_time_table.jsonl"
+
+HISTOGRAM_RELATIVE_ERROR = 0.01
+PERCENTILES = (50, 95, 99)
+_LOG_BASE = math.log1p(2 * HISTOGRAM_RELATIVE_ERROR)
+# Durations at or below this are counted in one bucket as zero
+_MIN_DURATION = 1e-6
+
+_WINDOW_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class DurationHistogram:
+    """Count, sum, max and a log-bucketed histogram of durations in seconds."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        bucket = (
+            -(1 << 30)
+            if duration <= _MIN_DURATION
+            else math.floor(math.log(duration) / _LOG_BASE)
+        )
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def merge(self, other: "DurationHistogram") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile, reported as the geometric middle of its bucket."""
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                if bucket == -(1 << 30):
+                    return 0.0
+                return min(self.max, math.exp((bucket + 0.5) * _LOG_BASE))
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        summary = {
+            "count": self.count,
+            "mean": round(self.total / self.count, 4) if self.count else 0.0,
+        }
+        summary.update({f"p{q}": round(self.percentile(q), 4) for q in PERCENTILES})
+        summary["max"] = round(self.max, 4)
+        return summary
+
+
+def parse_window(value: str) -> int:
+    """Parse a window like '30s', '15m', '1h' or '1d' into seconds."""
+    try:
+        return int(float(value[:-1]) * _WINDOW_UNITS[value[-1]])
+    except (KeyError, ValueError, IndexError):
+        raise argparse.ArgumentTypeError(
+            f"Invalid window {value!r}, use e.g. 30s, 15m, 1h or 1d"
+        )
+
+
+def to_local_naive(timestamp: datetime) -> datetime:
+    """Convert an offset-aware timestamp to naive local time, like those log_runtime writes."""
+    return (
+        timestamp.astimezone().replace(tzinfo=None) if timestamp.tzinfo else timestamp
+    )
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO timestamp for --since/--until, with or without a UTC offset."""
+    return to_local_naive(datetime.fromisoformat(value))
+
+
+def _open(path: str) -> TextIO:
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt")
+    return open(path, "r")
+
+
+def read_records(
+    paths: Iterable[str], stats: Dict[str, int]
+) -> Iterator[Tuple[datetime, str, float]]:
+    """Yield (timestamp, function, duration) from each file, counting unreadable lines in stats."""
+    for path in paths:
+        with _open(path) as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                    # Durations have been written as strings like "0.1234"
+                    timestamp = parse_timestamp(record["timestamp"])
+                    yield timestamp, record["function"], float(record["duration"])
+                except (ValueError, KeyError, TypeError):
+                    stats["skipped"] += 1
+
+
+def aggregate(
+    records: Iterable[Tuple[datetime, str, float]],
+    window: Optional[int] = None,
+    functions: Optional[List[str]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> Dict[Tuple[Optional[str], str], DurationHistogram]:
+    """
+    Group durations into histograms keyed by (window start or None, function).
+
+    Returns:
+        Dict[Tuple[Optional[str], str], DurationHistogram]: Histograms per window and function
+    """
+    histograms: Dict[Tuple[Optional[str], str], DurationHistogram] = {}
+    for timestamp, function, duration in records:
+        if since and timestamp < since or until and timestamp >= until:
+            continue
+        if functions and not any(
+            name.lower() in function.lower() for name in functions
+        ):
+            continue
+        window_start = None
+        if window:
+            epoch = timestamp.timestamp()
+            window_start = datetime.fromtimestamp(epoch - epoch % window).isoformat(
+                timespec="seconds"
+            )
+        histograms.setdefault((window_start, function), DurationHistogram()).add(
+            duration
+        )
+    return histograms
+
+
+def build_report(
+    histograms: Dict[Tuple[Optional[str], str], DurationHistogram],
+) -> dict:
+    """JSON-serializable report; with windows the overall figures are listed under 'total'."""
+    totals: Dict[str, DurationHistogram] = {}
+    windows: Dict[str, Dict[str, dict]] = {}
+    for (window_start, function), histogram in sorted(
+        histograms.items(), key=lambda item: (item[0][0] or "", item[0][1])
+    ):
+        totals.setdefault(function, DurationHistogram()).merge(histogram)
+        if window_start is not None:
+            windows.setdefault(window_start, {})[function] = histogram.summary()
+    report = {
+        "total": {function: totals[function].summary() for function in sorted(totals)}
+    }
+    if windows:
+        report["windows"] = windows
+    return report
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> List[dict]:
+    """Functions whose p50/p95/p99 grew by more than `threshold` (a fraction) over the baseline."""
+    regressions = []
+    for function, current in report["total"].items():
+        previous = baseline.get("total", {}).get(function)
+        if not previous:
+            continue
+        for key in (f"p{q}" for q in PERCENTILES):
+            before, after = previous.get(key), current.get(key)
+            if before and after is not None and (after - before) / before > threshold:
+                regressions.append(
+                    {
+                        "function": function,
+                        "metric": key,
+                        "baseline": before,
+                        "current": after,
+                        "change": round((after - before) / before, 4),
+                    }
+                )
+    return regressions
+
+
+def print_table(
+    console: Console,
+    title: str,
+    summaries: Dict[str, dict],
+    baseline: Optional[dict] = None,
+) -> None:
+    table = Table(title=title)
+    table.add_column("function")
+    for column in ("count", "mean", *(f"p{q}" for q in PERCENTILES), "max"):
+        table.add_column(column, justify="right")
+    if baseline is not None:
+        table.add_column("p95 vs baseline", justify="right")
+
+    for function, summary in sorted(
+        summaries.items(), key=lambda item: -item[1]["count"] * item[1]["mean"]
+    ):
+        row = [function, str(summary["count"])] + [
+            f"{summary[key]:.4f}"
+            for key in ("mean", *(f"p{q}" for q in PERCENTILES), "max")
+        ]
+        if baseline is not None:
+            before = baseline.get("total", {}).get(function, {}).get("p95")
+            row.append(
+                f"{(summary['p95'] - before) / before:+.1%}" if before else "new"
+            )
+        table.add_row(*row)
+    console.print(table)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="voice-assistant-metrics",
+        description="Summarize the voice assistant runtime log.",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[DEFAULT_LOG_PATH],
+        help="Log files, rotated (.1, .2) and .gz files included; '-' for stdin",
+    )
+    parser.add_argument(
+        "--window",
+        type=parse_window,
+        help="Also summarize per time window, e.g. 15m, 1h, 1d",
+    )
+    parser.add_argument(
+        "--function",
+        action="append",
+        dest="functions",
+        help="Only functions containing this text; repeatable",
+    )
+    parser.add_argument(
+        "--since",
+        type=parse_timestamp,
+        help="Only records at or after this ISO timestamp",
+    )
+    parser.add_argument(
+        "--until", type=parse_timestamp, help="Only records before this ISO timestamp"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report as JSON, e.g. to save as a baseline",
+    )
+    parser.add_argument(
+        "--baseline", help="JSON report from an earlier version to compare against"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative p50/p95/p99 increase counted as a regression (default 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    stats = {"skipped": 0}
+    try:
+        histograms = aggregate(
+            read_records(args.paths, stats),
+            args.window,
+            args.functions,
+            args.since,
+            args.until,
+        )
+    except OSError as e:
+        parser.error(str(e))
+    report = build_report(histograms)
+    report["skipped_lines"] = stats["skipped"]
+
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, "r") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            parser.error(f"Could not read baseline {args.baseline}: {e}")
+        report["regressions"] = compare(report, baseline, args.threshold)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        console = Console()
+        for window_start, summaries in report.get("windows", {}).items():
+            print_table(console, f"Window starting {window_start}", summaries)
+        print_table(console, "All records", report["total"], baseline)
+        if stats["skipped"]:
+            console.print(
+                f"[yellow]Skipped {stats['skipped']} unreadable lines[/yellow]"
+            )
+        for regression in report.get("regressions", []):
+            console.print(
+                f"[bold red]Regression: {regression['function']} {regression['metric']} "
+                f"{regression['baseline']:.4f}s -> {regression['current']:.4f}s ({regression['change']:+.1%})[/bold red]"
+            )
+
+    # A non-zero exit lets CI fail on regressions
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import pytest
+
+from voice_assistant.models import FileEdit
+from voice_assistant.utils.chunking_utils import (
+    OMISSION_MARKER,
+    build_excerpt,
+    edge_sections,
+    select_sections,
+    splice_excerpt,
+    split_sections,
+)
+from voice_assistant.utils.file_edit_utils import EditApplicationError, apply_edits
+
+TOPICS = ["Budget", "Hiring", "Roadmap", "Travel", "Follow-ups"]
+
+
+def make_document() -> str:
+    return "".join(
+        f"## {topic}\n\n"
+        + f"Notes about {topic.lower()} for this quarter. " * 8
+        + "\n\n"
+        for topic in TOPICS
+    )
+
+
+def make_excerpt(content: str, prompt: str):
+    sections = split_sections(content, "plan.md")
+    selected = select_sections(content, sections, prompt, max_chars=2000)
+    return selected, build_excerpt(content, selected)
+
+
+def test_sections_follow_markdown_headings():
+    content = make_document()
+    sections = split_sections(content, "plan.md")
+    assert [section.title for section in sections] == [
+        f"## {topic}" for topic in TOPICS
+    ]
+    assert (
+        "".join(content[section.start : section.end] for section in sections) == content
+    )
+
+
+def test_excerpt_holds_matching_and_last_sections():
+    content = make_document()
+    selected, excerpt = make_excerpt(content, "move the hiring notes")
+    assert [section.title for section in selected] == ["## Hiring", "## Follow-ups"]
+    assert excerpt.count(OMISSION_MARKER) == 1
+    assert "## Budget" not in excerpt
+
+
+def test_edited_excerpt_splices_back_into_the_file():
+    content = make_document()
+    selected, excerpt = make_excerpt(content, "move the hiring notes")
+    edited_excerpt = apply_edits(
+        excerpt,
+        [
+            FileEdit(search="## Hiring\n", replace="## Hiring (on hold)\n"),
+            FileEdit(search="", replace="- Ask about the hiring freeze\n"),
+        ],
+    )
+
+    edited = splice_excerpt(content, selected, edited_excerpt)
+
+    assert (
+        edited
+        == content.replace("## Hiring\n", "## Hiring (on hold)\n")
+        + "- Ask about the hiring freeze\n"
+    )
+
+
+def test_edit_removing_an_omission_marker_is_rejected():
+    content = make_document()
+    selected, excerpt = make_excerpt(content, "move the hiring notes")
+    edited_excerpt = excerpt.replace(OMISSION_MARKER, "\n\n")
+
+    with pytest.raises(EditApplicationError, match="omission markers"):
+        splice_excerpt(content, selected, edited_excerpt)
+
+
+def test_unrelated_prompt_selects_nothing():
+    content = make_document()
+    sections = split_sections(content, "plan.md")
+    assert (
+        select_sections(content, sections, "rename the weather log", max_chars=2000)
+        is None
+    )
+
+
+def test_edge_sections_hold_the_head_and_the_end():
+    content = make_document()
+    sections = split_sections(content, "plan.md")
+    excerpt = build_excerpt(content, edge_sections(sections))
+    assert [section.title for section in edge_sections(sections)] == [
+        "## Budget",
+        "## Follow-ups",
+    ]
+    assert excerpt.count(OMISSION_MARKER) == 1
+    assert "## Hiring" not in excerpt
@@ -0,0 +1,78 @@
+import base64
+
+from voice_assistant.utils.email_utils import (
+    extract_body_text,
+    html_to_text,
+    normalize_whitespace,
+    strip_quoted_text,
+    truncate_text,
+)
+
+
+def encode(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def make_payload(mime_type: str, body: str) -> dict:
+    return {
+        "mimeType": "multipart/alternative",
+        "parts": [{"mimeType": mime_type, "body": {"data": encode(body)}}],
+    }
+
+
+def test_html_to_text_drops_scripts_styles_and_quotes():
+    html = (
+        "<html><head><style>p { color: red; }</style></head><body>"
+        "<p>Hello&nbsp;Ann &amp; Bob</p><script>track()</script>"
+        '<div class="gmail_quote"><div>On Monday Bob wrote:</div><p>old text</p></div>'
+        "<ul><li>one</li><li>two</li></ul></body></html>"
+    )
+    text = normalize_whitespace(html_to_text(html))
+    assert text == "Hello Ann & Bob\n\none\n\ntwo"
+
+
+def test_strip_quoted_text_removes_reply_chain_and_signature():
+    text = "Sounds good.\n> earlier line\n--\nAnn\nSent from my iPhone"
+    assert strip_quoted_text(text).strip() == "Sounds good."
+
+    reply = "Sounds good.\n\nOn Mon, 1 Jan 2024, Bob <bob@example.com> wrote:\n> Can we meet?"
+    assert strip_quoted_text(reply).strip() == "Sounds good."
+
+
+def test_strip_quoted_text_keeps_a_message_that_starts_with_a_header():
+    text = "On Monday the team wrote:\nthe report is done"
+    assert strip_quoted_text(text) == text
+
+
+def test_truncate_text_cuts_at_a_word_boundary():
+    assert truncate_text("short text", 100) == "short text"
+    assert truncate_text("alpha beta gamma delta", 12) == "alpha beta [truncated]"
+    assert truncate_text("x" * 30, 10) == "x" * 10 + " [truncated]"
+    assert truncate_text("any text", 0) == "any text"
+
+
+def test_extract_body_text_prefers_plain_text_and_removes_links():
+    payload = {
+        "mimeType": "multipart/alternative",
+        "parts": [
+            {"mimeType": "text/html", "body": {"data": encode("<p>html version</p>")}},
+            {
+                "mimeType": "text/plain",
+                "body": {
+                    "data": encode("Plain version, see https://example.com/x now")
+                },
+            },
+        ],
+    }
+    assert extract_body_text(payload) == "Plain version, see now"
+
+
+def test_extract_body_text_falls_back_to_html():
+    assert (
+        extract_body_text(make_payload("text/html", "<p>Only   <b>html</b></p>"))
+        == "Only html"
+    )
+    assert (
+        extract_body_text(make_payload("text/html", "<style>x</style>"))
+        == "No body content"
+    )
@@ -0,0 +1,133 @@
+import asyncio
+import base64
+from datetime import UTC, datetime
+
+from voice_assistant.utils.fake_google_services import (
+    FakeGoogleServices,
+    FakeGoogleServicesConfig,
+    FakeHttpError,
+    install_fake_google_services,
+)
+
+
+def make_fake(**config) -> FakeGoogleServices:
+    return FakeGoogleServices(FakeGoogleServicesConfig(latency_ms=0, **config))
+
+
+def test_unread_query_and_metadata_get():
+    fake = make_fake(mailbox_size=50, unread_ratio=1.0)
+    gmail = fake.build("gmail")
+
+    listed = (
+        gmail.users()
+        .messages()
+        .list(userId="me", q="is:unread", maxResults=10)
+        .execute()
+    )
+    assert len(listed["messages"]) == 10
+    assert listed["nextPageToken"] == "10"
+
+    message_id = listed["messages"][0]["id"]
+    message = (
+        gmail.users()
+        .messages()
+        .get(userId="me", id=message_id, format="metadata", metadataHeaders=["Subject"])
+        .execute()
+    )
+    assert [h["name"] for h in message["payload"]["headers"]] == ["Subject"]
+    assert "parts" not in message["payload"]
+
+
+def test_batch_is_a_single_round_trip():
+    fake = make_fake(mailbox_size=20)
+    gmail = fake.build("gmail")
+    responses = {}
+
+    batch = gmail.new_batch_http_request(
+        callback=lambda request_id, response, exception: responses.setdefault(
+            request_id, exception or response
+        )
+    )
+    for message_id in list(fake.messages)[:5] + ["missing"]:
+        batch.add(
+            gmail.users().messages().get(userId="me", id=message_id),
+            request_id=message_id,
+        )
+    batch.execute()
+
+    assert fake.stats == {"batch": 1}
+    assert isinstance(responses.pop("missing"), FakeHttpError)
+    assert all(r["payload"]["parts"] for r in responses.values())
+
+
+def test_draft_creation_is_recorded_in_history():
+    fake = make_fake(mailbox_size=5)
+    gmail = fake.build("gmail")
+    start_history_id = gmail.users().getProfile(userId="me").execute()["historyId"]
+
+    raw = base64.urlsafe_b64encode(b"Subject: Hi\r\n\r\nHello").decode()
+    draft = (
+        gmail.users()
+        .drafts()
+        .create(userId="me", body={"message": {"raw": raw}})
+        .execute()
+    )
+
+    history = (
+        gmail.users()
+        .history()
+        .list(userId="me", startHistoryId=start_history_id)
+        .execute()
+    )
+    assert (
+        history["history"][0]["messagesAdded"][0]["message"]["id"]
+        == draft["message"]["id"]
+    )
+
+
+def test_calendar_events_for_today_are_sorted():
+    fake = make_fake(events_per_day=4)
+    today = datetime.now(UTC).strftime("%Y-%m-%d")
+    events = (
+        fake.build("calendar")
+        .events()
+        .list(
+            calendarId="primary",
+            timeMin=f"{today}T00:00:00Z",
+            timeMax=f"{today}T23:59:59Z",
+            singleEvents=True,
+            orderBy="startTime",
+        )
+        .execute()["items"]
+    )
+
+    assert len(events) == 4
+    assert events == sorted(events, key=lambda e: e["start"]["dateTime"])
+
+
+def test_gmail_tools_round_trips():
+    from voice_assistant.tools.DraftGmail import DraftGmail
+    from voice_assistant.tools.GetGmailSummary import GetGmailSummary
+    from voice_assistant.utils.google_services_utils import GoogleServicesUtils
+
+    fake = install_fake_google_services(latency_ms=0, mailbox_size=30, unread_ratio=1.0)
+    try:
+        summary_tool = GetGmailSummary(max_results=10)
+        summary_tool._service = fake.build("gmail")
+        messages = asyncio.run(summary_tool._fetch_unread_messages())
+        emails = [summary_tool._extract_email_data(m) for m in messages]
+
+        assert len(emails) == 10
+        assert all(
+            "<p>" not in e["body"] and "earlier thread" not in e["body"] for e in emails
+        )
+        assert fake.stats == {"messages.list": 1, "batch": 1}
+
+        result = asyncio.run(
+            DraftGmail(content="Thanks!", reply_to_id=emails[0]["id"]).run()
+        )
+
+        assert result["message"] == "Email draft created successfully"
+        assert fake.stats == {"messages.list": 1, "batch": 1, "drafts.create": 1}
+    finally:
+        GoogleServicesUtils.set_service_factory(None)
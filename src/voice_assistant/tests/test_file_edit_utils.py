@@ -0,0 +1,62 @@
+import pytest
+
+from voice_assistant.models import FileEdit
+from voice_assistant.utils.file_edit_utils import EditApplicationError, apply_edits
+
+CONTENT = "# Plan\n\n- buy milk\n- call Bob\n\n## Notes\n\n- buy milk\n"
+
+
+def edit(search: str, replace: str) -> FileEdit:
+    return FileEdit(search=search, replace=replace)
+
+
+def test_unique_search_is_replaced():
+    edited = apply_edits(CONTENT, [edit("- call Bob\n", "- call Alice\n")])
+    assert edited == CONTENT.replace("call Bob", "call Alice")
+
+
+def test_ambiguous_search_is_rejected():
+    with pytest.raises(EditApplicationError, match="occurs 2 times"):
+        apply_edits(CONTENT, [edit("- buy milk", "- buy bread")])
+
+
+def test_context_disambiguates_a_repeated_line():
+    edited = apply_edits(
+        CONTENT, [edit("## Notes\n\n- buy milk", "## Notes\n\n- buy bread")]
+    )
+    assert edited == "# Plan\n\n- buy milk\n- call Bob\n\n## Notes\n\n- buy bread\n"
+
+
+def test_search_tolerates_indentation_and_trailing_spaces():
+    content = "def greet():\n    name = 'Bob'\n    return name\n"
+    edited = apply_edits(
+        content,
+        [edit("name = 'Bob'  \nreturn name", "    name = 'Alice'\n    return name")],
+    )
+    assert edited == "def greet():\n    name = 'Alice'\n    return name\n"
+
+
+def test_missing_search_is_rejected():
+    with pytest.raises(EditApplicationError, match="not found"):
+        apply_edits(CONTENT, [edit("- walk the dog", "- feed the cat")])
+
+
+def test_empty_search_appends_on_a_new_line():
+    assert (
+        apply_edits("first line", [edit("", "second line\n")])
+        == "first line\nsecond line\n"
+    )
+    assert (
+        apply_edits("first line\n", [edit("", "second line\n")])
+        == "first line\nsecond line\n"
+    )
+    assert apply_edits("", [edit("", "only line\n")]) == "only line\n"
+
+
+def test_edits_apply_in_order_to_the_edited_content():
+    edited = apply_edits(
+        CONTENT,
+        [edit("- call Bob", "- call Alice"), edit("- call Alice", "- email Alice")],
+    )
+    assert "- email Alice\n" in edited
+    assert "Bob" not in edited
@@ -0,0 +1,27 @@
+from PIL import Image, ImageDraw
+
+from voice_assistant.utils.image_utils import screen_digest
+
+
+def make_window(lines) -> Image.Image:
+    image = Image.new("RGB", (1600, 1000), "white")
+    draw = ImageDraw.Draw(image)
+    for index, line in enumerate(lines):
+        draw.text((40, 40 + index * 24), line, fill="black")
+    return image
+
+
+def test_same_screen_has_same_digest():
+    lines = ["Alice: are we still on for lunch?", "Bob: yes, 12:30"]
+    assert screen_digest(make_window(lines)) == screen_digest(make_window(lines))
+
+
+def test_small_text_change_changes_digest():
+    before = make_window(["Alice: are we still on for lunch?", "Bob: yes, 12:30"])
+    new_message = make_window(
+        ["Alice: are we still on for lunch?", "Bob: yes, 12:30", "Alice: ok"]
+    )
+    edited_value = make_window(["Alice: are we still on for lunch?", "Bob: yes, 12:45"])
+
+    assert screen_digest(new_message) != screen_digest(before)
+    assert screen_digest(edited_value) != screen_digest(before)
@@ -0,0 +1,85 @@
+import pytest
+
+from voice_assistant.utils import latency_tracer
+from voice_assistant.utils.latency_tracer import LatencyTracer, percentile
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.records = []
+
+    def write(self, record: dict) -> None:
+        self.records.append(record)
+
+
+@pytest.fixture
+def writer(monkeypatch) -> RecordingWriter:
+    recording = RecordingWriter()
+    monkeypatch.setattr(latency_tracer, "get_jsonl_writer", lambda path: recording)
+    return recording
+
+
+def play_response(tracer: LatencyTracer, response_id: str) -> None:
+    tracer.response_created(response_id)
+    tracer.audio_delta(response_id)
+    tracer.audio_delta(response_id)
+
+
+def test_turn_is_written_when_its_response_is_done(writer):
+    tracer = LatencyTracer("latency.jsonl")
+    tracer.speech_started()
+    tracer.mark("speech_stopped")
+    play_response(tracer, "resp_1")
+    tracer.response_done("resp_1")
+
+    [record] = writer.records
+    assert record["interrupted"] is False
+    assert set(record["metrics"]) >= {"time_to_first_audio", "turn_total"}
+    assert tracer.current is None
+
+
+def test_cancelled_response_does_not_close_the_interrupting_turn(writer):
+    tracer = LatencyTracer("latency.jsonl")
+    tracer.speech_started()
+    tracer.mark("speech_stopped")
+    play_response(tracer, "resp_1")
+
+    # The user talks over the answer; the cancelled response still streams and completes
+    tracer.speech_started()
+    tracer.audio_delta("resp_1")
+    tracer.response_done("resp_1")
+
+    assert [record["interrupted"] for record in writer.records] == [True]
+    assert "first_audio_delta" not in tracer.current.events
+
+    tracer.mark("speech_stopped")
+    play_response(tracer, "resp_2")
+    tracer.response_done("resp_2")
+
+    assert [record["interrupted"] for record in writer.records] == [True, False]
+    assert writer.records[1]["responses"] == 1
+    assert "time_to_first_audio" in writer.records[1]["metrics"]
+
+
+def test_tool_call_keeps_the_turn_open_for_the_follow_up_response(writer):
+    tracer = LatencyTracer("latency.jsonl")
+    tracer.speech_started()
+    tracer.mark("speech_stopped")
+    tracer.response_created("resp_1")
+    tracer.tool_finished(tracer.tool_started("GetScreenDescription"))
+    tracer.response_done("resp_1")
+    assert writer.records == []
+
+    play_response(tracer, "resp_2")
+    tracer.response_done("resp_2")
+
+    [record] = writer.records
+    assert record["responses"] == 2
+    assert [call["name"] for call in record["tool_calls"]] == ["GetScreenDescription"]
+
+
+def test_percentile_uses_nearest_rank():
+    values = [0.1 * i for i in range(1, 11)]
+    assert percentile(values, 50) == pytest.approx(0.5)
+    assert percentile(values, 95) == pytest.approx(1.0)
+    assert percentile([], 50) is None
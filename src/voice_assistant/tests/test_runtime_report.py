@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import pytest
+
+from voice_assistant.runtime_report import (
+    HISTOGRAM_RELATIVE_ERROR,
+    DurationHistogram,
+    aggregate,
+    build_report,
+    compare,
+    main,
+    parse_timestamp,
+)
+
+
+def make_report(durations: dict) -> dict:
+    records = [
+        (datetime(2024, 1, 1, 12), function, duration)
+        for function, values in durations.items()
+        for duration in values
+    ]
+    return build_report(aggregate(records))
+
+
+def test_percentiles_are_within_the_histogram_error():
+    histogram = DurationHistogram()
+    durations = [0.001 * i for i in range(1, 1001)]
+    for duration in durations:
+        histogram.add(duration)
+
+    for q, exact in ((50, 0.5), (95, 0.95), (99, 0.99)):
+        assert histogram.percentile(q) == pytest.approx(
+            exact, rel=HISTOGRAM_RELATIVE_ERROR
+        )
+    assert histogram.percentile(100) == pytest.approx(1.0, rel=HISTOGRAM_RELATIVE_ERROR)
+    assert histogram.summary()["count"] == 1000
+
+
+def test_compare_reports_only_increases_over_the_threshold():
+    baseline = make_report({"update_file": [1.0] * 10, "read_url": [2.0] * 10})
+    report = make_report(
+        {"update_file": [1.5] * 10, "read_url": [2.1] * 10, "new_tool": [9.0]}
+    )
+
+    regressions = compare(report, baseline, threshold=0.1)
+
+    assert {r["function"] for r in regressions} == {"update_file"}
+    assert [r["metric"] for r in regressions] == ["p50", "p95", "p99"]
+    assert regressions[0]["change"] == pytest.approx(0.5, abs=0.05)
+
+
+def test_offset_aware_since_is_compared_in_local_time():
+    since = parse_timestamp("2024-01-01T00:00:00+00:00")
+    assert since.tzinfo is None
+    records = [(parse_timestamp("2024-01-02T00:00:00+00:00"), "update_file", 1.0)]
+    assert list(aggregate(records, since=since)) == [(None, "update_file")]
+
+
+def test_missing_baseline_is_a_usage_error(tmp_path):
+    log = tmp_path / "runtime.jsonl"
+    log.write_text("")
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(log), "--baseline", str(tmp_path / "missing.json")])
+    assert exit_info.value.code == 2
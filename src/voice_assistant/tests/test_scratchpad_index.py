@@ -0,0 +1,45 @@
+from voice_assistant.utils.scratchpad_index import ScratchpadIndex
+
+
+def make_index(tmp_path, *names: str) -> ScratchpadIndex:
+    for name in names:
+        (tmp_path / name).write_text(f"# {name}\n")
+    return ScratchpadIndex(str(tmp_path), poll_interval=0)
+
+
+def test_full_name_with_extension_resolves(tmp_path):
+    index = make_index(tmp_path, "notes.md", "todo.txt")
+    assert index.resolve("add milk to todo.txt") == "todo.txt"
+    assert index.resolve("Summarize notes.md.") == "notes.md"
+
+
+def test_single_word_names_do_not_resolve(tmp_path):
+    index = make_index(tmp_path, "summary.md", "ideas.md", "report.md")
+    assert index.resolve("add a summary section to the report") is None
+    assert index.resolve("add a section about ideas for the report") is None
+
+
+def test_words_matching_several_files_do_not_resolve(tmp_path):
+    index = make_index(tmp_path, "notes.md", "meeting_notes.md")
+    assert index.resolve("delete notes file and meeting notes") is None
+    assert index.resolve("update notes.md with the meeting notes") is None
+    assert index.resolve("update meeting_notes.md") == "meeting_notes.md"
+
+
+def test_name_inside_a_longer_name_is_not_a_mention(tmp_path):
+    index = make_index(tmp_path, "notes.md", "notes.md.bak")
+    assert index.resolve("restore notes.md.bak") == "notes.md.bak"
+    assert index.resolve("open notes.md please") == "notes.md"
+
+
+def test_several_full_names_do_not_resolve(tmp_path):
+    index = make_index(tmp_path, "a.md", "b.md")
+    assert index.resolve("merge a.md into b.md") is None
+
+
+def test_index_sees_new_and_removed_files(tmp_path):
+    index = make_index(tmp_path, "old.md")
+    assert index.names() == ["old.md"]
+    (tmp_path / "old.md").unlink()
+    (tmp_path / "new.md").write_text("new")
+    assert index.names() == ["new.md"]
@@ -0,0 +1,110 @@
+import os
+
+from voice_assistant.utils.file_edit_utils import write_file_atomic
+from voice_assistant.utils.snapshot_utils import SnapshotStore
+
+
+def make_store(tmp_path, max_bytes: int = 1 << 20) -> SnapshotStore:
+    return SnapshotStore(str(tmp_path), max_bytes)
+
+
+def update(store: SnapshotStore, tmp_path, name: str, content: str) -> None:
+    """Change a file the way UpdateFile does: snapshot, then replace atomically."""
+    store.snapshot(name, "update")
+    write_file_atomic(str(tmp_path / name), content)
+
+
+def test_restore_undoes_the_last_update(tmp_path):
+    store = make_store(tmp_path)
+    (tmp_path / "notes.md").write_text("v1")
+    update(store, tmp_path, "notes.md", "v2")
+    update(store, tmp_path, "notes.md", "v3")
+
+    assert store.restore().action == "update"
+    assert (tmp_path / "notes.md").read_text() == "v2"
+    store.restore()
+    assert (tmp_path / "notes.md").read_text() == "v1"
+    assert store.restore() is None
+
+
+def test_restore_can_be_undone(tmp_path):
+    store = make_store(tmp_path)
+    (tmp_path / "notes.md").write_text("v1")
+    update(store, tmp_path, "notes.md", "v2")
+    store.restore()
+
+    redo = store.latest_undoable("notes.md", redo=True)
+    assert redo.action == "restore"
+    store.restore(redo)
+    assert (tmp_path / "notes.md").read_text() == "v2"
+
+    # The update is in effect again, so a plain undo reverts it once more
+    store.restore()
+    assert (tmp_path / "notes.md").read_text() == "v1"
+
+
+def test_repeated_undo_and_redo_walk_through_versions(tmp_path):
+    store = make_store(tmp_path)
+    (tmp_path / "notes.md").write_text("v1")
+    update(store, tmp_path, "notes.md", "v2")
+    update(store, tmp_path, "notes.md", "v3")
+    store.restore()
+    store.restore()
+
+    versions = []
+    for _ in range(2):
+        store.restore(store.latest_undoable(redo=True))
+        versions.append((tmp_path / "notes.md").read_text())
+    assert versions == ["v2", "v3"]
+    assert store.latest_undoable(redo=True) is None
+
+
+def test_deleted_file_is_restored_and_redo_deletes_it_again(tmp_path):
+    store = make_store(tmp_path)
+    (tmp_path / "notes.md").write_text("keep me")
+    store.snapshot("notes.md", "delete")
+    os.remove(tmp_path / "notes.md")
+
+    store.restore()
+    assert (tmp_path / "notes.md").read_text() == "keep me"
+
+    store.restore(store.latest_undoable("notes.md", redo=True))
+    assert not (tmp_path / "notes.md").exists()
+
+
+def test_history_survives_reopening_the_store(tmp_path):
+    store = make_store(tmp_path)
+    (tmp_path / "notes.md").write_text("v1")
+    update(store, tmp_path, "notes.md", "v2")
+
+    reopened = make_store(tmp_path)
+    assert [record.action for record in reopened.history("notes.md")] == ["update"]
+    reopened.restore()
+    assert (tmp_path / "notes.md").read_text() == "v1"
+
+
+def test_garbage_collection_keeps_the_newest_versions(tmp_path):
+    store = make_store(tmp_path, max_bytes=250)
+    (tmp_path / "log.txt").write_text("0" * 100)
+    for version in range(1, 5):
+        update(store, tmp_path, "log.txt", str(version) * 100)
+
+    assert store.total_bytes() <= 250
+    assert len(store.history()) == 2
+    assert len(os.listdir(store.blob_dir)) == 2
+
+    store.restore()
+    assert (tmp_path / "log.txt").read_text() == "3" * 100
+
+
+def test_in_place_edit_does_not_change_stored_versions(tmp_path):
+    store = make_store(tmp_path)
+    (tmp_path / "notes.md").write_text("v1")
+    store.snapshot("notes.md", "update")
+
+    # Editors that save in place keep the inode, so the blob must not share it
+    with open(tmp_path / "notes.md", "r+") as f:
+        f.write("v2")
+
+    store.restore()
+    assert (tmp_path / "notes.md").read_text() == "v1"
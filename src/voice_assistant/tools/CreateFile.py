@@ -1,14 +1,22 @@
 import os
+import tempfile
+import time
+from typing import Callable, Optional
 
 from agency_swarm.tools import BaseTool
 from dotenv import load_dotenv
 from pydantic import Field
 from rich.console import Console
 
-from voice_assistant.config import SCRATCH_PAD_DIR
-from voice_assistant.models import CreateFileResponse
+from voice_assistant.config import CREATE_FILE_STREAMING, SCRATCH_PAD_DIR
+from voice_assistant.models import CreateFileResponse, ModelName
 from voice_assistant.utils.decorators import timeit_decorator
-from voice_assistant.utils.llm_utils import get_structured_output_completion
+from voice_assistant.utils.file_edit_utils import write_file_atomic
+from voice_assistant.utils.llm_utils import (
+    get_structured_output_completion,
+    stream_model_completion,
+)
+from voice_assistant.utils.scratchpad_index import get_scratchpad_index
 
 load_dotenv()
 
@@ -24,14 +32,31 @@ class CreateFile(BaseTool):
         return str(result)
 
 
+# Minimum seconds between progress reports while a file is streamed
+PROGRESS_INTERVAL = 1.0
+
+ProgressCallback = Callable[[str, int, str], None]
+
+
+def report_progress(file_name: str, chars_written: int, latest: str) -> None:
+    """Default progress callback: print how much of the file has been generated."""
+    preview = latest.strip().splitlines()[-1][:60] if latest.strip() else ""
+    Console().print(f"[bold cyan]Writing {file_name}:[/bold cyan] {chars_written} chars [dim]{preview}[/dim]")
+
+
 @timeit_decorator
-async def create_file(file_name: str, prompt: str) -> dict:
+async def create_file(
+    file_name: str, prompt: str, progress_callback: Optional[ProgressCallback] = report_progress
+) -> dict:
     file_path = os.path.join(SCRATCH_PAD_DIR, file_name)
 
     if os.path.exists(file_path):
         Console().print(f"[bold red]File already exists: [/bold red]{file_path}")
         return {"status": "File already exists"}
 
+    if CREATE_FILE_STREAMING:
+        return await stream_file(file_name, file_path, prompt, progress_callback)
+
     prompt_structure = f"""
     <purpose>
         Generate content for a new file based on the user's prompt and the file name.
@@ -46,15 +71,67 @@ async def create_file(file_name: str, prompt: str) -> dict:
 
     response = await get_structured_output_completion(prompt_structure, CreateFileResponse)
 
-    
-    with open(file_path, "w") as f:
-        Console().print(f"[bold green]File Created: [/bold green]{file_path}")
-        f.write(response.file_content)
-        
+    write_file_atomic(file_path, response.file_content)
+    get_scratchpad_index(SCRATCH_PAD_DIR).invalidate()
+    Console().print(f"[bold green]File Created: [/bold green]{file_path}")
 
     return {"status": "File created", "file_name": response.file_name}
 
 
+async def stream_file(
+    file_name: str, file_path: str, prompt: str, progress_callback: Optional[ProgressCallback]
+) -> dict:
+    """
+    Stream the generated content into a hidden temporary file next to the target and
+    link it into place once complete. A failed or cancelled generation removes the
+    temporary file, so a half-written file is never left in the scratchpad.
+    """
+    prompt_structure = f"""
+    <purpose>
+        Generate content for a new file based on the user's prompt and the file name.
+    </purpose>
+
+    <instructions>
+        <instruction>Based on the user's prompt and the file name, generate content for a new file.</instruction>
+        <instruction>The file name is: {file_name}</instruction>
+        <instruction>Use the following prompt to generate the content: {prompt}</instruction>
+        <instruction>Respond exclusively with the content of the file; it is written to the file as is.</instruction>
+        <instruction>Do not include any preamble or commentary or markdown code fences around the content.</instruction>
+    </instructions>
+    """
+
+    fd, temp_path = tempfile.mkstemp(dir=SCRATCH_PAD_DIR, prefix=f".{file_name}.", suffix=".partial")
+    chars_written = 0
+    last_report = 0.0
+    try:
+        with os.fdopen(fd, "w") as f:
+            async for delta in stream_model_completion(prompt_structure, ModelName.BASE_MODEL):
+                f.write(delta)
+                chars_written += len(delta)
+                now = time.monotonic()
+                # Report the first content right away, then at most once per interval
+                if progress_callback and (last_report == 0.0 or now - last_report >= PROGRESS_INTERVAL):
+                    f.flush()
+                    progress_callback(file_name, chars_written, delta)
+                    last_report = now
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Unlike a rename, a link never replaces a file created while generating
+        try:
+            os.link(temp_path, file_path)
+        except FileExistsError:
+            raise FileExistsError(f"{file_path} was created while generating") from None
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    get_scratchpad_index(SCRATCH_PAD_DIR).invalidate()
+    Console().print(f"[bold green]File Created: [/bold green]{file_path} ({chars_written} chars)")
+
+    return {"status": "File created", "file_name": file_name}
+
+
 if __name__ == "__main__":
     import asyncio
 
@@ -4,10 +4,12 @@ from agency_swarm.tools import BaseTool
 from dotenv import load_dotenv
 from pydantic import Field
 
-from voice_assistant.config import SCRATCH_PAD_DIR
+from voice_assistant.config import SCRATCH_PAD_DIR, SNAPSHOT_MAX_BYTES
 from voice_assistant.models import FileDeleteResponse
 from voice_assistant.utils.decorators import timeit_decorator
 from voice_assistant.utils.llm_utils import get_structured_output_completion
+from voice_assistant.utils.scratchpad_index import get_scratchpad_index
+from voice_assistant.utils.snapshot_utils import get_snapshot_store
 
 load_dotenv()
 
@@ -27,30 +29,44 @@ class DeleteFile(BaseTool):
 
 @timeit_decorator
 async def delete_file(prompt: str, force_delete: bool = False) -> dict:
-    available_files = os.listdir(SCRATCH_PAD_DIR)
+    scratchpad_index = get_scratchpad_index(SCRATCH_PAD_DIR)
+    selected_file = scratchpad_index.resolve(prompt)
 
-    # Select file to delete based on user prompt
-    file_delete_response = await get_structured_output_completion(
-        create_file_selection_prompt(available_files, prompt), FileDeleteResponse
-    )
+    if not selected_file:
+        # Not named exactly or ambiguous, let the model pick the file to delete
+        file_delete_response = await get_structured_output_completion(
+            create_file_selection_prompt(scratchpad_index.names(), prompt),
+            FileDeleteResponse,
+        )
+
+        if not file_delete_response.file:
+            return {"status": "No matching file found"}
 
-    if not file_delete_response.file:
-        return {"status": "No matching file found"}
+        selected_file = file_delete_response.file
 
-    file_path = os.path.join(SCRATCH_PAD_DIR, file_delete_response.file)
+    file_path = os.path.join(SCRATCH_PAD_DIR, selected_file)
 
     if not os.path.exists(file_path):
-        return {"status": "File does not exist", "file_name": file_delete_response.file}
+        return {"status": "File does not exist", "file_name": selected_file}
 
     if not force_delete:
         return {
             "status": "Confirmation required",
-            "file_name": file_delete_response.file,
-            "message": f"Are you sure you want to delete '{file_delete_response.file}'? Say force delete if you want to delete.",
+            "file_name": selected_file,
+            "message": f"Are you sure you want to delete '{selected_file}'? Say force delete if you want to delete.",
         }
 
+    # Keep the deleted version so RestoreFile can bring it back
+    get_snapshot_store(SCRATCH_PAD_DIR, SNAPSHOT_MAX_BYTES).snapshot(
+        selected_file, "delete"
+    )
     os.remove(file_path)
-    return {"status": "File deleted", "file_name": file_delete_response.file}
+    scratchpad_index.invalidate()
+    return {
+        "status": "File deleted",
+        "file_name": selected_file,
+        "message": "The file can be restored with RestoreFile.",
+    }
 
 
 def create_file_selection_prompt(available_files, user_prompt):
@@ -8,6 +8,10 @@ from typing import Any, Dict, Optional
 from agency_swarm.tools import BaseTool
 from pydantic import Field, PrivateAttr
 
+from voice_assistant.utils.email_utils import (
+    extract_message_metadata,
+    message_metadata_cache,
+)
 from voice_assistant.utils.google_services_utils import GoogleServicesUtils
 
 
@@ -49,27 +53,13 @@ class DraftGmail(BaseTool):
         thread_id = None
 
         if self.reply_to_id:
-            original_message = (
-                self._service.users()
-                .messages()
-                .get(userId="me", id=self.reply_to_id, format="full")
-                .execute()
-            )
-            thread_id = original_message.get("threadId")
+            original = self._get_original_metadata(self.reply_to_id)
+            thread_id = original["thread_id"]
             if not thread_id:
                 raise ValueError("Original message does not have a threadId.")
 
-            headers = original_message["payload"]["headers"]
-            original_subject = next(
-                (header["value"] for header in headers if header["name"] == "Subject"),
-                "No Subject",
-            )
-            original_from = next(
-                (header["value"] for header in headers if header["name"] == "From"),
-                "Unknown",
-            )
-            message["to"] = original_from
-            message["subject"] = f"Re: {original_subject}"
+            message["to"] = original["from"]
+            message["subject"] = f"Re: {original['subject']}"
             message["In-Reply-To"] = self.reply_to_id
             message["References"] = self.reply_to_id
         else:
@@ -86,6 +76,28 @@ class DraftGmail(BaseTool):
         raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
         return {"raw": raw_message, "threadId": thread_id}
 
+    def _get_original_metadata(self, message_id: str) -> Dict[str, Any]:
+        """
+        Returns the headers of the message being replied to, preferring the shared
+        cache filled by GetGmailSummary over another Gmail API round trip.
+        """
+        metadata = message_metadata_cache.get(message_id)
+        if metadata is None:
+            original_message = (
+                self._service.users()
+                .messages()
+                .get(
+                    userId="me",
+                    id=message_id,
+                    format="metadata",
+                    metadataHeaders=["Subject", "From", "Date"],
+                )
+                .execute()
+            )
+            metadata = extract_message_metadata(original_message)
+            message_metadata_cache.set(message_id, metadata)
+        return metadata
+
 
 if __name__ == "__main__":
     import asyncio
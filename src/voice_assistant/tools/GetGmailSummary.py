@@ -1,7 +1,5 @@
 import asyncio
-import base64
 import logging
-import re
 from datetime import datetime, timedelta
 from typing import Any, List
 
@@ -9,7 +7,13 @@ from agency_swarm.tools import BaseTool
 from dotenv import load_dotenv
 from pydantic import Field, PrivateAttr
 
+from voice_assistant.config import EMAIL_BODY_MAX_CHARS
 from voice_assistant.models import ModelName
+from voice_assistant.utils.email_utils import (
+    extract_body_text,
+    extract_message_metadata,
+    message_metadata_cache,
+)
 from voice_assistant.utils.google_services_utils import GoogleServicesUtils
 from voice_assistant.utils.llm_utils import get_model_completion
 
@@ -63,22 +67,44 @@ class GetGmailSummary(BaseTool):
         )
 
         messages = results.get("messages", [])
-        full_messages = []
         logger.info(f"Number of messages fetched: {len(messages)}")
 
-        for message in messages:
-            msg = await asyncio.to_thread(
-                lambda: self._service.users()
-                .messages()
-                .get(userId="me", id=message["id"], format="full")
-                .execute()
-            )
-            msg["id"] = message["id"]
-            full_messages.append(msg)
+        full_messages = await asyncio.to_thread(
+            self._batch_get_messages, [message["id"] for message in messages]
+        )
 
         logger.info("All messages fetched successfully.")
         return full_messages
 
+    def _batch_get_messages(self, message_ids: List[str]) -> List[dict]:
+        """
+        Fetch full messages using batch requests, one round trip per
+        GMAIL_BATCH_LIMIT messages instead of one per message.
+        """
+        fetched = {}
+
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                logger.error(f"Error fetching message {request_id}: {exception}")
+            else:
+                fetched[request_id] = response
+
+        batch_limit = GoogleServicesUtils.GMAIL_BATCH_LIMIT
+        for start in range(0, len(message_ids), batch_limit):
+            batch = self._service.new_batch_http_request(callback=on_response)
+            for message_id in message_ids[start : start + batch_limit]:
+                batch.add(
+                    self._service.users()
+                    .messages()
+                    .get(userId="me", id=message_id, format="full"),
+                    request_id=message_id,
+                )
+            batch.execute()
+
+        return [
+            fetched[message_id] for message_id in message_ids if message_id in fetched
+        ]
+
     async def _summarize_messages_with_gpt(self, messages: List[dict]) -> str:
         """
         Summarize the given messages using GPT model.
@@ -101,22 +127,13 @@ class GetGmailSummary(BaseTool):
 
     def _extract_email_data(self, msg: dict) -> dict:
         """
-        Extract relevant data from an email message.
+        Extract relevant data from an email message and cache its headers for replies.
         """
-        payload = msg["payload"]
-        headers = payload.get("headers", [])
+        metadata = extract_message_metadata(msg)
+        message_metadata_cache.set(metadata["id"], metadata)
         return {
-            "id": msg.get("id", "Unknown ID"),
-            "subject": next(
-                (h["value"] for h in headers if h["name"] == "Subject"), "No Subject"
-            ),
-            "from": next(
-                (h["value"] for h in headers if h["name"] == "From"), "Unknown Sender"
-            ),
-            "date": next(
-                (h["value"] for h in headers if h["name"] == "Date"), "Unknown Date"
-            ),
-            "body": self._extract_body(payload),
+            **metadata,
+            "body": extract_body_text(msg["payload"], EMAIL_BODY_MAX_CHARS),
         }
 
     def _format_email_text(self, email_data: dict) -> str:
@@ -131,55 +148,6 @@ class GetGmailSummary(BaseTool):
             f"Body: {email_data['body']}\n"
         )
 
-    def _extract_body(self, payload: dict) -> str:
-        """
-        Extract the body from an email payload, handling various MIME types and nested parts.
-        """
-        if "parts" in payload:
-            body = self._recursive_extract(payload["parts"])
-            if body:
-                return body
-
-        # Fallback to the main body if no parts are found
-        data = payload.get("body", {}).get("data", "")
-        if data:
-            try:
-                decoded_body = base64.urlsafe_b64decode(data).decode("utf-8")
-                return self._remove_links(decoded_body)
-            except Exception as e:
-                logger.error(f"Error decoding main body: {e}")
-        return "No body content"
-
-    def _recursive_extract(self, parts: List[dict]) -> str:
-        """
-        Recursively extract the body from email parts.
-        """
-        for part in parts:
-            mime_type = part.get("mimeType", "")
-            body = part.get("body", {})
-            data = body.get("data", "")
-
-            if data and mime_type in ["text/plain", "text/html"]:
-                try:
-                    decoded_body = base64.urlsafe_b64decode(data).decode("utf-8")
-                    return self._remove_links(decoded_body)
-                except Exception as e:
-                    logger.error(f"Error decoding {mime_type} part: {e}")
-            elif "parts" in part:
-                result = self._recursive_extract(part["parts"])
-                if result:
-                    return result
-        return ""
-
-    def _remove_links(self, text: str) -> str:
-        """
-        Remove URLs from the given text.
-        """
-        url_pattern = re.compile(r"http\S+|www\.\S+")
-        cleaned_text = url_pattern.sub("", text)
-        logger.debug("Removed links from the email body.")
-        return cleaned_text
-
 
 if __name__ == "__main__":
 
@@ -1,19 +1,24 @@
 import asyncio
-import base64
-import io
 import os
 import sys
-import tempfile
+import time
 from typing import ClassVar, Optional, Tuple
 
 import aiohttp
 from agency_swarm.tools import BaseTool
 from dotenv import load_dotenv
 from PIL import Image
-from PIL.Image import Resampling
 from pydantic import Field
 from rich.console import Console
 
+from voice_assistant.utils.cache_utils import TTLCache
+from voice_assistant.utils.image_utils import (
+    EncodedImage,
+    ImageEncoder,
+    screen_digest,
+)
+from voice_assistant.utils.log_utils import log_runtime
+
 
 class ScreenCaptureError(Exception):
     """Raised when screen capture fails"""
@@ -26,11 +31,19 @@ class WindowBoundsError(Exception):
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# Shared across tool instances so the encode buffer is reused between calls
+_screenshot_encoder: Optional[ImageEncoder] = None
+
+# Last (screen digest, description) per (window bounds, prompt)
+_description_cache: TTLCache[Tuple[str, str]] = TTLCache(ttl_seconds=300, max_entries=64, name="screen_description")
+
 
 class GetScreenDescription(BaseTool):
     """Get a text description of the user's active window."""
 
-    SCREENSHOT_FORMAT: ClassVar[str] = ".png"
+    SCREENSHOT_FORMAT: ClassVar[str] = os.getenv("SCREENSHOT_FORMAT", "JPEG")  # JPEG or WEBP
+    SCREENSHOT_QUALITY: ClassVar[int] = int(os.getenv("SCREENSHOT_QUALITY", "80"))
+    MAX_SCREENSHOT_DIMENSIONS: ClassVar[Tuple[int, int]] = (1600, 1200)
     SCREENSHOT_TIMEOUT: ClassVar[int] = 10  # seconds
     MAX_SCREENSHOT_SIZE: ClassVar[int] = 10 * 1024 * 1024  # 10MB
 
@@ -48,19 +61,47 @@ class GetScreenDescription(BaseTool):
             ScreenCaptureError: If screenshot capture fails
             RuntimeError: If image analysis fails
         """
-        screenshot_path = None
-        try:
-            screenshot_path = self.take_screenshot()
-            if screenshot_path is None:
-                raise ScreenCaptureError("Screenshot capture failed")
-            file_content = await asyncio.to_thread(self._read_file, screenshot_path)
-            resized_content = await asyncio.to_thread(self._resize_image, file_content)
-            encoded_image = base64.b64encode(resized_content).decode("utf-8")
-            return await self.analyze_image(encoded_image)
-        
-        finally:
-            if screenshot_path and os.path.exists(screenshot_path):
-                await asyncio.to_thread(os.remove, screenshot_path)
+        start_time = time.perf_counter()
+        bounds = await self._get_active_window_bounds()
+        if bounds is not None:
+            try:
+                self._validate_bounds(bounds)
+            except WindowBoundsError as e:
+                if self.debug_output:
+                    Console().print(f"[yellow]Ignoring active window bounds {bounds}: {e}[/yellow]")
+                bounds = None
+
+        screenshot = await asyncio.to_thread(self.take_screenshot, bounds)
+        if screenshot is None:
+            raise ScreenCaptureError("Screenshot capture failed")
+        capture_duration = time.perf_counter() - start_time
+
+        cache_key = (bounds, self.prompt)
+        screen_hash = await asyncio.to_thread(screen_digest, screenshot)
+        cached = _description_cache.get(cache_key)
+        if cached is not None and cached[0] == screen_hash:
+            if self.debug_output:
+                Console().print("[dim]Screen unchanged since last description, reusing it.[/dim]")
+            log_runtime("GetScreenDescription.cached_description", time.perf_counter() - start_time)
+            return cached[1]
+
+        encoded_image = await asyncio.to_thread(self._encode_image, screenshot)
+        if encoded_image.encoded_bytes > self.MAX_SCREENSHOT_SIZE:
+            raise ScreenCaptureError("Screenshot file too large")
+        capture_to_request = time.perf_counter() - start_time
+
+        log_runtime("GetScreenDescription.capture_to_request", capture_to_request)
+        if self.debug_output:
+            Console().print(
+                f"[dim]Screenshot: capture {capture_duration * 1000:.0f}ms, "
+                f"capture-to-request {capture_to_request * 1000:.0f}ms, "
+                f"{encoded_image.size[0]}x{encoded_image.size[1]} {self.SCREENSHOT_FORMAT}, "
+                f"{encoded_image.encoded_bytes / 1024:.0f}KB encoded, "
+                f"{len(encoded_image.data) / 1024:.0f}KB payload[/dim]"
+            )
+        description = await self.analyze_image(encoded_image)
+        _description_cache.set(cache_key, (screen_hash, description))
+        return description
 
     # async def take_screenshot(self) -> str:
     #     """
@@ -149,36 +190,34 @@ class GetScreenDescription(BaseTool):
     #         raise ScreenCaptureError(f"Screenshot capture failed: {str(e)}") from e
 
 
-    def take_screenshot(self):
-        c = Console()
+    def take_screenshot(self, bounds: Optional[Tuple[int, int, int, int]] = None) -> Optional[Image.Image]:
+        """
+        Capture the screen into memory, cropped to the given window bounds.
 
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(suffix=self.SCREENSHOT_FORMAT, delete=False) as tmp_file:
-            screenshot_path = tmp_file.name
-            if self.debug_output:
-                c.print(f"Screenshot file: {screenshot_path}")
-        
-        # Detect platform and take screenshot
+        Bounds are in virtual-desktop coordinates, so windows on secondary
+        monitors (including ones left of or above the primary) are captured.
+
+        Args:
+            bounds: (x, y, width, height) of the region to capture, or None for the whole desktop
+
+        Returns:
+            Image.Image: The captured screenshot, or None if capture failed
+        """
         try:
-            import platform
-            system = platform.system().lower()
-            
-            if system == "windows":
-                import pyautogui
-                screenshot = pyautogui.screenshot()
-                screenshot.save(screenshot_path, format='PNG')
-            else:  # Linux, MacOS
-                from PIL import ImageGrab
-                screenshot = ImageGrab.grab()  # Type hint added
-                screenshot = screenshot.convert('RGB')
-                screenshot.save(screenshot_path, format='PNG')
-
-            return screenshot_path
-            
+            from PIL import ImageGrab
+
+            bbox = None
+            if bounds is not None:
+                x, y, width, height = bounds
+                bbox = (x, y, x + width, y + height)
+
+            if sys.platform.startswith("linux"):
+                # X11 exposes every monitor as one screen, all_screens is not supported
+                return ImageGrab.grab(bbox=bbox)
+            return ImageGrab.grab(bbox=bbox, all_screens=True)
+
         except Exception as e:
             print(f"Error taking screenshot: {str(e)}")
-            if os.path.exists(screenshot_path):
-                os.remove(screenshot_path)
             return None
 
     async def _get_active_window_bounds(self) -> Optional[Tuple[int, int, int, int]]:
@@ -264,10 +303,6 @@ class GetScreenDescription(BaseTool):
             y = rect[1]
             w = rect[2] - x
             h = rect[3] - y
-            if x < 0:
-                x = 0
-            if y < 0:
-                y = 0
             return x, y, w, h
 
         # Run in threadpool since win32gui is not async
@@ -286,7 +321,8 @@ class GetScreenDescription(BaseTool):
         x, y, width, height = bounds
         if width <= 0 or height <= 0:
             raise WindowBoundsError("Invalid window dimensions")
-        if x < 0 or y < 0:
+        # Negative positions are valid on multi-monitor setups, but not absurd ones
+        if abs(x) > 100_000 or abs(y) > 100_000:
             raise WindowBoundsError("Invalid window position")
 
     def _get_screenshot_command(self, x: int, y: int, width: int, height: int) -> Tuple[str, ...]:
@@ -334,7 +370,7 @@ class GetScreenDescription(BaseTool):
             return None
 
     
-    async def analyze_image(self, base64_image: str) -> str:
+    async def analyze_image(self, encoded_image: EncodedImage) -> str:
         """Send the encoded image and prompt to the OpenAI API for analysis."""
         headers = {
             "Content-Type": "application/json",
@@ -357,7 +393,7 @@ class GetScreenDescription(BaseTool):
                         },
                         {
                             "type": "image_url",
-                            "image_url": {"url": f"data:image/png;base64,{base64_image}"},
+                            "image_url": {"url": encoded_image.data_url},
                         },
                     ],
                 },
@@ -377,18 +413,16 @@ class GetScreenDescription(BaseTool):
                 result = await response.json()
                 return result["choices"][0]["message"]["content"]
 
-    def _read_file(self, path: str) -> bytes:
-        """Read and return the content of a file."""
-        with open(path, "rb") as image_file:
-            return image_file.read()
-
-    def _resize_image(self, image_data: bytes) -> bytes:
-        """Resize the image to reduce payload size while preserving aspect ratio."""
-        with Image.open(io.BytesIO(image_data)) as img:
-            img.thumbnail((1600, 1200), Resampling.BICUBIC)
-            with io.BytesIO() as output:
-                img.save(output, format="PNG")
-                return output.getvalue()
+    def _encode_image(self, image: Image.Image) -> EncodedImage:
+        """Downscale and encode the screenshot in a single in-memory pass."""
+        global _screenshot_encoder
+        if _screenshot_encoder is None:
+            _screenshot_encoder = ImageEncoder(
+                image_format=self.SCREENSHOT_FORMAT,
+                quality=self.SCREENSHOT_QUALITY,
+                max_size=self.MAX_SCREENSHOT_DIMENSIONS,
+            )
+        return _screenshot_encoder.encode(image)
 
 
 if __name__ == "__main__":
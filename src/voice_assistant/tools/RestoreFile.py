@@ -0,0 +1,70 @@
+import time
+
+from agency_swarm.tools import BaseTool
+from dotenv import load_dotenv
+from pydantic import Field
+
+from voice_assistant.config import SCRATCH_PAD_DIR, SNAPSHOT_MAX_BYTES
+from voice_assistant.utils.decorators import timeit_decorator
+from voice_assistant.utils.scratchpad_index import (
+    get_scratchpad_index,
+    mentioned_names,
+)
+from voice_assistant.utils.snapshot_utils import get_snapshot_store
+
+load_dotenv()
+
+
+class RestoreFile(BaseTool):
+    """A tool for undoing the last update or deletion of a scratchpad file by restoring its previous version, or for undoing the last restore."""
+
+    file_name: str = Field(
+        "",
+        description="The name of the file to restore. Leave empty to undo the most recent file change.",
+    )
+    redo: bool = Field(
+        False,
+        description="Set to true to undo the last restore, putting back the version it replaced.",
+    )
+
+    async def run(self):
+        result = await restore_file(self.file_name, self.redo)
+        return str(result)
+
+
+@timeit_decorator
+async def restore_file(file_name: str = "", redo: bool = False) -> dict:
+    store = get_snapshot_store(SCRATCH_PAD_DIR, SNAPSHOT_MAX_BYTES)
+
+    if file_name:
+        known_files = store.files()
+        if file_name not in known_files:
+            # Same rule as the scratchpad index: the full name, or let the model pick
+            mentioned = mentioned_names(file_name, known_files)
+            if len(mentioned) != 1:
+                return {
+                    "status": "No previous versions found",
+                    "file_name": file_name,
+                    "files_with_history": known_files,
+                }
+            file_name = mentioned[0]
+
+    record = store.latest_undoable(file_name or None, redo=redo)
+    if record is None:
+        return {"status": "Nothing to restore", "file_name": file_name}
+
+    store.restore(record)
+    get_scratchpad_index(SCRATCH_PAD_DIR).invalidate()
+    return {
+        "status": "File restored",
+        "file_name": record.file,
+        "undone_action": record.action,
+        "version_from": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record.ts)),
+    }
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    tool = RestoreFile()
+    print(asyncio.run(tool.run()))
@@ -5,13 +5,33 @@ from agency_swarm.tools import BaseTool
 from dotenv import load_dotenv
 from pydantic import Field
 
-from voice_assistant.config import SCRATCH_PAD_DIR
-from voice_assistant.models import FileSelectionResponse, ModelName
+from voice_assistant.config import (
+    FILE_EDIT_CHUNKED_MIN_CHARS,
+    FILE_EDIT_CONTEXT_CHARS,
+    FILE_EDIT_FULL_REWRITE_MAX_CHARS,
+    SCRATCH_PAD_DIR,
+    SNAPSHOT_MAX_BYTES,
+)
+from voice_assistant.models import FileEditResponse, FileSelectionResponse, ModelName
+from voice_assistant.utils.chunking_utils import (
+    build_excerpt,
+    edge_sections,
+    select_sections,
+    splice_excerpt,
+    split_sections,
+)
 from voice_assistant.utils.decorators import timeit_decorator
+from voice_assistant.utils.file_edit_utils import (
+    EditApplicationError,
+    apply_edits,
+    write_file_atomic,
+)
 from voice_assistant.utils.llm_utils import (
     get_structured_output_completion,
     parse_chat_completion,
 )
+from voice_assistant.utils.scratchpad_index import get_scratchpad_index
+from voice_assistant.utils.snapshot_utils import get_snapshot_store
 
 load_dotenv()
 
@@ -33,41 +53,127 @@ class UpdateFile(BaseTool):
 
 @timeit_decorator
 async def update_file(prompt: str) -> dict:
-    available_files = os.listdir(SCRATCH_PAD_DIR)
-    available_model_map = {model.value: model.name for model in ModelName}
-
-    file_selection_response = await get_structured_output_completion(
-        create_file_selection_prompt(
-            available_files, json.dumps(available_model_map), prompt
-        ),
-        FileSelectionResponse,
-    )
+    scratchpad_index = get_scratchpad_index(SCRATCH_PAD_DIR)
+    selected_file = scratchpad_index.resolve(prompt)
+
+    if selected_file:
+        selected_model = infer_model(prompt)
+    else:
+        # Not named exactly or ambiguous, let the model pick the file
+        available_model_map = {model.value: model.name for model in ModelName}
+        file_selection_response = await get_structured_output_completion(
+            create_file_selection_prompt(
+                scratchpad_index.names(), json.dumps(available_model_map), prompt
+            ),
+            FileSelectionResponse,
+        )
 
-    if not file_selection_response.file:
-        return {"status": "No matching file found"}
+        if not file_selection_response.file:
+            return {"status": "No matching file found"}
+
+        selected_file = file_selection_response.file
+        selected_model = file_selection_response.model or ModelName.BASE_MODEL
 
-    selected_file = file_selection_response.file
-    selected_model = file_selection_response.model or ModelName.BASE_MODEL
     file_path = os.path.join(SCRATCH_PAD_DIR, selected_file)
 
     with open(file_path, "r") as f:
         file_content = f.read()
 
-    updated_content = await parse_chat_completion(
-        create_file_update_prompt(selected_file, file_content, prompt),
-        selected_model,
-    )
+    if len(file_content) <= FILE_EDIT_FULL_REWRITE_MAX_CHARS:
+        # Small files are cheap to regenerate and the model handles them best in full
+        edit_mode = "full_rewrite"
+        updated_content = await parse_chat_completion(
+            create_file_update_prompt(selected_file, file_content, prompt),
+            selected_model,
+        )
+    else:
+        sections = None
+        if len(file_content) > FILE_EDIT_CHUNKED_MIN_CHARS:
+            all_sections = split_sections(file_content, selected_file)
+            sections = select_sections(
+                file_content, all_sections, prompt, FILE_EDIT_CONTEXT_CHARS
+            )
+            if sections is None:
+                # Nothing in the file matches the prompt, e.g. 'add a conclusion';
+                # the head and the end still beat sending the whole file
+                sections = edge_sections(all_sections)
+        try:
+            if sections:
+                # Only the relevant sections go to the model, so large files edit in roughly constant time
+                edit_mode = "chunked"
+                excerpt = build_excerpt(file_content, sections)
+                edited_excerpt = await generate_edited_content(
+                    selected_file, excerpt, prompt, selected_model, is_excerpt=True
+                )
+                updated_content = splice_excerpt(file_content, sections, edited_excerpt)
+            else:
+                edit_mode = "search_replace"
+                updated_content = await generate_edited_content(
+                    selected_file, file_content, prompt, selected_model
+                )
+        except EditApplicationError as e:
+            return {
+                "status": "Edit could not be applied, file left unchanged",
+                "file_name": selected_file,
+                "error": str(e),
+            }
 
-    with open(file_path, "w") as f:
-        f.write(updated_content)
+    get_snapshot_store(SCRATCH_PAD_DIR, SNAPSHOT_MAX_BYTES).snapshot(
+        selected_file, "update"
+    )
+    write_file_atomic(file_path, updated_content)
+    scratchpad_index.invalidate()
 
     return {
         "status": "File updated",
         "file_name": selected_file,
         "model_used": selected_model,
+        "edit_mode": edit_mode,
     }
 
 
+async def generate_edited_content(
+    file_name: str,
+    file_content: str,
+    prompt: str,
+    model: ModelName,
+    attempts: int = 2,
+    is_excerpt: bool = False,
+) -> str:
+    """
+    Ask the model for search/replace edits and apply them locally. If an edit does
+    not match the file, the error is sent back once so the model can correct it.
+    With is_excerpt, file_content holds only the relevant sections of the file.
+    """
+    edit_prompt = create_file_edit_prompt(
+        file_name, file_content, prompt, is_excerpt=is_excerpt
+    )
+    for attempt in range(attempts):
+        response = await get_structured_output_completion(
+            edit_prompt, FileEditResponse, model
+        )
+        try:
+            return apply_edits(file_content, response.edits)
+        except EditApplicationError as e:
+            if attempt == attempts - 1:
+                raise
+            edit_prompt = create_file_edit_prompt(
+                file_name,
+                file_content,
+                prompt,
+                previous_error=str(e),
+                is_excerpt=is_excerpt,
+            )
+
+
+def infer_model(prompt: str) -> ModelName:
+    """Pick the model named in the prompt, defaulting to the base model."""
+    lowered = prompt.lower()
+    if ModelName.FAST_MODEL.value in lowered or "fast model" in lowered:
+        return ModelName.FAST_MODEL
+    return ModelName.BASE_MODEL
+
+
 def create_file_selection_prompt(available_files, available_model_map, user_prompt):
     return f"""
 <purpose>
@@ -124,6 +230,49 @@ def create_file_update_prompt(file_name, file_content, user_prompt):
     """
 
 
+def create_file_edit_prompt(
+    file_name, file_content, user_prompt, previous_error=None, is_excerpt=False
+):
+    retry_instruction = (
+        f"<instruction>Your previous edits could not be applied: {previous_error}. Copy the search text exactly from the file.</instruction>"
+        if previous_error
+        else ""
+    )
+    excerpt_instruction = (
+        "<instruction>The file is large, so only the sections relevant to the prompt are shown; omitted parts are marked '[... unchanged part of the file omitted ...]'. Never include or edit these markers, and keep each search text within one section.</instruction>"
+        if is_excerpt
+        else ""
+    )
+    return f"""
+<purpose>
+    Update the content of the file based on the user's prompt by returning search/replace edits.
+</purpose>
+
+<instructions>
+    <instruction>Based on the user's prompt and the file content, return the edits needed to update the file.</instruction>
+    <instruction>Each edit has a 'search' text copied exactly from the file, including whitespace, and the 'replace' text that substitutes it.</instruction>
+    <instruction>Make each search text unique in the file by including a few surrounding lines, but keep it as short as possible.</instruction>
+    <instruction>Use an empty 'search' to append the 'replace' text to the end of the file.</instruction>
+    <instruction>Edits are applied in order; do not return edits for parts of the file that do not change.</instruction>
+    <instruction>Be precise and accurate.</instruction>
+    {excerpt_instruction}
+    {retry_instruction}
+</instructions>
+
+<file-name>
+    {file_name}
+</file-name>
+
+<file-content>
+{file_content}
+</file-content>
+
+<user-prompt>
+    {user_prompt}
+</user-prompt>
+    """
+
+
 if __name__ == "__main__":
     import asyncio
 
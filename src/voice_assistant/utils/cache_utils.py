@@ -0,0 +1,107 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, List, Optional, TypeVar
+
+V = TypeVar("V")
+
+# Named caches, so their stats can be reported without importing every module that owns one
+_named_caches: "weakref.WeakValueDictionary[str, TTLCache]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+class TTLCache(Generic[V]):
+    """
+    Thread-safe in-memory cache with per-entry time-to-live and LRU size bound.
+
+    Tools run their blocking work through asyncio.to_thread, so entries may be
+    read and written from several threads at once.
+
+    Usage:
+        cache = TTLCache(ttl_seconds=600, max_entries=256)
+        cache.set("key", value)
+        value = cache.get("key")  # None once expired or evicted
+    """
+
+    def __init__(
+        self, ttl_seconds: float, max_entries: int = 1024, name: Optional[str] = None
+    ):
+        self.name = name
+        if name:
+            _named_caches[name] = self
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """
+        Returns the cached value, or None if missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """
+        Stores a value, evicting expired entries and then the least recently used.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._evict_expired(now)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return entry[1] if entry else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """
+        Returns hit/miss counters and current size.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+        }
+
+    def _evict_expired(self, now: float) -> None:
+        expired = [
+            key for key, (expires_at, _) in self._entries.items() if expires_at < now
+        ]
+        for key in expired:
+            del self._entries[key]
+
+
+def named_caches() -> List[TTLCache]:
+    """Returns the live caches created with a name."""
+    return list(_named_caches.values())
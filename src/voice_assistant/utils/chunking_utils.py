@@ -0,0 +1,229 @@
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from voice_assistant.utils.file_edit_utils import EditApplicationError
+
+# Shown to the model between the excerpts of a large file
+OMISSION_MARKER = "\n\n[... unchanged part of the file omitted ...]\n\n"
+
+MIN_SECTION_CHARS = 200
+MAX_SECTION_CHARS = 4000
+
+_MARKDOWN_HEADING = re.compile(r"^#{1,6}\s", re.MULTILINE)
+_CODE_DEFINITION = re.compile(
+    r"^(?:async\s+def|def|class|function|async\s+function|export|const|let|var|public|private|protected|func|fn|struct|impl|interface|type)\b",
+    re.MULTILINE,
+)
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n")
+_WORD_PATTERN = re.compile(r"[a-zA-Z0-9_]{3,}")
+_CODE_EXTENSIONS = {
+    ".py",
+    ".js",
+    ".ts",
+    ".jsx",
+    ".tsx",
+    ".go",
+    ".rs",
+    ".java",
+    ".cs",
+    ".cpp",
+    ".c",
+    ".h",
+    ".rb",
+    ".php",
+    ".swift",
+    ".kt",
+}
+_MARKDOWN_EXTENSIONS = {".md", ".markdown", ".mdx", ".rst"}
+_STOP_WORDS = {
+    "the",
+    "and",
+    "for",
+    "with",
+    "that",
+    "this",
+    "from",
+    "into",
+    "add",
+    "update",
+    "change",
+    "file",
+    "please",
+    "make",
+    "section",
+}
+
+
+@dataclass
+class Section:
+    """
+    A structural part of a file.
+
+    Attributes:
+        start (int): Offset of the first character in the file
+        end (int): Offset after the last character
+        title (str): Heading or definition line that opens the section
+    """
+
+    start: int
+    end: int
+    title: str
+
+
+def _boundaries(content: str, file_name: str) -> List[int]:
+    """Offsets where a new section starts, based on the file type."""
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension in _MARKDOWN_EXTENSIONS:
+        pattern = _MARKDOWN_HEADING
+    elif extension in _CODE_EXTENSIONS:
+        pattern = _CODE_DEFINITION
+    else:
+        return [m.end() for m in _PARAGRAPH_BREAK.finditer(content)]
+    starts = [m.start() for m in pattern.finditer(content)]
+    # Files without headings / definitions fall back to paragraphs
+    return starts or [m.end() for m in _PARAGRAPH_BREAK.finditer(content)]
+
+
+def split_sections(content: str, file_name: str) -> List[Section]:
+    """
+    Split a file into contiguous sections by markdown headings, top-level code
+    definitions or paragraphs. Tiny sections are merged into their predecessor and
+    oversized ones are split at paragraph breaks, so every section is roughly
+    between MIN_SECTION_CHARS and MAX_SECTION_CHARS.
+    """
+    starts = sorted(
+        {0, *(b for b in _boundaries(content, file_name) if 0 < b < len(content))}
+    )
+    spans = list(zip(starts, starts[1:] + [len(content)]))
+
+    merged: List[Tuple[int, int]] = []
+    for start, end in spans:
+        if merged and (
+            end - start < MIN_SECTION_CHARS
+            or merged[-1][1] - merged[-1][0] < MIN_SECTION_CHARS
+        ):
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+
+    sections = []
+    for start, end in merged:
+        while end - start > MAX_SECTION_CHARS:
+            window = content[start : start + MAX_SECTION_CHARS]
+            breaks = [
+                m.end()
+                for m in _PARAGRAPH_BREAK.finditer(window)
+                if m.end() > MIN_SECTION_CHARS
+            ]
+            cut = start + (
+                breaks[-1] if breaks else window.rfind("\n") + 1 or MAX_SECTION_CHARS
+            )
+            sections.append(Section(start, cut, _title(content, start)))
+            start = cut
+        sections.append(Section(start, end, _title(content, start)))
+    return sections
+
+
+def _title(content: str, start: int) -> str:
+    line_end = content.find("\n", start)
+    return content[start : line_end if line_end != -1 else len(content)].strip()[:80]
+
+
+def _keywords(text: str) -> set:
+    return {w.lower() for w in _WORD_PATTERN.findall(text)} - _STOP_WORDS
+
+
+def select_sections(
+    content: str, sections: List[Section], prompt: str, max_chars: int
+) -> Optional[List[Section]]:
+    """
+    Pick the sections most relevant to the prompt by keyword overlap. Words are
+    weighted by how rare they are across sections, words in a section's title
+    count triple, and sections scoring under half of the best one are dropped.
+    The last section is always included so appended content lands at the end of
+    the file.
+
+    Returns:
+        Optional[List[Section]]: Selected sections in file order, or None if nothing
+        in the file relates to the prompt
+    """
+    prompt_words = _keywords(prompt)
+    matches = []
+    document_frequency: Dict[str, int] = {}
+    for section in sections:
+        body_words = _keywords(content[section.start : section.end]) & prompt_words
+        title_words = _keywords(section.title) & prompt_words
+        matches.append((body_words, title_words))
+        for word in body_words | title_words:
+            document_frequency[word] = document_frequency.get(word, 0) + 1
+
+    weight = {
+        word: math.log(1 + len(sections) / count)
+        for word, count in document_frequency.items()
+    }
+    scores = [
+        sum(weight[w] for w in body_words) + 2 * sum(weight[w] for w in title_words)
+        for body_words, title_words in matches
+    ]
+    best = max(scores, default=0.0)
+    if not best:
+        return None
+
+    last = len(sections) - 1
+    selected = {last}
+    budget = max_chars - (sections[last].end - sections[last].start)
+    for position in sorted(range(len(sections)), key=lambda p: (-scores[p], p)):
+        size = sections[position].end - sections[position].start
+        if scores[position] < best / 2:
+            break
+        if size <= budget:
+            selected.add(position)
+            budget -= size
+    return [sections[position] for position in sorted(selected)]
+
+
+def edge_sections(sections: List[Section]) -> List[Section]:
+    """
+    The first and last sections, for prompts that match nothing in the file such
+    as 'add a conclusion': the head shows the file's format and the tail is where
+    new content usually goes.
+    """
+    return sections[:1] + sections[1:][-1:]
+
+
+def _merge_adjacent(sections: List[Section]) -> List[Tuple[int, int]]:
+    spans: List[Tuple[int, int]] = []
+    for section in sections:
+        if spans and spans[-1][1] == section.start:
+            spans[-1] = (spans[-1][0], section.end)
+        else:
+            spans.append((section.start, section.end))
+    return spans
+
+
+def build_excerpt(content: str, sections: List[Section]) -> str:
+    """Join the selected sections, with OMISSION_MARKER where content was left out."""
+    return OMISSION_MARKER.join(
+        content[start:end] for start, end in _merge_adjacent(sections)
+    )
+
+
+def splice_excerpt(content: str, sections: List[Section], edited_excerpt: str) -> str:
+    """
+    Put an edited excerpt from build_excerpt back into the full content.
+
+    Raises:
+        EditApplicationError: If an edit removed or crossed an omission marker
+    """
+    spans = _merge_adjacent(sections)
+    parts = edited_excerpt.split(OMISSION_MARKER)
+    if len(parts) != len(spans):
+        raise EditApplicationError(
+            "Edits must stay within one excerpt and must not touch the omission markers."
+        )
+    for (start, end), part in reversed(list(zip(spans, parts))):
+        content = content[:start] + part + content[end:]
+    return content
@@ -0,0 +1,303 @@
+import base64
+import logging
+import re
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+from voice_assistant.utils.cache_utils import TTLCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BODY_CHARS = 2000
+MESSAGE_METADATA_TTL_SECONDS = 30 * 60
+
+# Headers of recently fetched messages, keyed by Gmail message ID. GetGmailSummary
+# fills it so DraftGmail can build replies without fetching the original again.
+message_metadata_cache: TTLCache[dict] = TTLCache(
+    ttl_seconds=MESSAGE_METADATA_TTL_SECONDS,
+    max_entries=500,
+    name="gmail_message_metadata",
+)
+
+# Precompiled once at import; these run for every email part we summarize.
+_URL_PATTERN = re.compile(r"https?://\S+|www\.\S+")
+_INLINE_WHITESPACE_PATTERN = re.compile(r"[ \t\r\f\v\u00a0]+")
+_BLANK_LINES_PATTERN = re.compile(r"\n\s*\n\s*\n+")
+_REPLY_HEADER_PATTERN = re.compile(
+    r"^\s*(?:"
+    r"On .{0,200}wrote:\s*$"
+    r"|-{2,}\s*Original Message\s*-{2,}"
+    r"|-{2,}\s*Forwarded message\s*-{2,}"
+    r"|_{10,}\s*$"
+    r"|From:\s.+\n\s*(?:Sent|Date):\s"
+    r")",
+    re.IGNORECASE | re.MULTILINE,
+)
+_SIGNATURE_PATTERN = re.compile(
+    r"^(?:-- ?$|Sent from my \w+|Get Outlook for \w+)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+_SKIPPED_HTML_TAGS = {"script", "style", "head", "title", "blockquote"}
+_BLOCK_HTML_TAGS = {
+    "address",
+    "article",
+    "br",
+    "div",
+    "footer",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "header",
+    "hr",
+    "li",
+    "ol",
+    "p",
+    "section",
+    "table",
+    "td",
+    "th",
+    "tr",
+    "ul",
+}
+_QUOTE_CLASS_MARKERS = (
+    "gmail_quote",
+    "yahoo_quoted",
+    "moz-cite-prefix",
+    "divRplyFwdMsg",
+)
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """
+    Streaming HTML-to-text converter.
+
+    Text is accumulated as the parser walks the markup, so the document is never
+    turned into a tree. Script/style content and quoted reply containers are dropped.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._chunks: List[str] = []
+        self._skip_tag: Optional[str] = None
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+
+        class_attr = " ".join(
+            value or "" for name, value in attrs if name in ("class", "id")
+        )
+        if tag in _SKIPPED_HTML_TAGS or any(
+            marker in class_attr for marker in _QUOTE_CLASS_MARKERS
+        ):
+            self._skip_tag = tag
+            self._skip_depth = 1
+        elif tag in _BLOCK_HTML_TAGS:
+            self._chunks.append("\n")
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        if not self._skip_tag and tag in _BLOCK_HTML_TAGS:
+            self._chunks.append("\n")
+
+    def handle_endtag(self, tag: str):
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if self._skip_depth == 0:
+                    self._skip_tag = None
+            return
+        if tag in _BLOCK_HTML_TAGS:
+            self._chunks.append("\n")
+
+    def handle_data(self, data: str):
+        if not self._skip_tag:
+            self._chunks.append(data)
+
+    def get_text(self) -> str:
+        return "".join(self._chunks)
+
+
+def decode_base64url(data: str) -> str:
+    """
+    Decode a Gmail base64url body, tolerating missing padding and bad bytes.
+    """
+    padded = data + "=" * (-len(data) % 4)
+    return base64.urlsafe_b64decode(padded).decode("utf-8", errors="replace")
+
+
+def html_to_text(html: str) -> str:
+    """
+    Convert HTML markup to plain text without building a DOM.
+    """
+    parser = _HTMLTextExtractor()
+    parser.feed(html)
+    parser.close()
+    return parser.get_text()
+
+
+def remove_links(text: str) -> str:
+    """
+    Remove URLs from the given text.
+    """
+    return _URL_PATTERN.sub("", text)
+
+
+def strip_quoted_text(text: str) -> str:
+    """
+    Drop quoted reply chains, '>' quoted lines and trailing signatures.
+    """
+    reply_header = _REPLY_HEADER_PATTERN.search(text)
+    if reply_header and reply_header.start() > 0:
+        text = text[: reply_header.start()]
+
+    signature = _SIGNATURE_PATTERN.search(text)
+    if signature and signature.start() > 0:
+        text = text[: signature.start()]
+
+    return "\n".join(
+        line for line in text.split("\n") if not line.lstrip().startswith(">")
+    )
+
+
+def normalize_whitespace(text: str) -> str:
+    """
+    Collapse runs of spaces and blank lines.
+    """
+    text = _INLINE_WHITESPACE_PATTERN.sub(" ", text)
+    text = _BLANK_LINES_PATTERN.sub("\n\n", text)
+    return "\n".join(line.strip() for line in text.split("\n")).strip()
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """
+    Truncate text to at most max_chars characters, cutting at a word boundary.
+    """
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars)
+    if cut < max_chars // 2:
+        cut = max_chars
+    return text[:cut].rstrip() + " [truncated]"
+
+
+def _find_text_parts(payload: dict) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Walk the MIME tree and return the first (text/plain, text/html) body data.
+    """
+    plain_data = None
+    html_data = None
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        mime_type = part.get("mimeType", "")
+        data = part.get("body", {}).get("data", "")
+        if data:
+            if mime_type == "text/plain" and plain_data is None:
+                plain_data = data
+            elif mime_type == "text/html" and html_data is None:
+                html_data = data
+            elif not mime_type and plain_data is None:
+                plain_data = data
+        if plain_data is not None:
+            break
+        # Reversed so parts are visited in their original order.
+        stack.extend(reversed(part.get("parts", [])))
+    return plain_data, html_data
+
+
+def get_header(headers: List[dict], name: str, default: str) -> str:
+    """
+    Returns the value of the first header with the given name (case-insensitive).
+    """
+    name = name.lower()
+    return next(
+        (h["value"] for h in headers if h.get("name", "").lower() == name), default
+    )
+
+
+def extract_message_metadata(msg: dict) -> dict:
+    """
+    Extract the ID, thread ID and reply-relevant headers from a Gmail message resource.
+    Works for both format="full" and format="metadata" responses.
+    """
+    headers = msg.get("payload", {}).get("headers", [])
+    return {
+        "id": msg.get("id", "Unknown ID"),
+        "thread_id": msg.get("threadId"),
+        "subject": get_header(headers, "Subject", "No Subject"),
+        "from": get_header(headers, "From", "Unknown Sender"),
+        "date": get_header(headers, "Date", "Unknown Date"),
+    }
+
+
+def extract_body_text(payload: dict, max_chars: int = DEFAULT_MAX_BODY_CHARS) -> str:
+    """
+    Extract a compact plain-text body from a Gmail message payload.
+
+    Prefers text/plain over text/html, converts HTML to text, removes links,
+    quoted replies and signatures, and truncates to max_chars characters.
+    """
+    plain_data, html_data = _find_text_parts(payload)
+    text = ""
+    try:
+        if plain_data is not None:
+            text = decode_base64url(plain_data)
+        elif html_data is not None:
+            text = html_to_text(decode_base64url(html_data))
+    except Exception as e:
+        logger.error(f"Error decoding email body: {e}")
+        return "No body content"
+
+    text = normalize_whitespace(strip_quoted_text(remove_links(text)))
+    if not text:
+        return "No body content"
+    return truncate_text(text, max_chars)
+
+
+if __name__ == "__main__":
+    import time
+
+    def encode(text: str) -> str:
+        return (
+            base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii").rstrip("=")
+        )
+
+    html_body = (
+        "<html><head><style>p { color: red; }</style></head><body>"
+        + "".join(
+            f'<div class="row"><p style="margin:0">Paragraph {i} about the quarterly '
+            f'roadmap, see <a href="https://example.com/{i}">https://example.com/{i}</a>.</p></div>'
+            for i in range(40)
+        )
+        + '<div class="gmail_quote">On Mon, Bob wrote:<blockquote>'
+        + "Older thread content. " * 400
+        + "</blockquote></div></body></html>"
+    )
+    messages = [
+        {
+            "mimeType": "multipart/alternative",
+            "parts": [{"mimeType": "text/html", "body": {"data": encode(html_body)}}],
+        }
+        for _ in range(500)
+    ]
+
+    start = time.perf_counter()
+    extracted = [extract_body_text(m) for m in messages]
+    elapsed = time.perf_counter() - start
+
+    raw_chars = len(html_body)
+    extracted_chars = len(extracted[0])
+    print(f"Messages:            {len(messages)}")
+    print(f"Throughput:          {len(messages) / elapsed:,.0f} messages/s")
+    print(f"Raw body chars:      {raw_chars:,} (~{raw_chars // 4:,} tokens)")
+    print(
+        f"Extracted chars:     {extracted_chars:,} (~{extracted_chars // 4:,} tokens)"
+    )
+    print(f"Reduction:           {100 * (1 - extracted_chars / raw_chars):.1f}%")
@@ -0,0 +1,510 @@
+"""
+Offline stand-in for the Gmail and Google Calendar APIs.
+
+Implements the subset of the googleapiclient resource interface used by
+GetGmailSummary, DraftGmail and FetchDailyMeetingSchedule:
+
+    gmail:    users().messages().list/get, users().drafts().create,
+              users().history().list, users().getProfile, new_batch_http_request
+    calendar: events().list
+
+Every request sleeps for a configurable latency before answering, so the tools
+can be benchmarked and regression-tested without network access.
+
+Usage:
+    from voice_assistant.utils.fake_google_services import install_fake_google_services
+
+    fake = install_fake_google_services(latency_ms=80, mailbox_size=500)
+    # GoogleServicesUtils.authenticate_service(...) now returns fake services
+    print(fake.stats)
+
+Setting GOOGLE_SERVICES_BACKEND=fake in the environment does the same for a
+whole assistant session.
+"""
+
+import base64
+import copy
+import itertools
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Any, Callable, Dict, List, Optional
+
+GMAIL_BATCH_LIMIT = 100
+
+_SENDERS = [
+    "Alice Johnson <alice@example.com>",
+    "Bob Smith <bob@example.org>",
+    "Carol White <carol@example.net>",
+    "GitHub <noreply@github.com>",
+    "Team Calendar <calendar@example.com>",
+]
+_TOPICS = [
+    "Quarterly roadmap",
+    "Invoice",
+    "Design review",
+    "Pull request",
+    "Offsite plans",
+]
+_MEETINGS = [
+    "Standup",
+    "1:1",
+    "Sprint planning",
+    "Customer call",
+    "Lunch",
+    "Architecture sync",
+]
+
+
+class FakeHttpError(Exception):
+    """Raised by fake requests, mirroring googleapiclient.errors.HttpError."""
+
+    def __init__(self, status_code: int, reason: str):
+        super().__init__(f"<HttpError {status_code}: {reason}>")
+        self.status_code = status_code
+        self.reason = reason
+
+
+@dataclass
+class FakeGoogleServicesConfig:
+    """
+    Settings for the fake Google services.
+
+    Attributes:
+        latency_ms (float): Simulated round-trip time of every request or batch
+        jitter_ms (float): Uniform random jitter added to the latency
+        mailbox_size (int): Number of generated messages
+        unread_ratio (float): Fraction of generated messages marked unread
+        events_per_day (int): Calendar events generated per day around today
+        seed (int): Random seed for reproducible mailboxes and calendars
+    """
+
+    latency_ms: float = 50.0
+    jitter_ms: float = 0.0
+    mailbox_size: int = 100
+    unread_ratio: float = 0.3
+    events_per_day: int = 6
+    seed: int = 42
+
+
+def _b64(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+class FakeHttpRequest:
+    """A deferred request; execute() waits for the simulated latency and answers."""
+
+    def __init__(
+        self, backend: "FakeGoogleServices", name: str, handler: Callable[[], Any]
+    ):
+        self._backend = backend
+        self.name = name
+        self._handler = handler
+
+    def execute(self, num_retries: int = 0) -> Any:
+        self._backend._simulate_round_trip(self.name)
+        return self._handler()
+
+
+class FakeBatchHttpRequest:
+    """Collects requests and executes them in a single simulated round trip."""
+
+    def __init__(
+        self, backend: "FakeGoogleServices", callback: Optional[Callable] = None
+    ):
+        self._backend = backend
+        self._callback = callback
+        self._requests: List[tuple[str, FakeHttpRequest, Optional[Callable]]] = []
+        self._ids = itertools.count(1)
+
+    def add(
+        self,
+        request: FakeHttpRequest,
+        callback: Optional[Callable] = None,
+        request_id: Optional[str] = None,
+    ):
+        if len(self._requests) >= GMAIL_BATCH_LIMIT:
+            raise FakeHttpError(
+                400, f"Batch is limited to {GMAIL_BATCH_LIMIT} requests"
+            )
+        self._requests.append((request_id or str(next(self._ids)), request, callback))
+
+    def execute(self, http: Any = None) -> None:
+        self._backend._simulate_round_trip("batch")
+        for request_id, request, callback in self._requests:
+            response, exception = None, None
+            try:
+                response = request._handler()
+            except FakeHttpError as e:
+                exception = e
+            handler = callback or self._callback
+            if handler:
+                handler(request_id, response, exception)
+
+
+class _Resource:
+    """Exposes the keyword-only methods googleapiclient generates from the discovery doc."""
+
+    def __init__(self, **methods: Callable):
+        for name, method in methods.items():
+            setattr(self, name, method)
+
+
+class FakeGoogleServices:
+    """
+    In-memory Gmail mailbox and Google Calendar with googleapiclient-shaped services.
+    """
+
+    def __init__(self, config: Optional[FakeGoogleServicesConfig] = None):
+        self.config = config or FakeGoogleServicesConfig()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._history_id = 1000
+        self._history: List[dict] = []
+        self._draft_ids = itertools.count(1)
+        self.messages: Dict[str, dict] = {}
+        self.drafts: Dict[str, dict] = {}
+        self.events: List[dict] = []
+        self.request_counts: Counter[str] = Counter()
+        self._generate_mailbox()
+        self._generate_calendar()
+
+    # ----- Service construction -----------------------------------------
+
+    def build(self, service_name: str) -> Any:
+        """
+        Returns a fake service object, mirroring googleapiclient.discovery.build.
+        """
+        if service_name == "gmail":
+            return self._build_gmail()
+        if service_name == "calendar":
+            return self._build_calendar()
+        raise ValueError(f"Unsupported service: {service_name}")
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Number of simulated round trips per endpoint."""
+        return dict(self.request_counts)
+
+    def _build_gmail(self) -> Any:
+        messages = _Resource(
+            list=lambda **kw: FakeHttpRequest(
+                self, "messages.list", lambda: self._list_messages(**kw)
+            ),
+            get=lambda **kw: FakeHttpRequest(
+                self, "messages.get", lambda: self._get_message(**kw)
+            ),
+        )
+        drafts = _Resource(
+            create=lambda **kw: FakeHttpRequest(
+                self, "drafts.create", lambda: self._create_draft(**kw)
+            ),
+        )
+        history = _Resource(
+            list=lambda **kw: FakeHttpRequest(
+                self, "history.list", lambda: self._list_history(**kw)
+            ),
+        )
+        users = _Resource(
+            messages=lambda: messages,
+            drafts=lambda: drafts,
+            history=lambda: history,
+            getProfile=lambda **kw: FakeHttpRequest(
+                self, "users.getProfile", self._get_profile
+            ),
+        )
+        return _Resource(
+            users=lambda: users,
+            new_batch_http_request=lambda callback=None: FakeBatchHttpRequest(
+                self, callback
+            ),
+        )
+
+    def _build_calendar(self) -> Any:
+        events = _Resource(
+            list=lambda **kw: FakeHttpRequest(
+                self, "events.list", lambda: self._list_events(**kw)
+            ),
+        )
+        return _Resource(events=lambda: events)
+
+    def _simulate_round_trip(self, name: str) -> None:
+        with self._lock:
+            self.request_counts[name] += 1
+            delay_ms = self.config.latency_ms + self._random.uniform(
+                0, self.config.jitter_ms
+            )
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    # ----- Data generation ----------------------------------------------
+
+    def _generate_mailbox(self) -> None:
+        now = datetime.now(timezone.utc)
+        for i in range(self.config.mailbox_size):
+            received = now - timedelta(minutes=37 * i)
+            sender = self._random.choice(_SENDERS)
+            subject = f"{self._random.choice(_TOPICS)} #{i}"
+            plain = (
+                f"Hi,\n\nFollowing up on {subject.lower()}. "
+                + "Please review the attached notes before Friday. "
+                * self._random.randint(1, 8)
+                + f"\n\nThanks,\n{sender.split(' <')[0]}\n\n"
+                + f"On {format_datetime(received - timedelta(days=1))} someone wrote:\n> earlier thread"
+            )
+            html = (
+                "<div>"
+                + "".join(f"<p>{line}</p>" for line in plain.split("\n"))
+                + "</div>"
+            )
+            labels = ["INBOX"] + (
+                ["UNREAD"] if self._random.random() < self.config.unread_ratio else []
+            )
+            message_id = f"{0x18f0000000000000 + i:x}"
+            self.messages[message_id] = {
+                "id": message_id,
+                "threadId": message_id if i % 3 else f"{0x18f0000000000000 + i + 1:x}",
+                "labelIds": labels,
+                "snippet": plain[:100],
+                "historyId": str(self._history_id),
+                "internalDate": str(int(received.timestamp() * 1000)),
+                "payload": {
+                    "mimeType": "multipart/alternative",
+                    "headers": [
+                        {"name": "From", "value": sender},
+                        {"name": "To", "value": "me@example.com"},
+                        {"name": "Subject", "value": subject},
+                        {"name": "Date", "value": format_datetime(received)},
+                        {
+                            "name": "Message-ID",
+                            "value": f"<{message_id}@mail.example.com>",
+                        },
+                    ],
+                    "body": {"size": 0},
+                    "parts": [
+                        {
+                            "mimeType": "text/plain",
+                            "body": {"size": len(plain), "data": _b64(plain)},
+                        },
+                        {
+                            "mimeType": "text/html",
+                            "body": {"size": len(html), "data": _b64(html)},
+                        },
+                    ],
+                },
+            }
+
+    def _generate_calendar(self) -> None:
+        today = datetime.now(timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        for day_offset in range(-1, 2):
+            day = today + timedelta(days=day_offset)
+            for i in range(self.config.events_per_day):
+                start = day + timedelta(
+                    hours=8 + i, minutes=self._random.choice([0, 15, 30])
+                )
+                event = {
+                    "id": f"evt{day_offset + 1}{i:03d}",
+                    "summary": self._random.choice(_MEETINGS),
+                    "start": {"dateTime": start.isoformat()},
+                    "end": {"dateTime": (start + timedelta(minutes=30)).isoformat()},
+                }
+                if i % 2 == 0:
+                    event["location"] = "Conference Room B"
+                if i % 3 == 0:
+                    event["description"] = (
+                        "Agenda: review open items\nNotes doc linked in invite"
+                    )
+                self.events.append(event)
+
+    # ----- Gmail endpoints ----------------------------------------------
+
+    def _matches_query(self, message: dict, query: str) -> bool:
+        for term in query.split():
+            if term == "is:unread" and "UNREAD" not in message["labelIds"]:
+                return False
+            if term.startswith("after:"):
+                after = datetime.strptime(term[len("after:") :], "%Y/%m/%d").replace(
+                    tzinfo=timezone.utc
+                )
+                if int(message["internalDate"]) < after.timestamp() * 1000:
+                    return False
+        return True
+
+    def _list_messages(
+        self,
+        userId: str,
+        q: str = "",
+        maxResults: int = 100,
+        pageToken: Optional[str] = None,
+        **_: Any,
+    ) -> dict:
+        matches = [m for m in self.messages.values() if self._matches_query(m, q)]
+        offset = int(pageToken or 0)
+        page = matches[offset : offset + maxResults]
+        result: Dict[str, Any] = {
+            "messages": [{"id": m["id"], "threadId": m["threadId"]} for m in page],
+            "resultSizeEstimate": len(matches),
+        }
+        if offset + maxResults < len(matches):
+            result["nextPageToken"] = str(offset + maxResults)
+        if not page:
+            del result["messages"]
+        return result
+
+    def _get_message(
+        self,
+        userId: str,
+        id: str,
+        format: str = "full",
+        metadataHeaders: Optional[List[str]] = None,
+        **_: Any,
+    ) -> dict:
+        message = self.messages.get(id)
+        if message is None:
+            raise FakeHttpError(404, "Requested entity was not found.")
+        message = copy.deepcopy(message)
+        if format == "metadata":
+            wanted = {h.lower() for h in metadataHeaders} if metadataHeaders else None
+            headers = [
+                h
+                for h in message["payload"]["headers"]
+                if wanted is None or h["name"].lower() in wanted
+            ]
+            message["payload"] = {
+                "mimeType": message["payload"]["mimeType"],
+                "headers": headers,
+            }
+        elif format == "minimal":
+            del message["payload"]
+        return message
+
+    def _create_draft(self, userId: str, body: dict, **_: Any) -> dict:
+        raw = body.get("message", {}).get("raw")
+        if not raw:
+            raise FakeHttpError(400, "Missing draft message")
+        thread_id = body["message"].get("threadId")
+        with self._lock:
+            draft_id = f"r{next(self._draft_ids)}"
+            message_id = f"draft-{draft_id}"
+            self._history_id += 1
+            message = {
+                "id": message_id,
+                "threadId": thread_id or message_id,
+                "labelIds": ["DRAFT"],
+            }
+            self.drafts[draft_id] = {"id": draft_id, "message": {**message, "raw": raw}}
+            self._history.append(
+                {"id": str(self._history_id), "messagesAdded": [{"message": message}]}
+            )
+        return {"id": draft_id, "message": message}
+
+    def _list_history(
+        self, userId: str, startHistoryId: str, maxResults: int = 100, **_: Any
+    ) -> dict:
+        start = int(startHistoryId)
+        records = [r for r in self._history if int(r["id"]) > start][:maxResults]
+        result: Dict[str, Any] = {"historyId": str(self._history_id)}
+        if records:
+            result["history"] = copy.deepcopy(records)
+        return result
+
+    def _get_profile(self) -> dict:
+        return {
+            "emailAddress": "me@example.com",
+            "messagesTotal": len(self.messages),
+            "threadsTotal": len({m["threadId"] for m in self.messages.values()}),
+            "historyId": str(self._history_id),
+        }
+
+    # ----- Calendar endpoints -------------------------------------------
+
+    def _list_events(
+        self,
+        calendarId: str,
+        timeMin: str,
+        timeMax: str,
+        orderBy: Optional[str] = None,
+        **_: Any,
+    ) -> dict:
+        if calendarId != "primary":
+            raise FakeHttpError(404, "Not Found")
+        time_min = datetime.fromisoformat(timeMin.replace("Z", "+00:00"))
+        time_max = datetime.fromisoformat(timeMax.replace("Z", "+00:00"))
+        items = [
+            copy.deepcopy(e)
+            for e in self.events
+            if time_min <= datetime.fromisoformat(e["start"]["dateTime"]) <= time_max
+        ]
+        if orderBy == "startTime":
+            items.sort(key=lambda e: e["start"]["dateTime"])
+        return {"kind": "calendar#events", "items": items}
+
+
+def install_fake_google_services(**config: Any) -> FakeGoogleServices:
+    """
+    Routes GoogleServicesUtils.authenticate_service to a new FakeGoogleServices.
+
+    Args:
+        **config: Fields of FakeGoogleServicesConfig (latency_ms, mailbox_size, ...)
+
+    Returns:
+        FakeGoogleServices: The installed fake, for inspecting state and stats
+    """
+    from voice_assistant.utils.google_services_utils import GoogleServicesUtils
+
+    fake = FakeGoogleServices(FakeGoogleServicesConfig(**config))
+    GoogleServicesUtils.set_service_factory(fake.build)
+    return fake
+
+
+if __name__ == "__main__":
+    import asyncio
+    import statistics
+
+    from voice_assistant.tools.DraftGmail import DraftGmail
+    from voice_assistant.tools.FetchDailyMeetingSchedule import (
+        FetchDailyMeetingSchedule,
+    )
+    from voice_assistant.tools.GetGmailSummary import GetGmailSummary
+
+    async def measure(label: str, make_call: Callable, iterations: int = 20) -> None:
+        durations = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await make_call()
+            durations.append(time.perf_counter() - start)
+        durations.sort()
+        p95 = durations[int(0.95 * (len(durations) - 1))]
+        print(
+            f"{label:<28} p50={statistics.median(durations) * 1000:7.1f}ms "
+            f"p95={p95 * 1000:7.1f}ms  {iterations / sum(durations):6.1f} calls/s"
+        )
+
+    async def fetch_and_extract():
+        tool = GetGmailSummary(max_results=25)
+        tool._service = fake.build("gmail")
+        messages = await tool._fetch_unread_messages()
+        return [tool._extract_email_data(m) for m in messages]
+
+    async def draft_reply():
+        reply_to_id = next(iter(fake.messages))
+        return await DraftGmail(
+            content="Sounds good, thanks!", reply_to_id=reply_to_id
+        ).run()
+
+    async def main():
+        await measure("GetGmailSummary fetch (25)", fetch_and_extract)
+        await measure("DraftGmail reply", draft_reply)
+        await measure("FetchDailyMeetingSchedule", FetchDailyMeetingSchedule().run)
+        print(f"Round trips: {fake.stats}")
+
+    fake = install_fake_google_services(
+        latency_ms=80, jitter_ms=20, mailbox_size=1000, unread_ratio=0.5
+    )
+    asyncio.run(main())
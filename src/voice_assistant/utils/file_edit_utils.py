@@ -0,0 +1,161 @@
+import os
+import re
+import tempfile
+from typing import Iterable, List, Tuple
+
+from voice_assistant.models import FileEdit
+
+
+class EditApplicationError(ValueError):
+    """Raised when a search/replace edit cannot be applied unambiguously."""
+
+
+def _find_unique(content: str, search: str) -> Tuple[int, int]:
+    """
+    Locate `search` in `content`, first exactly and then ignoring differences in
+    indentation and trailing whitespace per line.
+
+    Returns:
+        Tuple[int, int]: Start and end offsets of the single match
+
+    Raises:
+        EditApplicationError: If the text is not found or found more than once
+    """
+    count = content.count(search)
+    if count == 1:
+        start = content.index(search)
+        return start, start + len(search)
+    if count > 1:
+        raise EditApplicationError(
+            f"Search text occurs {count} times, include more context: {search[:80]!r}"
+        )
+
+    # Models often get indentation or trailing spaces slightly wrong
+    lines = [line.strip() for line in search.strip("\n").splitlines()]
+    pattern = (
+        r"[ \t]*"
+        + r"[ \t]*\n[ \t]*".join(re.escape(line) for line in lines)
+        + r"[ \t]*"
+    )
+    matches = list(re.finditer(pattern, content))
+    if len(matches) == 1:
+        return matches[0].span()
+    if matches:
+        raise EditApplicationError(
+            f"Search text occurs {len(matches)} times, include more context: {search[:80]!r}"
+        )
+    raise EditApplicationError(f"Search text not found in file: {search[:80]!r}")
+
+
+def apply_edits(content: str, edits: Iterable[FileEdit]) -> str:
+    """
+    Apply search/replace edits in order. Every search text must match exactly one
+    region of the current content; an empty search text appends the replacement.
+
+    Args:
+        content (str): Current file content
+        edits (Iterable[FileEdit]): Edits returned by the model
+
+    Returns:
+        str: The edited content
+
+    Raises:
+        EditApplicationError: If any edit does not apply; no partial result is returned
+    """
+    for edit in edits:
+        if not edit.search:
+            separator = "" if not content or content.endswith("\n") else "\n"
+            content = content + separator + edit.replace
+            continue
+        start, end = _find_unique(content, edit.search)
+        content = content[:start] + edit.replace + content[end:]
+    return content
+
+
+def write_file_atomic(file_path: str, content: str) -> None:
+    """
+    Write content to a temporary file next to `file_path` and rename it over the
+    original, so readers see either the old or the new file and never a partial one.
+    The original file's permissions are kept.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(file_path):
+            os.chmod(temp_path, os.stat(file_path).st_mode & 0o7777)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _estimate_tokens(text: str) -> int:
+    try:
+        import tiktoken
+
+        return len(tiktoken.get_encoding("o200k_base").encode(text))
+    except ImportError:
+        return len(text) // 4
+
+
+if __name__ == "__main__":
+    # Benchmark: output tokens of a full rewrite vs. search/replace edits for typical edits
+    import random
+
+    from voice_assistant.models import FileEditResponse
+
+    random.seed(7)
+    words = "agent voice file update latency token model scratchpad summary meeting email browser task".split()
+
+    def paragraph(n: int) -> str:
+        return " ".join(random.choice(words) for _ in range(n)).capitalize() + "."
+
+    def markdown_document(sections: int) -> str:
+        return "\n\n".join(
+            f"## Section {i}\n\n{paragraph(60)}\n\n- {paragraph(8)}\n- {paragraph(8)}"
+            for i in range(sections)
+        )
+
+    def python_module(functions: int) -> str:
+        return "\n\n\n".join(
+            f'def function_{i}(value):\n    """{paragraph(10)}"""\n    result = value * {i}\n    return result'
+            for i in range(functions)
+        )
+
+    corpus: List[Tuple[str, str]] = [
+        (f"notes_{n}.md", markdown_document(n)) for n in (3, 10, 30, 100)
+    ] + [(f"module_{n}.py", python_module(n)) for n in (5, 20, 80)]
+
+    print(f"{'file':<16}{'chars':>8}{'rewrite tok':>13}{'edit tok':>10}{'saved':>8}")
+    total_rewrite = total_edit = 0
+    for name, content in corpus:
+        if name.endswith(".md"):
+            target = content.split("\n\n")[1]
+            edits = [
+                FileEdit(search=target, replace=paragraph(40)),
+                FileEdit(search="", replace=f"## Follow-ups\n\n- {paragraph(10)}\n"),
+            ]
+        else:
+            edits = [
+                FileEdit(
+                    search="    result = value * 1\n",
+                    replace="    result = value * 1 + 1\n",
+                )
+            ]
+        edited = apply_edits(content, edits)
+
+        rewrite_tokens = _estimate_tokens(edited)
+        edit_tokens = _estimate_tokens(FileEditResponse(edits=edits).model_dump_json())
+        total_rewrite += rewrite_tokens
+        total_edit += edit_tokens
+        print(
+            f"{name:<16}{len(content):>8}{rewrite_tokens:>13}{edit_tokens:>10}{1 - edit_tokens / rewrite_tokens:>8.0%}"
+        )
+    print(
+        f"{'total':<16}{'':>8}{total_rewrite:>13}{total_edit:>10}{1 - total_edit / total_rewrite:>8.0%}"
+    )
@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import os
+from typing import Any, Callable, Optional
 
 from dotenv import load_dotenv
 from google.auth.transport.requests import Request
@@ -26,11 +27,38 @@ class GoogleServicesUtils:
 
     SERVICE_API_VERSIONS = {"gmail": "v1", "calendar": "v3"}
 
+    # Gmail accepts at most 100 requests per batch HTTP call
+    GMAIL_BATCH_LIMIT = 100
+
+    # When set, replaces OAuth + discovery.build (e.g. with the offline fake services)
+    _service_factory: Optional[Callable[[str], Any]] = None
+
+    @staticmethod
+    def set_service_factory(factory: Optional[Callable[[str], Any]]) -> None:
+        """
+        Installs a callable that builds services by name instead of the Google APIs.
+        Pass None to restore the real services.
+        """
+        GoogleServicesUtils._service_factory = factory
+
     @staticmethod
     async def authenticate_service(service_name):
         """
         Authenticates the user and returns a Gmail or Google Calendar service object.
         """
+        if (
+            GoogleServicesUtils._service_factory is None
+            and os.getenv("GOOGLE_SERVICES_BACKEND", "").lower() == "fake"
+        ):
+            from voice_assistant.utils.fake_google_services import (
+                install_fake_google_services,
+            )
+
+            logger.info("GOOGLE_SERVICES_BACKEND=fake, using offline Google services.")
+            install_fake_google_services()
+
+        if GoogleServicesUtils._service_factory is not None:
+            return GoogleServicesUtils._service_factory(service_name)
 
         def authenticate():
             creds = None
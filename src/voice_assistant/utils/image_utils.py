@@ -0,0 +1,108 @@
+import base64
+import hashlib
+import io
+import threading
+from dataclasses import dataclass
+from typing import Tuple
+
+from PIL import Image
+from PIL.Image import Resampling
+
+# Formats we upload, mapped to the MIME type used in data URLs
+IMAGE_MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+
+
+@dataclass
+class EncodedImage:
+    """
+    Base64 payload ready to be sent to a vision model.
+
+    Attributes:
+        data (str): Base64-encoded image bytes
+        mime_type (str): MIME type of the encoded image
+        size (Tuple[int, int]): Width and height after downscaling
+        encoded_bytes (int): Size of the encoded image before base64
+    """
+
+    data: str
+    mime_type: str
+    size: Tuple[int, int]
+    encoded_bytes: int
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.mime_type};base64,{self.data}"
+
+
+class ImageEncoder:
+    """
+    Downscales and encodes PIL images in memory, reusing one output buffer.
+
+    Usage:
+        encoder = ImageEncoder(image_format="JPEG", quality=80, max_size=(1600, 1200))
+        encoded = encoder.encode(screenshot)
+        payload_url = encoded.data_url
+    """
+
+    def __init__(
+        self,
+        image_format: str = "JPEG",
+        quality: int = 80,
+        max_size: Tuple[int, int] = (1600, 1200),
+    ):
+        image_format = image_format.upper().lstrip(".")
+        if image_format == "JPG":
+            image_format = "JPEG"
+        if image_format not in IMAGE_MIME_TYPES:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        self.image_format = image_format
+        self.quality = quality
+        self.max_size = max_size
+        self._buffer = io.BytesIO()
+        self._lock = threading.Lock()
+
+    def encode(self, image: Image.Image) -> EncodedImage:
+        """
+        Downscale the image in place to fit max_size, encode it and base64 the result.
+        """
+        # reducing_gap lets Pillow do a cheap integer reduce before the final resample
+        image.thumbnail(self.max_size, Resampling.BILINEAR, reducing_gap=2.0)
+        if self.image_format == "JPEG" and image.mode != "RGB":
+            image = image.convert("RGB")
+
+        save_kwargs = {"format": self.image_format}
+        if self.image_format in ("JPEG", "WEBP"):
+            save_kwargs["quality"] = self.quality
+        if self.image_format == "JPEG":
+            save_kwargs["optimize"] = False
+        elif self.image_format == "WEBP":
+            save_kwargs["method"] = 0  # fastest encoder setting
+
+        with self._lock:
+            self._buffer.seek(0)
+            self._buffer.truncate()
+            image.save(self._buffer, **save_kwargs)
+            encoded_bytes = self._buffer.tell()
+            with self._buffer.getbuffer() as view:
+                data = base64.b64encode(view[:encoded_bytes]).decode("ascii")
+
+        return EncodedImage(
+            data=data,
+            mime_type=IMAGE_MIME_TYPES[self.image_format],
+            size=image.size,
+            encoded_bytes=encoded_bytes,
+        )
+
+
+def screen_digest(image: Image.Image, max_side: int = 512) -> str:
+    """
+    Exact digest of the image's grayscale pixels after shrinking its longest side
+    to max_side. Unlike a perceptual hash there is no similarity threshold, so a few
+    characters of new text in the same window already change the digest.
+    """
+    scale = min(1.0, max_side / max(image.size))
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    small = image.resize(size, Resampling.BOX).convert("L")
+    digest = hashlib.blake2b(small.tobytes(), digest_size=16)
+    digest.update(f"{size[0]}x{size[1]}".encode())
+    return digest.hexdigest()
@@ -0,0 +1,209 @@
+import logging
+import math
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Iterable, List, Optional, Set
+
+from voice_assistant.utils.log_utils import get_jsonl_writer
+
+logger = logging.getLogger(__name__)
+
+# Number of recent turns the percentile summaries are computed over
+SUMMARY_WINDOW = 200
+
+# Derived per-turn metrics in seconds: name -> (from event, to event)
+TURN_METRICS = {
+    "time_to_first_audio": ("speech_stopped", "first_audio_delta"),
+    "time_to_response_created": ("speech_stopped", "response_created"),
+    "audio_stream_duration": ("first_audio_delta", "last_audio_delta"),
+    "playback_drain": ("last_audio_delta", "playback_drained"),
+    "turn_total": ("speech_stopped", "playback_drained"),
+}
+
+
+def percentile(values: Iterable[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile, q in [0, 100]; None for no values."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class TurnTrace:
+    """Timestamps of one user turn, from speech start to the end of playback."""
+
+    def __init__(self, turn: int):
+        self.turn = turn
+        self.started_at = datetime.now().isoformat()
+        self.origin = time.perf_counter()
+        self.events: Dict[str, float] = {}
+        self.tool_calls: List[dict] = []
+        self.responses = 0
+        self.response_ids: Set[str] = set()
+
+    def mark(self, event: str, overwrite: bool = False) -> None:
+        if overwrite or event not in self.events:
+            self.events[event] = time.perf_counter() - self.origin
+
+    def metrics(self) -> Dict[str, float]:
+        metrics = {
+            name: self.events[end] - self.events[start]
+            for name, (start, end) in TURN_METRICS.items()
+            if start in self.events and end in self.events
+        }
+        tool_time = sum(
+            call["end"] - call["start"] for call in self.tool_calls if "end" in call
+        )
+        if self.tool_calls:
+            metrics["tool_time"] = tool_time
+        return metrics
+
+    def to_record(self) -> dict:
+        return {
+            "turn": self.turn,
+            "started_at": self.started_at,
+            "responses": self.responses,
+            "events": {name: round(offset, 4) for name, offset in self.events.items()},
+            "tool_calls": [
+                {
+                    key: round(value, 4) if isinstance(value, float) else value
+                    for key, value in call.items()
+                }
+                for call in self.tool_calls
+                if "end" in call
+            ],
+            "metrics": {
+                name: round(value, 4) for name, value in self.metrics().items()
+            },
+        }
+
+
+class LatencyTracer:
+    """
+    Per-turn latency trace of the realtime session.
+
+    process_ws_messages calls the hooks as events arrive. When a turn ends it is
+    written as one JSON line to `path`, together with p50/p95/p99 of every metric
+    over the last SUMMARY_WINDOW turns. Time-to-first-audio (end of user speech to
+    the first audio delta) is the latency users notice most.
+
+    When the user interrupts, the turn ends at speech start and the cancelled
+    response's remaining events are ignored, matched by response id.
+
+    Usage:
+        tracer = LatencyTracer(LATENCY_TRACE_LOG_JSON)
+        tracer.mark("speech_stopped")
+        tracer.response_created(response_id)
+        ...
+        tracer.response_done(response_id)
+    """
+
+    def __init__(self, path: str, window: int = SUMMARY_WINDOW):
+        self.path = path
+        self.current: Optional[TurnTrace] = None
+        self._turns = 0
+        self._history: Dict[str, Deque[float]] = {}
+        self._window = window
+        self._awaiting_response = False
+
+    def _turn(self) -> TurnTrace:
+        if self.current is None:
+            self._turns += 1
+            self.current = TurnTrace(self._turns)
+        return self.current
+
+    def speech_started(self) -> None:
+        """Start a new turn; a turn still in progress was interrupted by the user."""
+        if self.current is not None and self.current.events:
+            self.finish_turn(interrupted=True)
+        self._turn().mark("speech_started")
+
+    def mark(self, event: str) -> None:
+        """Record the first occurrence of an event in the current turn."""
+        self._turn().mark(event)
+
+    def response_created(self, response_id: Optional[str] = None) -> None:
+        self._awaiting_response = False
+        turn = self._turn()
+        turn.responses += 1
+        if response_id:
+            turn.response_ids.add(response_id)
+        turn.mark("response_created")
+
+    def _owns(self, response_id: Optional[str]) -> bool:
+        """True if the response belongs to the current turn rather than an interrupted one."""
+        turn = self.current
+        if turn is None or "response_created" not in turn.events:
+            return False
+        return (
+            not response_id or not turn.response_ids or response_id in turn.response_ids
+        )
+
+    def audio_delta(self, response_id: Optional[str] = None) -> None:
+        if response_id and not self._owns(response_id):
+            return
+        turn = self._turn()
+        turn.mark("first_audio_delta")
+        turn.mark("last_audio_delta", overwrite=True)
+
+    def tool_started(self, name: str) -> dict:
+        turn = self._turn()
+        now = time.perf_counter()
+        call = {"name": name, "start": now - turn.origin, "_clock": now}
+        turn.tool_calls.append(call)
+        return call
+
+    def tool_finished(self, call: dict, error: bool = False) -> None:
+        call["end"] = call["start"] + time.perf_counter() - call.pop("_clock")
+        call["error"] = error
+        # The tool output triggers another response within the same turn
+        self._awaiting_response = True
+
+    def response_done(self, response_id: Optional[str] = None) -> None:
+        """
+        Record that playback drained and finish the turn, unless a tool call is about
+        to produce another response. Ignored for a response of an interrupted turn.
+        """
+        if not self._owns(response_id):
+            return
+        # Playback drains after every response of the turn; the last one counts
+        self.current.mark("playback_drained", overwrite=True)
+        if not self._awaiting_response:
+            self.finish_turn()
+
+    def finish_turn(self, interrupted: bool = False) -> Optional[dict]:
+        turn, self.current = self.current, None
+        self._awaiting_response = False
+        if turn is None:
+            return None
+
+        record = turn.to_record()
+        record["interrupted"] = interrupted
+        for name, value in turn.metrics().items():
+            self._history.setdefault(name, deque(maxlen=self._window)).append(value)
+        record["summary"] = self.summary()
+
+        get_jsonl_writer(self.path).write(record)
+
+        ttfa = record["metrics"].get("time_to_first_audio")
+        if ttfa is not None:
+            p = record["summary"]["time_to_first_audio"]
+            logger.info(
+                f"⏱️ Turn {turn.turn}: time to first audio {ttfa:.3f}s (p50 {p['p50']:.3f}s, p95 {p['p95']:.3f}s)"
+            )
+        return record
+
+    def summary(self) -> Dict[str, dict]:
+        """p50/p95/p99 and count of every metric over the recent turns."""
+        return {
+            name: {
+                "count": len(values),
+                "p50": round(percentile(values, 50), 4),
+                "p95": round(percentile(values, 95), 4),
+                "p99": round(percentile(values, 99), 4),
+            }
+            for name, values in self._history.items()
+            if values
+        }
@@ -1,6 +1,7 @@
 import asyncio
+import json
 import os
-from typing import Type, TypeVar
+from typing import AsyncIterator, Type, TypeVar
 
 import aiohttp
 import openai
@@ -43,10 +44,54 @@ async def get_model_completion(prompt: str, model: ModelName) -> str:
             return result["choices"][0]["message"]["content"]
 
 
-async def get_structured_output_completion(prompt: str, response_format: Type[T]) -> T:
+async def stream_model_completion(prompt: str, model: ModelName) -> AsyncIterator[str]:
+    """
+    Stream a chat completion, yielding content deltas as they arrive over SSE.
+    """
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {API_KEY}",
+    }
+
+    payload = {
+        "model": model.value,
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt,
+            }
+        ],
+        "stream": True,
+    }
+
+    async with aiohttp.ClientSession() as session:
+        async with session.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers=headers,
+            json=payload,
+        ) as response:
+            if response.status != 200:
+                error = await response.text()
+                raise RuntimeError(f"OpenAI API error: {error}")
+            async for line in response.content:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[len(b"data:"):].strip()
+                if data == b"[DONE]":
+                    return
+                choices = json.loads(data).get("choices") or []
+                delta = choices[0].get("delta", {}).get("content") if choices else None
+                if delta:
+                    yield delta
+
+
+async def get_structured_output_completion(
+    prompt: str, response_format: Type[T], model: ModelName = ModelName.BASE_MODEL
+) -> T:
     completion = await asyncio.to_thread(
         OPENAI_CLIENT.beta.chat.completions.parse,
-        model=ModelName.BASE_MODEL.value,
+        model=model.value,
         messages=[{"role": "user", "content": prompt}],
         response_format=response_format,
     )
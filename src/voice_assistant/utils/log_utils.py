@@ -1,23 +1,215 @@
+import atexit
 import json
 import logging
+import os
+import queue
+import threading
+import time
 from datetime import datetime
+from typing import Dict, List
 
-from voice_assistant.config import RUN_TIME_TABLE_LOG_JSON
+from voice_assistant.config import (
+    RUN_TIME_TABLE_LOG_JSON,
+    RUNTIME_LOG_BACKUPS,
+    RUNTIME_LOG_MAX_BYTES,
+)
+from voice_assistant.utils.metrics_server import metrics
 
 logger = logging.getLogger(__name__)
 
 # Track the last event type
 _last_event_type = None
 
+_FLUSH = object()
+_STOP = object()
+
+
+class BatchedJsonlWriter:
+    """
+    Appends JSON records to a file from a background thread.
+
+    write() only puts the record on a bounded queue, so callers on the event loop
+    never touch the disk. The thread writes batches of up to batch_size records
+    every flush_interval seconds, rotating the file to path.1 ... path.<backups>
+    once it would grow past max_bytes. Records that arrive while the queue is full
+    are dropped and counted rather than blocking the caller.
+
+    Usage:
+        writer = get_jsonl_writer("runtime_time_table.jsonl")
+        writer.write({"function": "update_file", "duration": "0.1234"})
+        writer.stats()  # {"written": ..., "dropped": ..., ...}
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_queue: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        max_bytes: int = RUNTIME_LOG_MAX_BYTES,
+        backups: int = RUNTIME_LOG_BACKUPS,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.written = 0
+        self.dropped = 0
+        self.rotations = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        # Callers and the writer thread both drop records
+        self._dropped_lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"jsonl-writer:{os.path.basename(self.path)}",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def write(self, record: dict) -> bool:
+        """Queue a record for writing; returns False if it was dropped."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self._count_dropped(1)
+            return False
+
+    def _count_dropped(self, count: int) -> None:
+        with self._dropped_lock:
+            self.dropped += count
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until every record queued so far is on disk. Not for the event loop."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        try:
+            self._queue.put((_FLUSH, done), timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+            "rotations": self.rotations,
+        }
+
+    def _run(self) -> None:
+        batch: List[dict] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._write_batch(batch)
+                return
+            if isinstance(item, tuple) and item and item[0] is _FLUSH:
+                self._write_batch(batch)
+                batch = []
+                item[1].set()
+                continue
+            if item is not None:
+                batch.append(item)
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._write_batch(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _write_batch(self, batch: List[dict]) -> None:
+        if not batch:
+            return
+        data = "".join(json.dumps(record) + "\n" for record in batch)
+        try:
+            if (
+                self.max_bytes
+                and os.path.exists(self.path)
+                and os.path.getsize(self.path) + len(data) > self.max_bytes
+            ):
+                self._rotate()
+            with open(self.path, "a") as file:
+                file.write(data)
+            self.written += len(batch)
+        except OSError as e:
+            self._count_dropped(len(batch))
+            logger.warning(f"Could not write {len(batch)} records to {self.path}: {e}")
+
+    def _rotate(self) -> None:
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.rotations += 1
+
+
+_writers: Dict[str, BatchedJsonlWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_jsonl_writer(path: str) -> BatchedJsonlWriter:
+    """Returns the shared writer for a file, creating it on first use."""
+    key = os.path.abspath(path)
+    with _writers_lock:
+        if key not in _writers:
+            writer = BatchedJsonlWriter(path)
+            file_name = os.path.basename(path)
+            metrics.set_gauge(
+                "jsonl_writer_queued_records", writer._queue.qsize, file=file_name
+            )
+            metrics.set_gauge(
+                "jsonl_writer_written_records", lambda: writer.written, file=file_name
+            )
+            metrics.set_gauge(
+                "jsonl_writer_dropped_records", lambda: writer.dropped, file=file_name
+            )
+            _writers[key] = writer
+        return _writers[key]
+
+
+@atexit.register
+def _close_writers() -> None:
+    for writer in list(_writers.values()):
+        writer.close()
+
+
 def log_runtime(function_or_name: str, duration: float):
     time_record = {
         "timestamp": datetime.now().isoformat(),
         "function": function_or_name,
         "duration": f"{duration:.4f}",
     }
-    with open(RUN_TIME_TABLE_LOG_JSON, "a") as file:
-        json.dump(time_record, file)
-        file.write("\n")
+    get_jsonl_writer(RUN_TIME_TABLE_LOG_JSON).write(time_record)
 
     logger.info(f"⏰ {function_or_name}() took {duration:.4f} seconds")
 
@@ -25,6 +217,11 @@ def log_runtime(function_or_name: str, duration: float):
 def log_ws_event(direction: str, event: dict):
     global _last_event_type
     event_type = event.get("type", "Unknown")
+    metrics.inc(
+        "websocket_events",
+        direction="out" if direction.lower() == "outgoing" else "in",
+        type=event_type,
+    )
     event_emojis = {
         "session.update": "🛠️",
         "session.created": "🔌",
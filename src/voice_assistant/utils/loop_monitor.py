@@ -0,0 +1,230 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+from voice_assistant.utils.latency_tracer import percentile
+from voice_assistant.utils.log_utils import get_jsonl_writer
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL = 0.1
+LAG_WINDOW = 600  # heartbeats kept for percentiles, one minute at the default interval
+STACK_DEPTH = 12
+
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class BlockingSite:
+    """Stalls of the event loop attributed to one call site."""
+
+    site: str
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    stack: List[str] = field(default_factory=list)
+
+    def to_record(self) -> dict:
+        return {
+            "site": self.site,
+            "count": self.count,
+            "total_seconds": round(self.total_seconds, 4),
+            "max_seconds": round(self.max_seconds, 4),
+            "stack": self.stack,
+        }
+
+
+def _call_site(frame) -> str:
+    """The innermost frame in voice_assistant code, else the innermost frame, as 'path:line in function'."""
+    innermost = frame
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(_PACKAGE_DIR):
+            break
+        frame = frame.f_back
+    frame = frame or innermost
+    path = frame.f_code.co_filename
+    if path.startswith(_PACKAGE_DIR):
+        path = os.path.relpath(path, os.path.dirname(_PACKAGE_DIR))
+    return f"{path}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+
+class LoopMonitor:
+    """
+    Measures event loop scheduling lag and, in debug mode, finds what blocks the loop.
+
+    A heartbeat task sleeps HEARTBEAT_INTERVAL and records how late it wakes up;
+    that lag is how long other callbacks held the loop. With capture_stacks, a
+    watchdog thread checks the heartbeat and, once it is more than block_threshold
+    overdue, samples the loop thread's stack with sys._current_frames(). When the
+    loop recovers, the stall is attributed to the innermost voice_assistant frame
+    of that stack, so blocking calls such as pyaudio writes, pygame frame pacing or
+    synchronous tools are aggregated by call site.
+
+    Usage:
+        monitor = get_loop_monitor()
+        monitor.start(capture_stacks=True)
+        ...
+        monitor.stop()  # logs and records the blocking report
+    """
+
+    def __init__(
+        self, block_threshold: float = 0.1, interval: float = HEARTBEAT_INTERVAL
+    ):
+        self.block_threshold = block_threshold
+        self.interval = interval
+        self.last_lag = 0.0
+        self.max_lag_since_take = 0.0
+        self._lags: Deque[float] = deque(maxlen=LAG_WINDOW)
+        self._sites: Dict[str, BlockingSite] = {}
+        self._pending: Optional[tuple] = (
+            None  # (site, stack) sampled during the current stall
+        )
+        self._beat = time.monotonic()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+
+    def start(self, capture_stacks: bool = False) -> None:
+        """Start monitoring the running event loop; must be called from it."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        if capture_stacks:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    def stop(self) -> List[dict]:
+        """Stop monitoring and log the blocking report. Returns the report."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+        report = self.report()
+        for record in report[:10]:
+            logger.warning(
+                f"🐢 Event loop blocked {record['count']}x for {record['total_seconds']:.3f}s "
+                f"(max {record['max_seconds']:.3f}s) at {record['site']}"
+            )
+        return report
+
+    async def _heartbeat(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - start - self.interval)
+            with self._lock:
+                self._beat = time.monotonic()
+                self.last_lag = lag
+                self.max_lag_since_take = max(self.max_lag_since_take, lag)
+                self._lags.append(lag)
+                pending, self._pending = self._pending, None
+            if pending is not None:
+                self._record_stall(pending[0], pending[1], lag)
+
+    def _watch(self) -> None:
+        check_interval = max(0.01, self.block_threshold / 4)
+        while not self._stop.wait(check_interval):
+            with self._lock:
+                overdue = time.monotonic() - self._beat - self.interval
+                if overdue < self.block_threshold or self._pending is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+                self._pending = (
+                    _call_site(frame),
+                    traceback.format_stack(frame, limit=STACK_DEPTH),
+                )
+
+    def _record_stall(self, site: str, stack: List[str], lag: float) -> None:
+        with self._lock:
+            entry = self._sites.setdefault(site, BlockingSite(site))
+            entry.count += 1
+            entry.total_seconds += lag
+            if lag >= entry.max_seconds:
+                entry.max_seconds = lag
+                entry.stack = [line.rstrip() for line in stack]
+        logger.debug(f"Event loop blocked {lag:.3f}s at {site}")
+
+    def take_max_lag(self) -> float:
+        """Largest lag since the previous call, for periodic scrapes."""
+        with self._lock:
+            value, self.max_lag_since_take = self.max_lag_since_take, 0.0
+        return value
+
+    def lag_summary(self) -> Dict[str, float]:
+        """p50/p95/p99 and max of the recent heartbeat lags in seconds."""
+        with self._lock:
+            lags = list(self._lags)
+        if not lags:
+            return {}
+        return {
+            "p50": percentile(lags, 50),
+            "p95": percentile(lags, 95),
+            "p99": percentile(lags, 99),
+            "max": max(lags),
+        }
+
+    def report(self) -> List[dict]:
+        """Blocking call sites, by total blocked time."""
+        with self._lock:
+            sites = sorted(
+                self._sites.values(), key=lambda s: s.total_seconds, reverse=True
+            )
+            return [site.to_record() for site in sites]
+
+    def write_report(self, path: str) -> None:
+        """Append the report to a JSONL file, one line per call site, to compare sessions."""
+        session = datetime.now().isoformat()
+        writer = get_jsonl_writer(path)
+        for record in self.report():
+            writer.write({"session": session, **record, "lag": self.lag_summary()})
+
+
+_monitor: Optional[LoopMonitor] = None
+
+
+def get_loop_monitor(block_threshold: float = 0.1) -> LoopMonitor:
+    """Returns the process-wide monitor, creating it on first use."""
+    global _monitor
+    if _monitor is None:
+        _monitor = LoopMonitor(block_threshold)
+    return _monitor
+
+
+if __name__ == "__main__":
+    # Demo: a blocking sleep inside a coroutine is reported at its call site
+    logging.basicConfig(level=logging.INFO)
+
+    async def blocking_tool():
+        time.sleep(0.3)
+
+    async def demo():
+        monitor = get_loop_monitor(block_threshold=0.05)
+        monitor.start(capture_stacks=True)
+        for _ in range(3):
+            await blocking_tool()
+            await asyncio.sleep(0.2)
+        print(monitor.lag_summary())
+        monitor.stop()
+
+    asyncio.run(demo())
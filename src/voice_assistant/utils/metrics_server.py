@@ -0,0 +1,263 @@
+import asyncio
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from voice_assistant.utils.cache_utils import named_caches
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "voice_assistant_"
+
+# Latency histogram buckets in seconds, from fast local tools to slow agency calls
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# name -> (type, help); counters are exposed with a _total suffix
+METRICS = {
+    "audio_uplink_bytes": (
+        "counter",
+        "Microphone audio bytes sent to the realtime API",
+    ),
+    "audio_downlink_bytes": (
+        "counter",
+        "Assistant audio bytes received from the realtime API",
+    ),
+    "websocket_events": (
+        "counter",
+        "Realtime API websocket events by direction and type",
+    ),
+    "tool_calls": ("counter", "Tool calls by tool and status"),
+    "tool_call_duration_seconds": ("histogram", "Tool call duration"),
+    "reconnects": ("counter", "Realtime API reconnects after a lost connection"),
+    "microphone_queue_depth": (
+        "gauge",
+        "Audio chunks captured by AsyncMicrophone and not yet sent",
+    ),
+    "audio_player_write_available_frames": (
+        "gauge",
+        "Frames AudioPlayer can write without blocking; low means playback is backed up",
+    ),
+    "cache_hits": ("counter", "Cache hits by cache"),
+    "cache_misses": ("counter", "Cache misses by cache"),
+    "cache_entries": ("gauge", "Entries held by each cache"),
+    "event_loop_lag_seconds": (
+        "gauge",
+        "Most recent delay of a scheduled callback on the event loop",
+    ),
+    "event_loop_lag_max_seconds": (
+        "gauge",
+        "Largest event loop delay since the previous scrape",
+    ),
+    "jsonl_writer_queued_records": (
+        "gauge",
+        "Records waiting in each JSONL writer's queue",
+    ),
+    "jsonl_writer_written_records": (
+        "gauge",
+        "Records each JSONL writer has written since start",
+    ),
+    "jsonl_writer_dropped_records": (
+        "gauge",
+        "Records each JSONL writer has dropped since start",
+    ),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+GaugeCallback = Callable[[], Optional[float]]
+
+
+class MetricsRegistry:
+    """
+    In-process counters, histograms and callback gauges rendered as OpenMetrics text.
+
+    Updates are plain dict operations from the event loop, so instrumenting the
+    audio and websocket paths costs next to nothing; gauges are only evaluated
+    when the endpoint is scraped. Rates such as bytes per second come from the
+    counters, e.g. rate(voice_assistant_audio_uplink_bytes_total[1m]).
+
+    Usage:
+        metrics.inc("websocket_events", direction="in", type="response.done")
+        metrics.observe("tool_call_duration_seconds", 0.42, tool="UpdateFile")
+        metrics.set_gauge("microphone_queue_depth", lambda: mic.queue.qsize())
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, List[float]]] = {}
+        self._gauges: Dict[str, Dict[Labels, GaugeCallback]] = {}
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        series = self._counters.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        series = self._histograms.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        # One slot per bucket, then +Inf, count and sum
+        counts = series.setdefault(key, [0.0] * (len(LATENCY_BUCKETS) + 3))
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                counts[index] += 1
+        counts[-3] += 1
+        counts[-2] += 1
+        counts[-1] += value
+
+    def set_gauge(self, name: str, callback: GaugeCallback, **labels: str) -> None:
+        """Report the callback's value at scrape time; None omits the sample."""
+        self._gauges.setdefault(name, {})[tuple(sorted(labels.items()))] = callback
+
+    def _collect_gauges(self) -> Dict[str, List[Tuple[Labels, float]]]:
+        samples: Dict[str, List[Tuple[Labels, float]]] = {}
+        for cache in named_caches():
+            stats = cache.stats
+            labels = (("cache", cache.name),)
+            # The caches count hits themselves; mirror their totals into the counters
+            self._counters.setdefault("cache_hits", {})[labels] = float(stats["hits"])
+            self._counters.setdefault("cache_misses", {})[labels] = float(
+                stats["misses"]
+            )
+            samples.setdefault("cache_entries", []).append(
+                (labels, float(stats["size"]))
+            )
+
+        for name, series in self._gauges.items():
+            for labels, callback in list(series.items()):
+                try:
+                    value = callback()
+                except Exception as e:
+                    logger.debug(f"Gauge {name} failed: {e}")
+                    continue
+                if value is not None:
+                    samples.setdefault(name, []).append((labels, float(value)))
+        return samples
+
+    def render(self) -> str:
+        gauge_samples = self._collect_gauges()
+
+        lines: List[str] = []
+        for name, (kind, help_text) in METRICS.items():
+            family = PREFIX + name
+            if kind == "counter":
+                samples = [
+                    (f"{family}_total", labels, value)
+                    for labels, value in self._counters.get(name, {}).items()
+                ]
+            elif kind == "gauge":
+                samples = [
+                    (family, labels, value)
+                    for labels, value in gauge_samples.get(name, [])
+                ]
+            else:
+                samples = list(
+                    self._histogram_samples(family, self._histograms.get(name, {}))
+                )
+            lines.append(f"# TYPE {family} {kind}")
+            lines.append(f"# HELP {family} {help_text}")
+            lines.extend(
+                f"{sample}{_format_labels(labels)} {_format_value(value)}"
+                for sample, labels, value in samples
+            )
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram_samples(
+        family: str, series: Dict[Labels, List[float]]
+    ) -> Iterable[Tuple[str, Labels, float]]:
+        for labels, counts in series.items():
+            for bound, count in zip(LATENCY_BUCKETS, counts):
+                yield f"{family}_bucket", labels + (("le", str(bound)),), count
+            yield f"{family}_bucket", labels + (("le", "+Inf"),), counts[-3]
+            yield f"{family}_count", labels, counts[-2]
+            yield f"{family}_sum", labels, counts[-1]
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = []
+    for key, value in labels:
+        value = (
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        escaped.append(f'{key}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+metrics = MetricsRegistry()
+
+
+async def _handle_request(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+        while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (
+            b"\r\n",
+            b"\n",
+            b"",
+        ):
+            pass
+        parts = request_line.decode("latin-1").split()
+        if (
+            len(parts) >= 2
+            and parts[0] == "GET"
+            and parts[1].split("?")[0] == "/metrics"
+        ):
+            status, content_type, body = (
+                "200 OK",
+                "application/openmetrics-text; version=1.0.0; charset=utf-8",
+                metrics.render(),
+            )
+        else:
+            status, content_type, body = (
+                "404 Not Found",
+                "text/plain; charset=utf-8",
+                "Not found, metrics are served at /metrics\n",
+            )
+        payload = body.encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode(
+                "latin-1"
+            )
+            + payload
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(
+    port: int, host: str = "127.0.0.1", loop_monitor=None
+) -> asyncio.AbstractServer:
+    """
+    Serve /metrics on localhost from the running event loop. Event loop lag is
+    reported from `loop_monitor` (a started LoopMonitor) when given. Keep a
+    reference to the returned server and close it on shutdown.
+    """
+    server = await asyncio.start_server(_handle_request, host, port)
+    if loop_monitor is not None:
+        metrics.set_gauge("event_loop_lag_seconds", lambda: loop_monitor.last_lag)
+        metrics.set_gauge("event_loop_lag_max_seconds", loop_monitor.take_max_lag)
+    logger.info(f"Metrics available at http://{host}:{port}/metrics")
+    return server
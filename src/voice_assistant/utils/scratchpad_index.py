@@ -0,0 +1,160 @@
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+_CAMEL_CASE_PATTERN = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_STOP_WORDS = {
+    "the",
+    "a",
+    "an",
+    "file",
+    "my",
+    "to",
+    "in",
+    "of",
+    "and",
+    "please",
+    "update",
+    "delete",
+    "remove",
+    "edit",
+    "change",
+}
+
+
+@dataclass
+class ScratchpadEntry:
+    """
+    A file in the scratchpad directory.
+
+    Attributes:
+        name (str): File name relative to the scratchpad directory
+        size (int): Size in bytes
+        mtime_ns (int): Modification time in nanoseconds
+    """
+
+    name: str
+    size: int
+    mtime_ns: int
+
+
+def _name_tokens(name: str) -> List[str]:
+    """Split a file name like 'MeetingNotes_2024.md' into ['meeting', 'notes', '2024']."""
+    stem = os.path.splitext(name)[0]
+    return _WORD_PATTERN.findall(_CAMEL_CASE_PATTERN.sub(" ", stem).lower())
+
+
+def mentioned_names(prompt: str, names: List[str]) -> List[str]:
+    """Names that appear in the prompt in full, extension included, as whole words."""
+    lowered = prompt.lower()
+    # A trailing full stop ends the sentence, but 'notes.md.bak' does not mention notes.md
+    return [
+        name
+        for name in names
+        if re.search(rf"(?<![\w.-]){re.escape(name.lower())}(?![\w-]|\.\w)", lowered)
+    ]
+
+
+class ScratchpadIndex:
+    """
+    In-memory index of the scratchpad directory, refreshed incrementally by polling.
+
+    Each refresh is one os.scandir; entries are only rebuilt for files whose size or
+    mtime changed. Lookups refresh at most once per poll_interval seconds, and tools
+    that write to the scratchpad call invalidate() so the next lookup sees the change.
+
+    Usage:
+        index = get_scratchpad_index(SCRATCH_PAD_DIR)
+        file_name = index.resolve("update meeting_notes.md")
+        if file_name is None:
+            ...  # not named exactly or ambiguous, ask the model
+    """
+
+    def __init__(self, directory: str, poll_interval: float = 1.0):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self._entries: Dict[str, ScratchpadEntry] = {}
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Force the next lookup to rescan the directory."""
+        self._last_refresh = 0.0
+
+    def refresh(self, force: bool = False) -> None:
+        with self._lock:
+            if not force and time.monotonic() - self._last_refresh < self.poll_interval:
+                return
+            seen = set()
+            with os.scandir(self.directory) as scan:
+                for dir_entry in scan:
+                    if not dir_entry.is_file() or dir_entry.name.startswith("."):
+                        continue
+                    seen.add(dir_entry.name)
+                    stat = dir_entry.stat()
+                    current = self._entries.get(dir_entry.name)
+                    if (
+                        current
+                        and current.size == stat.st_size
+                        and current.mtime_ns == stat.st_mtime_ns
+                    ):
+                        continue
+                    self._entries[dir_entry.name] = ScratchpadEntry(
+                        dir_entry.name, stat.st_size, stat.st_mtime_ns
+                    )
+            for name in set(self._entries) - seen:
+                del self._entries[name]
+            self._last_refresh = time.monotonic()
+
+    def entries(self) -> List[ScratchpadEntry]:
+        self.refresh()
+        with self._lock:
+            return sorted(self._entries.values(), key=lambda e: e.name)
+
+    def names(self) -> List[str]:
+        return [entry.name for entry in self.entries()]
+
+    def word_matches(self, prompt: str) -> List[str]:
+        """Files all of whose name words appear in the prompt, e.g. meeting_notes.md for 'the meeting notes'."""
+        prompt_words = set(_WORD_PATTERN.findall(prompt.lower())) - _STOP_WORDS
+        return [
+            name
+            for name in self.names()
+            if (tokens := _name_tokens(name)) and set(tokens) <= prompt_words
+        ]
+
+    def resolve(self, prompt: str) -> Optional[str]:
+        """
+        Resolve the file a prompt refers to without calling a model.
+
+        Only a file named in full, with its extension, is resolved, and only when
+        no other file's name could be meant by the rest of the prompt.
+
+        Returns:
+            Optional[str]: The file name, or None when the model should pick the file
+        """
+        mentioned = mentioned_names(prompt, self.names())
+        if len(mentioned) != 1:
+            return None
+        # 'update notes.md with the meeting notes' may mean meeting_notes.md
+        rest = prompt.lower().replace(mentioned[0].lower(), " ")
+        if self.word_matches(rest):
+            return None
+        return mentioned[0]
+
+
+_indexes: Dict[str, ScratchpadIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_scratchpad_index(directory: str) -> ScratchpadIndex:
+    """Returns the shared index for a directory, creating it on first use."""
+    key = os.path.abspath(directory)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = ScratchpadIndex(directory)
+        return _indexes[key]
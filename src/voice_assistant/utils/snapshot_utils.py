@@ -0,0 +1,308 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR_NAME = ".snapshots"
+JOURNAL_NAME = "journal.jsonl"
+HASH_CHUNK_BYTES = 1 << 20
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+
+@dataclass
+class SnapshotRecord:
+    """
+    One journal line: the version of a file saved before a tool changed it.
+
+    Attributes:
+        id (int): Sequence number, increasing across the journal
+        file (str): File name relative to the scratchpad directory
+        action (str): What replaced the version, e.g. 'update', 'delete' or 'restore'
+        blob (str): sha256 of the saved content, the blob's name in the store; empty if
+            the file did not exist, e.g. for the restore of a deleted file
+        size (int): Size of the saved content in bytes
+        ts (float): Unix time of the snapshot
+        undoes (Optional[int]): For 'restore' records, the id of the restored snapshot
+    """
+
+    id: int
+    file: str
+    action: str
+    blob: str
+    size: int
+    ts: float
+    undoes: Optional[int] = None
+
+
+class SnapshotStore:
+    """
+    Content-addressed store of pre-edit versions of scratchpad files.
+
+    Every version is saved once under .snapshots/blobs/<sha256>, and identical
+    versions share one blob. A blob is a private copy, hashed while it is copied,
+    so neither a writer racing the snapshot nor an editor that rewrites the file in
+    place can make a blob differ from its name. A journal with one JSON line per
+    snapshot records history; once the blobs exceed max_bytes the oldest records
+    are dropped, unreferenced blobs removed and the journal rewritten.
+
+    Usage:
+        store = get_snapshot_store(SCRATCH_PAD_DIR)
+        store.snapshot("notes.md", "update")
+        write_file_atomic(path, new_content)
+        store.restore()  # undo the last change
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.root = os.path.join(directory, SNAPSHOT_DIR_NAME)
+        self.blob_dir = os.path.join(self.root, "blobs")
+        self.journal_path = os.path.join(self.root, JOURNAL_NAME)
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._records: List[SnapshotRecord] = self._load_journal()
+
+    def _load_journal(self) -> List[SnapshotRecord]:
+        records = []
+        if not os.path.exists(self.journal_path):
+            return records
+        with open(self.journal_path, "r") as f:
+            for line in f:
+                try:
+                    records.append(SnapshotRecord(**json.loads(line)))
+                except (ValueError, TypeError):
+                    # A crash can leave a torn last line; everything before it is intact
+                    logger.warning(
+                        "Skipping unreadable snapshot journal line: %r", line[:80]
+                    )
+        return records
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest)
+
+    def _copy_to_temp_blob(self, file_path: str) -> Tuple[str, str, int]:
+        """
+        Copy a file into the blob directory, hashing exactly the bytes copied.
+
+        Returns:
+            Tuple[str, str, int]: The temporary copy's path, its sha256 and its size
+        """
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=self.blob_dir, prefix=".", suffix=".tmp")
+        try:
+            with open(file_path, "rb") as source, os.fdopen(fd, "wb") as copy:
+                while chunk := source.read(HASH_CHUNK_BYTES):
+                    digest.update(chunk)
+                    copy.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        return temp_path, digest.hexdigest(), size
+
+    def _append(
+        self,
+        file_name: str,
+        action: str,
+        blob: str,
+        size: int,
+        undoes: Optional[int] = None,
+    ) -> SnapshotRecord:
+        """Add a record to the journal. Caller holds the lock."""
+        record = SnapshotRecord(
+            id=self._records[-1].id + 1 if self._records else 1,
+            file=file_name,
+            action=action,
+            blob=blob,
+            size=size,
+            ts=time.time(),
+            undoes=undoes,
+        )
+        with open(self.journal_path, "a") as f:
+            f.write(json.dumps(asdict(record), separators=(",", ":")) + "\n")
+        self._records.append(record)
+        return record
+
+    def _store_blob(self, temp_path: str, digest: str) -> None:
+        """Move a temporary copy into place, or drop it if the blob exists. Caller holds the lock."""
+        blob_path = self._blob_path(digest)
+        if os.path.exists(blob_path):
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, blob_path)
+
+    def snapshot(
+        self, file_name: str, action: str, undoes: Optional[int] = None
+    ) -> Optional[SnapshotRecord]:
+        """
+        Save the current version of a scratchpad file before it is changed.
+
+        Returns:
+            Optional[SnapshotRecord]: The journal record, or None if the file does not exist
+        """
+        file_path = os.path.join(self.directory, file_name)
+        try:
+            temp_path, digest, size = self._copy_to_temp_blob(file_path)
+        except (FileNotFoundError, IsADirectoryError):
+            return None
+        with self._lock:
+            self._store_blob(temp_path, digest)
+            record = self._append(file_name, action, digest, size, undoes)
+            self._collect_garbage()
+        return record
+
+    def history(self, file_name: Optional[str] = None) -> List[SnapshotRecord]:
+        """Journal records, newest first, optionally for one file."""
+        with self._lock:
+            records = list(reversed(self._records))
+        return [r for r in records if file_name is None or r.file == file_name]
+
+    def files(self) -> List[str]:
+        """Names of all files with snapshots, including deleted ones."""
+        return sorted({record.file for record in self.history()})
+
+    def latest_undoable(
+        self, file_name: Optional[str] = None, redo: bool = False
+    ) -> Optional[SnapshotRecord]:
+        """
+        The newest change that is currently in effect and can be undone.
+
+        By default that is the newest update or delete not already restored. With
+        redo=True it is the newest restore in effect, so restoring it undoes the
+        restore and the change that restore undid counts as in effect again.
+        Repeated undos and redos walk back and forth through the file's versions.
+        """
+        records = self.history(file_name)
+        by_id = {r.id: r for r in records}
+        undone = set()
+
+        def set_undone(record_id: int, value: bool) -> None:
+            if (record_id in undone) == value:
+                return
+            if value:
+                undone.add(record_id)
+            else:
+                undone.discard(record_id)
+            # Undoing a restore puts back the change it undid, and vice versa
+            record = by_id.get(record_id)
+            if record is not None and record.undoes is not None:
+                set_undone(record.undoes, not value)
+
+        for record in reversed(records):
+            if record.undoes is not None:
+                set_undone(record.undoes, True)
+        for record in records:
+            if record.id in undone:
+                continue
+            if not redo and record.action != "restore":
+                return record
+            # Restores that were themselves redos are undone by a plain undo instead
+            target = by_id.get(record.undoes)
+            if (
+                redo
+                and record.action == "restore"
+                and (target is None or target.action != "restore")
+            ):
+                return record
+        return None
+
+    def restore(
+        self, record: Optional[SnapshotRecord] = None
+    ) -> Optional[SnapshotRecord]:
+        """
+        Put a saved version back in place, by default undoing the latest change.
+
+        The current version is snapshotted first, so a restore can itself be undone
+        with latest_undoable(redo=True). The blob is copied to a temporary file and
+        renamed over the target, so later in-place edits of the file cannot alter
+        history. A record without a blob removes the file.
+
+        Returns:
+            Optional[SnapshotRecord]: The restored record, or None if there is nothing to restore
+        """
+        record = record or self.latest_undoable()
+        if record is None:
+            return None
+        target = os.path.join(self.directory, record.file)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=".tmp")
+        os.close(fd)
+        try:
+            # Copy first: snapshotting the current version may garbage-collect the blob
+            if record.blob:
+                shutil.copyfile(self._blob_path(record.blob), temp_path)
+            if not self.snapshot(record.file, "restore", undoes=record.id):
+                # Deleted files have no current version to save; still mark the record as undone
+                with self._lock:
+                    self._append(record.file, "restore", "", 0, undoes=record.id)
+            if record.blob:
+                os.replace(temp_path, target)
+            else:
+                os.remove(temp_path)
+                if os.path.exists(target):
+                    os.remove(target)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return record
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum({r.blob: r.size for r in self._records if r.blob}.values())
+
+    def _collect_garbage(self) -> None:
+        """Drop the oldest records until the referenced blobs fit in max_bytes. Caller holds the lock."""
+        sizes: Dict[str, int] = {r.blob: r.size for r in self._records if r.blob}
+        if sum(sizes.values()) <= self.max_bytes:
+            return
+
+        references: Dict[str, int] = {}
+        for record in self._records:
+            references[record.blob] = references.get(record.blob, 0) + 1
+        total = sum(sizes.values())
+        dropped = 0
+        # Always keep the newest record so the last change can be undone
+        while total > self.max_bytes and dropped < len(self._records) - 1:
+            blob = self._records[dropped].blob
+            references[blob] -= 1
+            if blob and references[blob] == 0:
+                total -= sizes[blob]
+                try:
+                    os.remove(self._blob_path(blob))
+                except FileNotFoundError:
+                    pass
+            dropped += 1
+
+        self._records = self._records[dropped:]
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix=".", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.writelines(
+                json.dumps(asdict(r), separators=(",", ":")) + "\n"
+                for r in self._records
+            )
+        os.replace(temp_path, self.journal_path)
+        logger.info("Snapshot GC dropped %d records, %d bytes retained", dropped, total)
+
+
+_stores: Dict[str, SnapshotStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_snapshot_store(
+    directory: str, max_bytes: int = DEFAULT_MAX_BYTES
+) -> SnapshotStore:
+    """Returns the shared snapshot store for a directory, creating it on first use."""
+    key = os.path.abspath(directory)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = SnapshotStore(directory, max_bytes)
+        return _stores[key]
@@ -6,7 +6,10 @@ import time
 import websockets
 
 from voice_assistant.audio import audio_player
+from voice_assistant.config import LATENCY_TRACE_LOG_JSON
+from voice_assistant.utils.latency_tracer import LatencyTracer
 from voice_assistant.utils.log_utils import log_runtime, log_ws_event
+from voice_assistant.utils.metrics_server import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +19,7 @@ async def process_ws_messages(websocket, mic, visual_interface, tools):
     function_call = None
     function_call_args = ""
     response_start_time = None
+    tracer = LatencyTracer(LATENCY_TRACE_LOG_JSON)
 
     while True:
         try:
@@ -26,6 +30,7 @@ async def process_ws_messages(websocket, mic, visual_interface, tools):
             event_type = event.get("type")
 
             if event_type == "response.created":
+                tracer.response_created(event.get("response", {}).get("id"))
                 mic.start_receiving()
                 visual_interface.set_active(True)
             elif event_type == "response.output_item.added":
@@ -57,14 +62,22 @@ async def process_ws_messages(websocket, mic, visual_interface, tools):
                     )
                     if tool:
                         logger.info(f"🛠️ Calling function: {function_name} with args: {args}")
+                        tool_call = tracer.tool_started(function_name)
+                        tool_start_time = time.perf_counter()
                         try:
                             tool_instance = tool(**args)  # type: ignore
                             result = await tool_instance.run() # type: ignore
+                            tracer.tool_finished(tool_call)
+                            metrics.inc("tool_calls", tool=tool.__name__, status="ok")
                             logger.info(f"🛠️ Function {function_name} call result: {result}")
                         except Exception as e:
+                            tracer.tool_finished(tool_call, error=True)
+                            metrics.inc("tool_calls", tool=tool.__name__, status="error")
                             logger.error(f"Error calling function {function_name}: {str(e)}")
                             result = {"error": f"Function '{function_name}' failed: {str(e)}"}
+                        metrics.observe("tool_call_duration_seconds", time.perf_counter() - tool_start_time, tool=tool.__name__)
                     else:
+                        metrics.inc("tool_calls", tool=function_name, status="not_found")
                         logger.warning(f"Function '{function_name}' not found in available tools")
                         result = {"error": f"Function '{function_name}' not found."}
 
@@ -89,7 +102,9 @@ async def process_ws_messages(websocket, mic, visual_interface, tools):
                     flush=True,
                 )
             elif event_type == "response.audio.delta":
+                tracer.audio_delta(event.get("response_id"))
                 audio_chunk = base64.b64decode(event["delta"])
+                metrics.inc("audio_downlink_bytes", len(audio_chunk))
                 await audio_player.play_audio_chunk(audio_chunk, visual_interface)
             elif event_type == "response.done":
                 if response_start_time is not None:
@@ -99,6 +114,7 @@ async def process_ws_messages(websocket, mic, visual_interface, tools):
 
                 logger.info("Assistant response complete.")
                 await audio_player.stop_playback(visual_interface)
+                tracer.response_done(event.get("response", {}).get("id"))
                 assistant_reply = ""
                 logger.info("Calling stop_receiving()")
                 mic.stop_receiving()
@@ -122,9 +138,11 @@ async def process_ws_messages(websocket, mic, visual_interface, tools):
                     logger.error(f"Unhandled error: {error_message}")
                     break
             elif event_type == "input_audio_buffer.speech_started":
+                tracer.speech_started()
                 logger.info("Speech detected, listening...")
                 visual_interface.set_active(True)
             elif event_type == "input_audio_buffer.speech_stopped":
+                tracer.mark("speech_stopped")
                 mic.stop_recording()
                 logger.info("Speech ended, processing...")
                 visual_interface.set_active(False)